@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from contextlib import AbstractAsyncContextManager
+from typing import Awaitable, Callable
+
+from redis.asyncio import Redis
+
+import app.config as config
+from app.redis import make_script
+
+logger = logging.getLogger(__name__)
+
+# Saves entry only if it wasn't invalidated since the generation was read
+# KEYS: entry, generation of entry
+# ARGV: read generation, entry value, entry lifetime in milliseconds
+STORE_SCRIPT = make_script(
+    """
+if (redis.call("GET", KEYS[2]) or "") ~= ARGV[1] then
+    return 0
+end
+redis.call("SET", KEYS[1], ARGV[2], "PX", ARGV[3])
+return 1
+"""
+)
+
+
+class RedisCache:
+    """
+    Read-through cache for serialized values stored in Redis.
+
+    Only one client refills a missing entry while others wait for it. Entries
+    are refreshed a bit before their expiration with probability growing as
+    expiration approaches (XFetch), so hot keys never expire under load.
+
+    Each invalidation increases generation of entry. Loaded value is saved
+    only if generation hasn't changed while it was loaded, so value read
+    before concurrent invalidation doesn't replace the invalidated entry.
+    """
+
+    def __init__(
+        self,
+        redis_client_factory: Callable[..., AbstractAsyncContextManager[Redis]],
+        lifetime: float,
+    ):
+        self._redis_client_factory = redis_client_factory
+        self._lifetime = lifetime
+
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Returns value stored by `key`. Value is loaded with `loader` and
+        saved if it is missing or is going to expire soon.
+        """
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            entry = await redis.get(key)
+            if entry is not None:
+                self.hits += 1
+
+                expiry, delta, value = self._unpack(entry)
+                if not self._should_refresh(expiry, delta):
+                    return value
+                if not await self._lock(redis, key):
+                    return value
+                try:
+                    return await self._refill(redis, key, loader)
+                except Exception:
+                    # Cached value is still valid until it expires
+                    logger.exception("Failed to refresh cache entry %s", key)
+                    return value
+
+            self.misses += 1
+
+            if await self._lock(redis, key):
+                return await self._refill(redis, key, loader)
+
+            for _ in range(config.CACHE_LOCK_WAIT_ATTEMPTS):
+                await asyncio.sleep(config.CACHE_LOCK_WAIT_DELAY)
+
+                entry = await redis.get(key)
+                if entry is not None:
+                    return self._unpack(entry)[2]
+
+            return await loader()
+
+    async def invalidate(self, *keys: str):
+        if not keys:
+            return
+
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                for key in keys:
+                    # Generation outlives loads started before invalidation
+                    pipe.incr(self._generation_key(key))
+                    pipe.pexpire(self._generation_key(key), int(self._lifetime * 1000))
+                await pipe.execute()
+
+    async def _refill(
+        self, redis: Redis, key: str, loader: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        try:
+            generation = await redis.get(self._generation_key(key))
+
+            start_time = time.monotonic()
+            value = await loader()
+            delta = time.monotonic() - start_time
+
+            await STORE_SCRIPT(
+                keys=[key, self._generation_key(key)],
+                args=[
+                    generation or b"",
+                    self._pack(time.time() + self._lifetime, delta, value),
+                    int(self._lifetime * 1000),
+                ],
+                client=redis,
+            )
+            return value
+        finally:
+            await redis.delete(self._lock_key(key))
+
+    async def _lock(self, redis: Redis, key: str) -> bool:
+        return bool(
+            await redis.set(
+                self._lock_key(key),
+                "",
+                px=int(config.CACHE_LOCK_LIFETIME * 1000),
+                nx=True,
+            )
+        )
+
+    @staticmethod
+    def _should_refresh(expiry: float, delta: float) -> bool:
+        # 1 - random() lies in (0, 1], so the logarithm is always defined
+        return (
+            time.time()
+            - delta * config.CACHE_EARLY_REFRESH_BETA * math.log(1 - random.random())
+            >= expiry
+        )
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f"{key}:lock"
+
+    @staticmethod
+    def _generation_key(key: str) -> str:
+        # Hash tag keeps generation in the same cluster slot as entry
+        return f"{{{key}}}:generation"
+
+    @staticmethod
+    def _pack(expiry: float, delta: float, value: bytes) -> bytes:
+        return f"{expiry:.3f}:{delta:.6f}:".encode() + value
+
+    @staticmethod
+    def _unpack(entry: bytes) -> tuple[float, float, bytes]:
+        expiry, delta, value = entry.split(b":", 2)
+        return float(expiry), float(delta), value
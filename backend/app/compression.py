@@ -0,0 +1,299 @@
+import gzip
+import io
+import struct
+import zlib
+from typing import Callable
+
+import brotli
+import zstandard
+from fastapi import Request
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import app.config as config
+from app.exceptions import (
+    InvalidInputFormatError,
+    PayloadTooLargeError,
+    UnsupportedContentEncodingError,
+)
+
+COMPRESSORS: dict[str, Callable[[bytes, int], bytes]] = {
+    "br": lambda content, level: brotli.compress(content, quality=level),
+    "zstd": lambda content, level: zstandard.compress(content, level),
+    "gzip": lambda content, level: gzip.compress(content, level, mtime=0),
+}
+
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "text/")
+
+# Responses without a body
+UNCOMPRESSED_STATUSES = (204, 304)
+
+
+def compress(content: bytes, encoding: str, level: int | None = None) -> bytes:
+    """
+    Compresses content with `COMPRESSION_LEVELS` level of the encoding by
+    default.
+    """
+    if level is None:
+        level = config.COMPRESSION_LEVELS[encoding]
+    return COMPRESSORS[encoding](content, level)
+
+
+# Header of gzip member without file name and modification time
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+# Max length of content which completes partially compressed stream
+MAX_COMPLETION_LENGTH = 0xFFFF
+
+
+def _compress_gzip_partial(content: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    stream = compressor.compress(content) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    # Checksum and size of content are needed to write trailer of the member
+    return GZIP_HEADER + stream + struct.pack("<II", zlib.crc32(content), len(content))
+
+
+def _complete_gzip(partial: bytes, completion: bytes) -> bytes:
+    crc, size = struct.unpack("<II", partial[-8:])
+    length = len(completion)
+    return b"".join(
+        (
+            partial[:-8],
+            # Final stored block
+            b"\x01",
+            struct.pack("<HH", length, length ^ 0xFFFF),
+            completion,
+            struct.pack(
+                "<II", zlib.crc32(completion, crc), (size + length) & 0xFFFFFFFF
+            ),
+        )
+    )
+
+
+def _compress_br_partial(content: bytes, level: int) -> bytes:
+    compressor = brotli.Compressor(quality=level)
+    return compressor.process(content) + compressor.flush()
+
+
+def _complete_br(partial: bytes, completion: bytes) -> bytes:
+    # Uncompressed meta-block with 4 nibbles length and then empty last one
+    header = ((len(completion) - 1) << 3) | (1 << 19)
+    return partial + header.to_bytes(3, "little") + completion + b"\x03"
+
+
+def _compress_zstd_partial(content: bytes, level: int) -> bytes:
+    compressor = zstandard.ZstdCompressor(
+        level, write_checksum=False, write_content_size=False
+    ).compressobj()
+    return compressor.compress(content) + compressor.flush(
+        zstandard.COMPRESSOBJ_FLUSH_BLOCK
+    )
+
+
+def _complete_zstd(partial: bytes, completion: bytes) -> bytes:
+    # Last raw block
+    header = (len(completion) << 3) | 1
+    return partial + header.to_bytes(3, "little") + completion
+
+
+PARTIAL_COMPRESSORS: dict[str, Callable[[bytes, int], bytes]] = {
+    "br": _compress_br_partial,
+    "zstd": _compress_zstd_partial,
+    "gzip": _compress_gzip_partial,
+}
+
+COMPLETERS: dict[str, Callable[[bytes, bytes], bytes]] = {
+    "br": _complete_br,
+    "zstd": _complete_zstd,
+    "gzip": _complete_gzip,
+}
+
+
+def compress_partial(content: bytes, encoding: str, level: int | None = None) -> bytes:
+    """
+    Compresses beginning of content without finishing the compressed stream,
+    so it can be completed by different endings with `complete_partial`
+    without compressing the beginning again.
+    """
+    if level is None:
+        level = config.COMPRESSION_LEVELS[encoding]
+    return PARTIAL_COMPRESSORS[encoding](content, level)
+
+
+def complete_partial(partial: bytes, encoding: str, completion: bytes) -> bytes:
+    """
+    Finishes stream returned by `compress_partial` with content appended
+    without compression. Completion must be short and not empty.
+    """
+    if not 0 < len(completion) <= MAX_COMPLETION_LENGTH:
+        raise ValueError(f"Invalid length of completion: {len(completion)}")
+    return COMPLETERS[encoding](partial, completion)
+
+
+def decompress(content: bytes, encoding: str, max_size: int) -> bytes:
+    """
+    Decompresses content without letting the result grow larger than
+    `max_size`, so highly compressed payloads can't exhaust memory.
+
+    Raises:
+        UnsupportedContentEncodingError: Encoding is unknown
+        InvalidInputFormatError: Content is corrupted
+        PayloadTooLargeError: Decompressed content is larger than `max_size`
+    """
+    try:
+        match encoding:
+            case "gzip" | "x-gzip":
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                result = decompressor.decompress(content, max_size + 1)
+                is_finished = decompressor.eof
+            case "br":
+                decompressor = brotli.Decompressor()
+                result = decompressor.process(content, output_buffer_limit=max_size + 1)
+                is_finished = decompressor.is_finished()
+            case "zstd":
+                with zstandard.ZstdDecompressor().stream_reader(
+                    io.BytesIO(content)
+                ) as reader:
+                    result = reader.read(max_size + 1)
+                is_finished = True
+            case _:
+                raise UnsupportedContentEncodingError()
+    except (zlib.error, brotli.error, zstandard.ZstdError):
+        raise InvalidInputFormatError(details="Request body is corrupted")
+
+    if len(result) > max_size:
+        raise PayloadTooLargeError()
+    if not is_finished:
+        raise InvalidInputFormatError(details="Request body is truncated")
+    return result
+
+
+def select_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Returns the most preferred of `COMPRESSION_ENCODINGS` accepted by client
+    with the highest quality value or `None` if the response must not be
+    compressed.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip()] = quality
+
+    default_quality = qualities.get("*", 0.0)
+    best_encoding = None
+    best_quality = 0.0
+    for encoding in config.COMPRESSION_ENCODINGS:
+        quality = qualities.get(encoding, default_quality)
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+    return best_encoding
+
+
+def set_content_encoding(headers: MutableHeaders, encoding: str):
+    """
+    Marks response as encoded. Strong entity tag identifies exact bytes of the
+    response, so it is weakened to remain valid for all encodings.
+    """
+    headers["Content-Encoding"] = encoding
+    headers.add_vary_header("Accept-Encoding")
+
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+def is_compressible(headers: Headers) -> bool:
+    return "content-encoding" not in headers and headers.get(
+        "content-type", ""
+    ).startswith(COMPRESSIBLE_MEDIA_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware which compresses responses of at least
+    `COMPRESSION_MIN_SIZE` bytes with encoding negotiated by `Accept-Encoding`.
+    Responses which are already encoded are sent as is.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self._app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        body = b""
+        is_passed = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, body, is_passed
+
+            if is_passed:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] in UNCOMPRESSED_STATUSES or not is_compressible(
+                    headers
+                ):
+                    is_passed = True
+                    await send(message)
+                    return
+
+                start_message = message
+                return
+
+            body += message.get("body", b"")
+            if message.get("more_body", False):
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if len(body) >= config.COMPRESSION_MIN_SIZE:
+                body = compress(body, encoding)
+                headers["Content-Length"] = str(len(body))
+                set_content_encoding(headers, encoding)
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self._app(scope, receive, send_wrapper)
+
+
+class DecompressingRoute(APIRoute):
+    """Route which accepts request bodies compressed with gzip, br or zstd."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def handle(request: Request):
+            encoding = request.headers.get("content-encoding", "identity").lower()
+            if encoding != "identity":
+                # Decoded body is read by handler from the request cache. It
+                # is decoded in advance, so errors are not hidden by handler
+                request._body = decompress(
+                    await request.body(),
+                    encoding,
+                    config.COMPRESSED_REQUEST_MAX_SIZE,
+                )
+            return await handler(request)
+
+        return handle
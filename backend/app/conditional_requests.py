@@ -0,0 +1,60 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request
+
+
+def make_etag(*parts) -> str:
+    """Returns strong entity tag made of version parts."""
+    return '"' + "-".join(map(str, parts)) + '"'
+
+
+def content_etag(content: bytes) -> str:
+    """Returns strong entity tag made of response content hash."""
+    return make_etag(hashlib.blake2b(content, digest_size=16).hexdigest())
+
+
+def format_http_date(value: datetime) -> str:
+    """Formats naive UTC or aware datetime for `Last-Modified` header."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """
+    Checks whether client already has the current version of resource.
+    `If-Modified-Since` is ignored when `If-None-Match` is given.
+
+    Args:
+        request: Client request with conditional headers
+        etag: Entity tag of current version
+        last_modified: Naive UTC or aware time of resource modification
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    # HTTP dates have precision of seconds
+    return last_modified.replace(microsecond=0) <= since
@@ -1,7 +1,31 @@
+DB_POOL_SIZE = 10
+DB_MAX_OVERFLOW = 10
+DB_POOL_TIMEOUT = 30
+DB_POOL_RECYCLE = 30 * 60
+DB_POOL_PRE_PING = True
+DB_STATEMENT_CACHE_SIZE = 500
+DB_WARM_UP_CONNECTIONS = DB_POOL_SIZE
+DB_REPLICA_MAX_LAG = 1
+DB_REPLICA_CHECK_INTERVAL = 5
+DB_REPLICA_CHECK_TIMEOUT = 2
+# Reads of client are served by the primary for this time after its write
+DB_PRIMARY_PIN_TIME = 5
+REDIS_MAX_CONNECTIONS = 100
+REDIS_POOL_TIMEOUT = 5
+REDIS_PIPELINE_MAX_BATCH_SIZE = 64
+REDIS_PIPELINE_DELAY = 0.0005
+REDIS_WARM_UP_CONNECTIONS = 10
+HEALTH_CHECK_TIMEOUT = 1
+# Time in seconds during which worker serves requests after shutdown signal
+# while load balancer notices that it isn't ready
+SERVER_DRAIN_DELAY = 5
+
 PASSWORD_HASH_ALGORITHM = "sha256"
 PASSWORD_HASH_ITERATIONS = 100_000
 PASSWORD_SALT_LENGTH = 64
 PASSWORD_KEY_LENGTH = 64
+PASSWORD_HASH_WORKERS = 2
+PASSWORD_HASH_QUEUE_SIZE = 32
 
 USER_PASSWORD_MIN_LENGTH = 8
 USER_PASSWORD_MAX_LENGTH = 20
@@ -13,9 +37,54 @@ ARTICLE_HEADER_LENGTH = 150
 ARTICLE_PARAGRAPH_LENGTH = 500
 ARTICLE_QUOTE_LENGTH = 500
 ARTICLE_LIST_ITEM_LENGTH = 150
+ARTICLE_PATCH_MAX_OPERATIONS = 100
 ARTICLE_VIEW_COUNT_DELAY = 15 * 60
+ARTICLE_VIEWS_FLUSH_INTERVAL = 60
+ARTICLE_VIEWS_FLUSH_LOCK_LIFETIME = 5 * 60
+ARTICLE_VIEWS_FLUSH_BATCH_SIZE = 1000
+ARTICLE_CACHE_LIFETIME = 10 * 60
+PUBLISHED_ARTICLE_MAX_AGE = 60
+ARTICLES_PAGE_SIZE = 20
+ARTICLES_MAX_PAGE_SIZE = 100
+ARTICLE_SEARCH_LANGUAGE = "english"
+ARTICLE_SEARCH_QUERY_LENGTH = 200
+ARTICLE_SEARCH_INDEX_BATCH_SIZE = 1000
+ARTICLES_FEED_SIZE = 1000
+ARTICLES_FEED_REBUILD_LOCK_LIFETIME = 30
+# Length of trending windows in seconds. Scores of views halve every window
+ARTICLES_TRENDING_PERIODS = {"hour": 3600, "day": 24 * 3600}
+ARTICLES_TRENDING_SIZE = 1000
+
+BULK_MAX_IDS = 100
+BATCH_MAX_REQUESTS = 20
+BATCH_TIME_BUDGET = 5
 
 ACCESS_TOKEN_ALGORITHM = "HS256"
 ACCESS_TOKEN_LIFETIME = 3600
+ACCESS_TOKEN_CACHE_SIZE = 10_000
 REFRESH_TOKEN_SIZE = 64
 REFRESH_TOKEN_LIFETIME = 30 * 24 * 3600
+
+# Count of requests per period in seconds by route and kind of client key
+RATE_LIMITS = {
+    "GET /tokens": {"ip": (30, 60), "email": (10, 60)},
+    "POST /user": {"ip": (10, 60)},
+}
+
+# Content codings of responses in order of preference
+COMPRESSION_ENCODINGS = ("br", "zstd", "gzip")
+COMPRESSION_MIN_SIZE = 1024
+# Levels of compression made per response and of cached article variants
+COMPRESSION_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+PRECOMPRESSION_LEVELS = {"br": 11, "zstd": 19, "gzip": 9}
+COMPRESSED_REQUEST_MAX_SIZE = 1024 * 1024
+
+# Count of records validated and loaded at once by bulk import tool
+BULK_RECORDS_BATCH_SIZE = 5000
+# Interval in seconds between progress reports of bulk tool
+BULK_REPORT_INTERVAL = 5
+
+CACHE_LOCK_LIFETIME = 5
+CACHE_LOCK_WAIT_DELAY = 0.05
+CACHE_LOCK_WAIT_ATTEMPTS = 20
+CACHE_EARLY_REFRESH_BETA = 1.0
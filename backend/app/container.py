@@ -1,16 +1,47 @@
 from dependency_injector import containers, providers
 
+from app.cache import RedisCache
 from app.db import Database
+from app.hashing import PasswordHasher
+from app.health import HealthCheck
+from app.metrics import Metrics
+from app.rate_limit import RateLimiter
 from app.redis import RedisDatabase
 from app.repositories import ArticleRepository, UserRepository
 from app.services import ArticleService, AuthService, UserService
+from app.token_cache import TokenCache
 
 
 class AppContainer(containers.DeclarativeContainer):
     config = providers.Configuration()
 
-    db = providers.Singleton(Database, url=config.database_url)
-    redis_db = providers.Singleton(RedisDatabase, url=config.redis_url)
+    metrics = providers.Singleton(Metrics)
+
+    db = providers.Singleton(
+        Database,
+        url=config.database_url,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pool_pre_ping,
+        statement_cache_size=config.db_statement_cache_size,
+        replica_urls=config.database_replica_urls,
+        replica_max_lag=config.db_replica_max_lag,
+        replica_check_timeout=config.db_replica_check_timeout,
+    )
+    redis_db = providers.Singleton(
+        RedisDatabase,
+        url=config.redis_url,
+        max_connections=config.redis_max_connections,
+        pool_timeout=config.redis_pool_timeout,
+        pipeline_max_batch_size=config.redis_pipeline_max_batch_size,
+        pipeline_delay=config.redis_pipeline_delay,
+    )
+
+    health_check = providers.Singleton(
+        HealthCheck, db=db, redis_db=redis_db, timeout=config.health_check_timeout
+    )
 
     user_repository = providers.Singleton(
         UserRepository, session_factory=db.provided.session
@@ -19,23 +50,51 @@ class AppContainer(containers.DeclarativeContainer):
         ArticleRepository, session_factory=db.provided.session
     )
 
-    user_service = providers.Singleton(UserService, user_repo=user_repository)
+    article_cache = providers.Singleton(
+        RedisCache,
+        redis_client_factory=redis_db.provided.client,
+        lifetime=config.article_cache_lifetime,
+    )
+
+    password_hasher = providers.Singleton(
+        PasswordHasher,
+        workers=config.password_hash_workers,
+        queue_size=config.password_hash_queue_size,
+    )
+
+    user_service = providers.Singleton(
+        UserService, user_repo=user_repository, password_hasher=password_hasher
+    )
     article_service = providers.Singleton(
         ArticleService,
         article_repo=article_repository,
+        article_cache=article_cache,
         redis_client_factory=redis_db.provided.client,
     )
+    access_token_cache = providers.Singleton(
+        TokenCache, max_size=config.access_token_cache_size
+    )
+
     auth_service = providers.Singleton(
         AuthService,
         redis_client_factory=redis_db.provided.client,
+        token_cache=access_token_cache,
         secret_key=config.secret_key,
     )
 
+    rate_limiter = providers.Singleton(
+        RateLimiter,
+        redis_client_factory=redis_db.provided.client,
+        limits=config.rate_limits,
+    )
+
     wiring_config = containers.WiringConfiguration(
         modules=[
             "app.endpoints.auth",
             "app.endpoints.user",
             "app.endpoints.article",
+            "app.endpoints.stats",
+            "app.endpoints.health",
             "app.dependencies",
         ]
     )
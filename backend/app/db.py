@@ -1,14 +1,50 @@
 import asyncio
+import logging
+import math
+import time
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
-from typing import Callable
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Callable, Sequence
 
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import (
-    AsyncConnection,
+    AsyncEngine,
     async_scoped_session,
     create_async_engine,
 )
 from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import app.config as config
+from app.metrics import instrument_engine
+from app.migrations import check_schema_version
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+
+# Seconds since the last transaction replayed by PostgreSQL standby. Standby
+# which replayed all received WAL is up to date, even if it was idle
+REPLICA_LAG_QUERY = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(
+        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+    )
+END
+"""
+
+# Errors which mean that database is unavailable
+CONNECTION_ERRORS = (InterfaceError, OperationalError, OSError)
 
 
 class Base(DeclarativeBase):
@@ -18,32 +54,413 @@ class Base(DeclarativeBase):
 from app.models import Article, User  # noqa: F401, E402
 
 
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool which measures time spent on waiting for connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts_count = 0
+        self.wait_time = 0.0
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkouts_count += 1
+            self.wait_time += time.perf_counter() - start_time
+
+
+def primary_pin_key(user_id: int) -> str:
+    return f"user:{user_id}:primary_pin"
+
+
+class RoutingContext:
+    """
+    Pin of the current client to the primary database. `stored_until` is the
+    pin which client already has in its cookie or in Redis.
+    """
+
+    __slots__ = (
+        "pin_time",
+        "pinned_until",
+        "stored_until",
+        "user_id",
+        "redis_client_factory",
+    )
+
+    def __init__(
+        self,
+        pin_time: float,
+        pinned_until: float = 0.0,
+        redis_client_factory: Callable[..., AbstractAsyncContextManager[Redis]]
+        | None = None,
+    ):
+        self.pin_time = pin_time
+        self.pinned_until = pinned_until
+        self.stored_until = pinned_until
+        self.user_id: int | None = None
+        self.redis_client_factory = redis_client_factory
+
+
+routing_context: ContextVar[RoutingContext | None] = ContextVar(
+    "routing_context", default=None
+)
+
+
+def is_pinned_to_primary() -> bool:
+    """Whether reads of the current client must be served by the primary."""
+    context = routing_context.get()
+    return context is not None and context.pinned_until > time.time()
+
+
+async def set_routing_user(user_id: int):
+    """
+    Tells that the current client is authorized as the user. Pins are also
+    kept per user in Redis, so clients which don't keep cookies, e.g. API
+    clients with access tokens, read their own writes too. Reads of the
+    current client are pinned to the primary if the user has recently
+    written into it.
+    """
+    context = routing_context.get()
+    if context is None or context.user_id == user_id:
+        return
+    context.user_id = user_id
+    if context.redis_client_factory is None:
+        return
+
+    try:
+        redis: Redis
+        async with context.redis_client_factory() as redis:
+            value = await redis.get(primary_pin_key(user_id))
+    except (RedisError, OSError):
+        logger.warning("Failed to read pin of user %d to the primary", user_id)
+        return
+    if value is None:
+        return
+
+    # Pin made by other worker can't be longer than the configured one
+    pinned_until = min(float(value), time.time() + context.pin_time)
+    context.pinned_until = max(context.pinned_until, pinned_until)
+    context.stored_until = max(context.stored_until, pinned_until)
+
+
+class PrimarySession(Session):
+    """Session of the primary database which pins writing client to it."""
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _pin_to_primary(session: Session):
+    context = routing_context.get()
+    if context is not None:
+        context.pinned_until = time.time() + context.pin_time
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware which pins client to the primary database for `pin_time`
+    seconds after its request has written into it, so the client reads its
+    own writes even if replicas lag behind. Pin is kept in a cookie, so it is
+    shared by all app workers. Pin of authorized user is also kept in Redis
+    if `redis_client_factory` is given, see `set_routing_user`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        pin_time: float,
+        redis_client_factory: Callable[..., AbstractAsyncContextManager[Redis]]
+        | None = None,
+    ):
+        self._app = app
+        self._pin_time = pin_time
+        self._redis_client_factory = redis_client_factory
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        pinned_until = 0.0
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                cookie = cookie_parser(value.decode("latin-1"))
+                try:
+                    pinned_until = float(cookie.get(PRIMARY_PIN_COOKIE, 0.0))
+                except ValueError:
+                    pass
+                break
+
+        # Pin made by other worker can't be longer than the configured one
+        pinned_until = min(pinned_until, time.time() + self._pin_time)
+        context = RoutingContext(
+            self._pin_time, pinned_until, self._redis_client_factory
+        )
+
+        async def send_wrapper(message: Message):
+            if (
+                message["type"] == "http.response.start"
+                and context.pinned_until > context.stored_until
+            ):
+                if context.user_id is not None:
+                    await self._store_user_pin(context)
+
+                cookie = SimpleCookie()
+                cookie[PRIMARY_PIN_COOKIE] = f"{context.pinned_until:.3f}"
+                cookie[PRIMARY_PIN_COOKIE]["max-age"] = math.ceil(self._pin_time)
+                cookie[PRIMARY_PIN_COOKIE]["path"] = "/"
+                cookie[PRIMARY_PIN_COOKIE]["httponly"] = True
+                cookie[PRIMARY_PIN_COOKIE]["samesite"] = "lax"
+
+                headers = MutableHeaders(scope=message)
+                headers.append("Set-Cookie", cookie.output(header="").strip())
+            await send(message)
+
+        token = routing_context.set(context)
+        try:
+            await self._app(scope, receive, send_wrapper)
+        finally:
+            routing_context.reset(token)
+
+    async def _store_user_pin(self, context: RoutingContext):
+        if self._redis_client_factory is None:
+            return
+
+        try:
+            redis: Redis
+            async with self._redis_client_factory() as redis:
+                await redis.set(
+                    primary_pin_key(context.user_id),
+                    f"{context.pinned_until:.3f}",
+                    px=math.ceil(self._pin_time * 1000),
+                )
+        except (RedisError, OSError):
+            logger.warning(
+                "Failed to store pin of user %d to the primary", context.user_id
+            )
+
+
+class Replica:
+    __slots__ = ("engine", "session_factory", "is_healthy", "lag")
+
+    def __init__(self, engine: AsyncEngine, session_factory: async_scoped_session):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.is_healthy = False
+        self.lag: float | None = None
+
+
 class Database:
-    def __init__(self, url: str):
-        self._engine = create_async_engine(url)
-        self._session_factory = async_scoped_session(
-            async_sessionmaker(
-                bind=self._engine, autoflush=False, expire_on_commit=False
-            ),
-            lambda: asyncio.current_task,
+    """
+    Primary database with optional read replicas. Sessions opened with
+    `read_only` flag are routed to healthy replicas in round-robin order.
+    Reads fall back to the primary if no replica is healthy or the current
+    client has recently written into the primary.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = config.DB_POOL_SIZE,
+        max_overflow: int = config.DB_MAX_OVERFLOW,
+        pool_timeout: float = config.DB_POOL_TIMEOUT,
+        pool_recycle: int = config.DB_POOL_RECYCLE,
+        pool_pre_ping: bool = config.DB_POOL_PRE_PING,
+        statement_cache_size: int = config.DB_STATEMENT_CACHE_SIZE,
+        replica_urls: Sequence[str] = (),
+        replica_max_lag: float = config.DB_REPLICA_MAX_LAG,
+        replica_check_timeout: float = config.DB_REPLICA_CHECK_TIMEOUT,
+    ):
+        """
+        Args:
+            replica_urls: URLs of read replicas of the primary database
+            replica_max_lag: Replicas which lag behind the primary for more
+                seconds are not used until they catch up
+            replica_check_timeout: Replicas which don't respond to health
+                check in time are not used until the next check
+        """
+
+        def create_engine(url: str) -> AsyncEngine:
+            connect_args = {}
+            if make_url(url).get_driver_name() == "asyncpg":
+                connect_args["prepared_statement_cache_size"] = statement_cache_size
+
+            engine = create_async_engine(
+                url,
+                poolclass=TimedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+                connect_args=connect_args,
+            )
+            instrument_engine(engine)
+            return engine
+
+        def create_session_factory(
+            engine: AsyncEngine, **kwargs
+        ) -> async_scoped_session:
+            return async_scoped_session(
+                async_sessionmaker(
+                    bind=engine, autoflush=False, expire_on_commit=False, **kwargs
+                ),
+                asyncio.current_task,
+            )
+
+        self._engine = create_engine(url)
+        self._session_factory = create_session_factory(
+            self._engine, sync_session_class=PrimarySession
         )
 
-    async def create_database(self):
-        conn: AsyncConnection
-        async with self._engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        self._replicas: list[Replica] = []
+        for replica_url in replica_urls:
+            engine = create_engine(replica_url)
+            self._replicas.append(Replica(engine, create_session_factory(engine)))
+        self._next_replica = 0
+        self._replica_max_lag = replica_max_lag
+        self._replica_check_timeout = replica_check_timeout
+
+        self.replica_sessions_count = 0
+        self.primary_fallbacks_count = 0
+
+    async def check_schema_version(self):
+        """Raises `SchemaVersionError` if migrations should be applied."""
+        await check_schema_version(self._engine)
+
+    async def warm_up(self, connections_count: int):
+        """
+        Opens connections to the primary and healthy replicas in advance, so
+        the first requests don't wait for them. Connections are kept in pools
+        up to their size.
+        """
+        await self._open_connections(self._engine, connections_count)
+
+        for replica in self._replicas:
+            if not replica.is_healthy:
+                continue
+            try:
+                await self._open_connections(replica.engine, connections_count)
+            except CONNECTION_ERRORS:
+                logger.warning("Replica %s is unavailable", replica.engine.url)
+                replica.is_healthy = False
+
+    async def ping(self):
+        async with self._engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def dispose(self):
+        """Closes connections of the primary and replicas."""
+        await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.engine.dispose()
+
+    async def check_replicas(self):
+        """
+        Checks availability and replication lag of replicas. Only replicas
+        which passed the last check are used.
+        """
+        await asyncio.gather(*map(self._check_replica, self._replicas))
 
     @property
     def engine(self):
         return self._engine
 
+    @property
+    def replica_engines(self) -> list[AsyncEngine]:
+        return [replica.engine for replica in self._replicas]
+
+    def pool_stats(self) -> dict[str, int | float]:
+        pool: TimedQueuePool = self._engine.pool
+        stats = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "checkouts_count": pool.checkouts_count,
+            "wait_time": pool.wait_time,
+        }
+        if self._replicas:
+            stats["replicas_healthy"] = sum(r.is_healthy for r in self._replicas)
+            stats["replica_sessions_count"] = self.replica_sessions_count
+            stats["primary_fallbacks_count"] = self.primary_fallbacks_count
+        return stats
+
     @asynccontextmanager
-    async def session(self) -> Callable[..., AbstractAsyncContextManager[AsyncSession]]:
-        session: AsyncSession = self._session_factory()
+    async def session(
+        self, read_only: bool = False
+    ) -> Callable[..., AbstractAsyncContextManager[AsyncSession]]:
+        """
+        Args:
+            read_only: Whether session may be served by a replica. Data read
+                from replica may be slightly outdated
+        """
+        replica = self._select_replica() if read_only else None
+        session_factory = (
+            self._session_factory if replica is None else replica.session_factory
+        )
+
+        session: AsyncSession = session_factory()
         try:
             yield session
-        except Exception:
+        except Exception as e:
             await session.rollback()
+            if replica is not None and isinstance(e, CONNECTION_ERRORS):
+                replica.is_healthy = False
             raise
         finally:
-            await session.close()
+            await session_factory.remove()
+
+    def _select_replica(self) -> Replica | None:
+        if not self._replicas:
+            return None
+
+        if not is_pinned_to_primary():
+            for _ in range(len(self._replicas)):
+                replica = self._replicas[self._next_replica]
+                self._next_replica = (self._next_replica + 1) % len(self._replicas)
+                if replica.is_healthy:
+                    self.replica_sessions_count += 1
+                    return replica
+
+        self.primary_fallbacks_count += 1
+        return None
+
+    async def _check_replica(self, replica: Replica):
+        try:
+            lag = await asyncio.wait_for(
+                self._get_replica_lag(replica), self._replica_check_timeout
+            )
+        except (*CONNECTION_ERRORS, asyncio.TimeoutError):
+            logger.warning("Replica %s is unavailable", replica.engine.url)
+            replica.is_healthy = False
+            replica.lag = None
+            return
+
+        if lag > self._replica_max_lag and replica.is_healthy:
+            logger.warning("Replica %s lags for %.1fs", replica.engine.url, lag)
+        replica.lag = lag
+        replica.is_healthy = lag <= self._replica_max_lag
+
+    @staticmethod
+    async def _open_connections(engine: AsyncEngine, count: int):
+        results = await asyncio.gather(
+            *(engine.connect().start() for _ in range(count)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if not isinstance(result, BaseException):
+                await result.close()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    @staticmethod
+    async def _get_replica_lag(replica: Replica) -> float:
+        async with replica.engine.connect() as conn:
+            if conn.dialect.name != "postgresql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+
+            result = await conn.execute(text(REPLICA_LAG_QUERY))
+            return float(result.scalar_one())
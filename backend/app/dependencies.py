@@ -1,13 +1,30 @@
 from dependency_injector.wiring import Provide, inject
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from app.container import AppContainer
+from app.db import set_routing_user
 from app.exceptions import AuthorizationRequiredError
+from app.rate_limit import RateLimiter
 from app.services import AuthService
 
 
+async def _validate(
+    request: Request, access_token: str, auth_service: AuthService
+) -> int:
+    # Token of batch request is verified once for all of its requests
+    state = request.state
+    if getattr(state, "batch_access_token", None) == access_token:
+        user_id = state.batch_user_id
+    else:
+        user_id = await auth_service.validate_access_token(access_token)
+
+    await set_routing_user(user_id)
+    return user_id
+
+
 @inject
 async def validate_access_token(
+    request: Request,
     access_token: str | None = None,
     auth_service: AuthService = Depends(Provide[AppContainer.auth_service]),
 ) -> int:
@@ -23,11 +40,12 @@ async def validate_access_token(
     """
     if access_token is None:
         raise AuthorizationRequiredError()
-    return await auth_service.validate_access_token(access_token)
+    return await _validate(request, access_token, auth_service)
 
 
 @inject
 async def validate_optional_access_token(
+    request: Request,
     access_token: str | None = None,
     auth_service: AuthService = Depends(Provide[AppContainer.auth_service]),
 ) -> int | None:
@@ -40,4 +58,20 @@ async def validate_optional_access_token(
     """
     if access_token is None:
         return None
-    return await auth_service.validate_access_token(access_token)
+    return await _validate(request, access_token, auth_service)
+
+
+@inject
+async def limit_rate(
+    request: Request,
+    user_id: int | None = Depends(validate_optional_access_token),
+    rate_limiter: RateLimiter = Depends(Provide[AppContainer.rate_limiter]),
+):
+    """
+    Rejects request which exceeds rate limits of its route before it is
+    handled. Can be used as the FastAPI dependency.
+
+    Raises:
+        TooManyRequestsError: if request exceeds some of limits
+    """
+    await rate_limiter.check(request, user_id)
@@ -1,13 +1,37 @@
+from datetime import datetime
+from http import HTTPStatus
+from typing import Literal
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 
+import app.config as config
+from app.compression import DecompressingRoute, select_encoding, set_content_encoding
+from app.conditional_requests import (
+    format_http_date,
+    is_conditional,
+    is_not_modified,
+    make_etag,
+)
 from app.container import AppContainer
 from app.dependencies import validate_access_token, validate_optional_access_token
-from app.exceptions import AccessDeniedError
-from app.schemas import ArticleCreateSchema, ArticleSchema
+from app.exceptions import AccessDeniedError, ContentNotFoundError
+from app.responses import JSONResponse
+from app.schemas import (
+    ArticleBodyPatch,
+    ArticleBulkItem,
+    ArticleCreateSchema,
+    ArticleSchema,
+    ArticlesFeedPage,
+    ArticlesSearchPage,
+)
 from app.services import ArticleService
 
-router = APIRouter(tags=["Article"])
+router = APIRouter(
+    tags=["Article"],
+    default_response_class=JSONResponse,
+    route_class=DecompressingRoute,
+)
 
 
 @router.post(
@@ -29,7 +53,8 @@ async def create_article(
     response_model=ArticleSchema,
     summary="Updates article by id",
     description="""This method will raise 403 HTTP status code (Forbidden) if article is
-    private and user is not its author""",
+    private and user is not its author. Request body may be compressed with
+    gzip, br or zstd according to `Content-Encoding` header.""",
 )
 @inject
 async def update_article(
@@ -38,31 +63,217 @@ async def update_article(
     article_service: ArticleService = Depends(Provide[AppContainer.article_service]),
     user_id: int = Depends(validate_access_token),
 ):
-    db_article = await article_service.get_by_id(article_id)
-    if db_article.author_id != user_id:
+    version = await article_service.get_version(article_id)
+    if version is None:
+        raise ContentNotFoundError()
+    if version.author_id != user_id:
         raise AccessDeniedError()
 
     article.id = article_id
     return await article_service.update(article)
 
 
+@router.patch(
+    "/article/{article_id}",
+    response_model=ArticleSchema,
+    summary="Updates blocks of article body",
+    description="""Applies block operations to article body in the given order,
+    each to the body changed by previous ones:
+    - `insert`: inserts `block` before block with `index` or appends it if
+    `index` equals to count of blocks
+    - `replace`: replaces block with `index` by `block`
+    - `delete`: deletes block with `index`
+    - `move`: moves block with `index`, so it gets `to_index` index
+
+    All operations are applied atomically. Raises 422 status code (Unprocessable
+    Entity) if some index is out of body. Raises 403 status code (Forbidden) if
+    user is not author of article.""",
+)
+@inject
+async def patch_article(
+    article_id: int,
+    patch: ArticleBodyPatch,
+    article_service: ArticleService = Depends(Provide[AppContainer.article_service]),
+    user_id: int = Depends(validate_access_token),
+):
+    version = await article_service.get_version(article_id)
+    if version is None:
+        raise ContentNotFoundError()
+    if version.author_id != user_id:
+        raise AccessDeniedError()
+
+    return JSONResponse(await article_service.update_body(article_id, patch))
+
+
 @router.get(
     "/article/{article_id}",
     response_model=ArticleSchema,
     summary="Get article by id",
     description="""Raise 403 status code (Forbidden) if article exists, but is
-    private and user is not its author""",
+    private and user is not its author. Each successful request is counted as
+    article view. Responses have `ETag` and `Last-Modified` headers, so
+    article can be requested conditionally with `If-None-Match` or
+    `If-Modified-Since` and 304 status code (Not Modified) is returned if it
+    wasn't updated. Views count isn't a part of article version.""",
 )
+@inject
 async def get_article_by_id(
     article_id: int,
+    request: Request,
     article_service: ArticleService = Depends(Provide[AppContainer.article_service]),
     user_id: int | None = Depends(validate_optional_access_token),
 ):
+    version = await article_service.get_version(article_id)
+    if version is None:
+        raise ContentNotFoundError()
+    if not version.is_published and user_id != version.author_id:
+        raise AccessDeniedError()
+
+    headers = article_cache_headers(
+        article_id, version.update_time, version.is_published
+    )
+    if is_conditional(request) and is_not_modified(
+        request, headers["ETag"], version.update_time
+    ):
+        await article_service.count_view(
+            article_id, request.client, version.is_published
+        )
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    result = None
+    if version.is_published:
+        result = await article_service.get_published_json(
+            article_id,
+            version,
+            select_encoding(request.headers.get("accept-encoding")),
+        )
+    if result is not None:
+        await article_service.count_view(article_id, request.client)
+
+        content, encoding = result
+        response = Response(
+            content, media_type=JSONResponse.media_type, headers=headers
+        )
+        if encoding is not None:
+            set_content_encoding(response.headers, encoding)
+        return response
+
     article = await article_service.get_by_id(article_id)
+    if article is None:
+        raise ContentNotFoundError()
     if not article.is_published and user_id != article.author_id:
         raise AccessDeniedError()
 
-    return article
+    await article_service.count_view(article_id, request.client, article.is_published)
+    return JSONResponse(
+        article,
+        headers=article_cache_headers(
+            article_id, article.update_time, article.is_published
+        ),
+    )
+
+
+def article_cache_headers(
+    article_id: int, update_time: datetime, is_published: bool
+) -> dict[str, str]:
+    return {
+        "ETag": make_etag(article_id, f"{update_time:%Y%m%d%H%M%S%f}"),
+        "Last-Modified": format_http_date(update_time),
+        "Cache-Control": (
+            f"public, max-age={config.PUBLISHED_ARTICLE_MAX_AGE}"
+            if is_published
+            else "private, no-cache"
+        ),
+    }
+
+
+@router.get(
+    "/articles",
+    response_model=list[ArticleBulkItem],
+    summary="Get many articles by ids",
+    description="""Returns articles in the order of requested `ids`. Missing
+    articles and private articles of other users are returned with an error
+    instead of article. Views are not counted by this method.""",
+)
+@inject
+async def get_articles_by_ids(
+    ids: list[int] = Query(min_items=1, max_items=config.BULK_MAX_IDS),
+    article_service: ArticleService = Depends(Provide[AppContainer.article_service]),
+    user_id: int | None = Depends(validate_optional_access_token),
+):
+    articles = await article_service.get_many(ids)
+
+    items = []
+    for id in ids:
+        article = articles.get(id)
+        if article is None:
+            items.append(ArticleBulkItem.from_exception(id, ContentNotFoundError))
+        elif not article.is_published and user_id != article.author_id:
+            items.append(ArticleBulkItem.from_exception(id, AccessDeniedError))
+        else:
+            items.append(ArticleBulkItem(id=id, article=article))
+
+    return JSONResponse(items)
+
+
+@router.get(
+    "/articles/search",
+    response_model=ArticlesSearchPage,
+    summary="Search published articles",
+    description="""Searches published articles by title and text of blocks. Query
+    supports web search engines syntax: quoted phrases, `or` and `-` for
+    excluding words. Ids are ordered from the most relevant article and split
+    into pages of `limit` size. Next page is requested by passing received
+    `next_cursor`.""",
+)
+@inject
+async def search_articles(
+    q: str = Query(min_length=1, max_length=config.ARTICLE_SEARCH_QUERY_LENGTH),
+    cursor: str | None = None,
+    limit: int = Query(
+        config.ARTICLES_PAGE_SIZE, ge=1, le=config.ARTICLES_MAX_PAGE_SIZE
+    ),
+    article_service: ArticleService = Depends(Provide[AppContainer.article_service]),
+):
+    return JSONResponse(await article_service.search(q, cursor, limit))
+
+
+@router.get(
+    "/articles/trending",
+    response_model=list[int],
+    summary="Get ids of trending articles",
+    description="""Returns ids of published articles which were viewed the most
+    during the last `period`. Views made earlier weigh less: weight of view
+    halves every `period`.""",
+)
+@inject
+async def get_trending_articles(
+    period: Literal[tuple(config.ARTICLES_TRENDING_PERIODS)] = "hour",
+    limit: int = Query(
+        config.ARTICLES_PAGE_SIZE, ge=1, le=config.ARTICLES_MAX_PAGE_SIZE
+    ),
+    article_service: ArticleService = Depends(Provide[AppContainer.article_service]),
+):
+    return JSONResponse(await article_service.get_trending(period, limit))
+
+
+@router.get(
+    "/feed",
+    response_model=ArticlesFeedPage,
+    summary="Get feed of published articles",
+    description="""Returns ids of published articles ordered from the most
+    recently published and split into pages of `limit` size. Next page is
+    requested by passing received `next_cursor`.""",
+)
+@inject
+async def get_feed(
+    cursor: str | None = None,
+    limit: int = Query(
+        config.ARTICLES_PAGE_SIZE, ge=1, le=config.ARTICLES_MAX_PAGE_SIZE
+    ),
+    article_service: ArticleService = Depends(Provide[AppContainer.article_service]),
+):
+    return JSONResponse(await article_service.get_feed(cursor, limit))
 
 
 @router.get(
@@ -70,14 +281,22 @@ async def get_article_by_id(
     response_model=list[int],
     summary="Get ids of user's articles",
     description="""Returns only available articles, e.g if it is requested by other
-    users, then only public articles are returned.""",
+    users, then only public articles are returned. Ids are ordered from newest
+    to oldest and split into pages of `limit` size. Next page is requested by
+    passing the last received id as `before_id`.""",
 )
+@inject
 async def get_user_articles(
     user_id: int,
+    before_id: int | None = None,
+    limit: int = Query(
+        config.ARTICLES_PAGE_SIZE, ge=1, le=config.ARTICLES_MAX_PAGE_SIZE
+    ),
     article_service: ArticleService = Depends(Provide[AppContainer.article_service]),
     curr_user_id: int | None = Depends(validate_optional_access_token),
 ):
-    articles = await article_service.get_by_author_id(user_id)
-    if curr_user_id != user_id:
-        articles = [a for a in articles if a.is_published]
-    return list(map(lambda a: a.id, articles))
+    return JSONResponse(
+        await article_service.get_ids_by_author_id(
+            user_id, curr_user_id == user_id, before_id, limit
+        )
+    )
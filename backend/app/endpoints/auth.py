@@ -1,13 +1,17 @@
+from http import HTTPStatus
+
 from dependency_injector.wiring import Provide, inject
 from email_validator import EmailNotValidError, validate_email
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from app.container import AppContainer
+from app.dependencies import limit_rate, validate_access_token
 from app.exceptions import InvalidCredentialsError, InvalidInputFormatError
+from app.responses import JSONResponse
 from app.schemas import AuthTokens
 from app.services import AuthService, UserService
 
-router = APIRouter(tags=["Auth"])
+router = APIRouter(tags=["Auth"], default_response_class=JSONResponse)
 
 
 @router.get(
@@ -19,7 +23,11 @@ router = APIRouter(tags=["Auth"])
         other methods for getting access. `access_token` lifetime is short.
         Second token is `refresh_token`. It is used for getting new pair of
         tokens when old ones are expired. `refresh_token` is long living.
+        Attempts are limited per client IP address and per email, 429 status
+        code (Too Many Requests) is returned with `Retry-After` header when
+        limit is exceeded.
     """,
+    dependencies=[Depends(limit_rate)],
 )
 @inject
 async def get_tokens(
@@ -43,11 +51,27 @@ async def get_tokens(
             raise InvalidCredentialsError()
 
         user_id = (await user_service.get_by_email(email)).id
+        refresh_token = await auth_service.generate_refresh_token(user_id)
     else:
-        user_id = await auth_service.validate_refresh_token(refresh_token)
-        await auth_service.reset_refresh_token(refresh_token)
+        user_id, refresh_token = await auth_service.rotate_refresh_token(refresh_token)
 
     return AuthTokens(
         access_token=await auth_service.generate_access_token(user_id),
-        refresh_token=await auth_service.generate_refresh_token(user_id),
+        refresh_token=refresh_token,
     )
+
+
+@router.delete(
+    "/tokens",
+    status_code=HTTPStatus.NO_CONTENT,
+    summary="Log out all user sessions",
+    description="""Makes all refresh tokens of user invalid. Issued access tokens
+    stay valid until they expire.""",
+)
+@inject
+async def revoke_tokens(
+    auth_service: AuthService = Depends(Provide[AppContainer.auth_service]),
+    user_id: int = Depends(validate_access_token),
+):
+    await auth_service.revoke_refresh_tokens(user_id)
+    return Response(status_code=HTTPStatus.NO_CONTENT)
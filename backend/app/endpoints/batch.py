@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import orjson
+from fastapi import APIRouter, Body, Depends, Request
+
+import app.config as config
+from app.dependencies import validate_optional_access_token
+from app.exceptions import AppException, BatchTimeoutError, UnexpectedError
+from app.responses import JSONResponse
+from app.schemas import BatchSubRequest, BatchSubResponse, ErrorResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Batch"], default_response_class=JSONResponse)
+
+# Sub-requests bodies are embedded into JSON, so they are never encoded
+STRIPPED_HEADERS = ("accept-encoding", "content-encoding")
+
+
+@router.post(
+    "/batch",
+    response_model=list[BatchSubResponse],
+    summary="Execute many requests at once",
+    description=f"""Executes up to {config.BATCH_MAX_REQUESTS} requests to other
+    methods concurrently and returns their statuses and bodies in the same
+    order. `access_token` given to this method is checked once and passed to
+    all requests which don't have their own one. Requests which don't finish
+    in {config.BATCH_TIME_BUDGET} seconds are cancelled and returned with 504
+    status code. Requests which fail unexpectedly are returned with 500
+    status code.""",
+)
+async def execute_batch(
+    request: Request,
+    sub_requests: list[BatchSubRequest] = Body(
+        min_items=1, max_items=config.BATCH_MAX_REQUESTS
+    ),
+    access_token: str | None = None,
+    user_id: int | None = Depends(validate_optional_access_token),
+):
+    tasks = [
+        asyncio.create_task(dispatch(request, sub_request, access_token, user_id))
+        for sub_request in sub_requests
+    ]
+
+    _, pending = await asyncio.wait(tasks, timeout=config.BATCH_TIME_BUDGET)
+    for task in pending:
+        task.cancel()
+    # Cancelled requests are let to finish before the response is built
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    responses = []
+    for task in tasks:
+        if task in pending:
+            responses.append(error_response(BatchTimeoutError()))
+        elif task.exception() is not None:
+            logger.error("Batch request failed", exc_info=task.exception())
+            responses.append(error_response(UnexpectedError()))
+        else:
+            responses.append(task.result())
+
+    return JSONResponse(responses)
+
+
+def error_response(exc: AppException) -> BatchSubResponse:
+    return BatchSubResponse(
+        status=exc.status_code,
+        body=ErrorResponse(error_code=exc.error_code, details=exc.details),
+    )
+
+
+async def dispatch(
+    request: Request,
+    sub_request: BatchSubRequest,
+    access_token: str | None,
+    user_id: int | None,
+) -> BatchSubResponse:
+    """
+    Passes request through the whole app in the current process, so requests
+    share DB and Redis connection pools with the batch request. Access token
+    of the batch request is verified once, its user id is passed to requests
+    in their scope state.
+    """
+    params = dict(sub_request.params)
+    if access_token is not None:
+        params.setdefault("access_token", access_token)
+
+    body = b"" if sub_request.body is None else orjson.dumps(sub_request.body)
+    headers = {
+        k.lower(): v
+        for k, v in sub_request.headers.items()
+        if k.lower() not in STRIPPED_HEADERS
+    }
+    headers["content-type"] = "application/json"
+    headers["content-length"] = str(len(body))
+
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": sub_request.method,
+        "scheme": request.scope["scheme"],
+        "root_path": request.scope.get("root_path", ""),
+        "path": sub_request.path,
+        "raw_path": sub_request.path.encode(),
+        "query_string": urlencode(params, doseq=True).encode(),
+        "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+        "state": (
+            {"batch_access_token": access_token, "batch_user_id": user_id}
+            if user_id is not None
+            else {}
+        ),
+    }
+
+    is_body_sent = False
+
+    async def receive():
+        nonlocal is_body_sent
+        if is_body_sent:
+            return {"type": "http.disconnect"}
+        is_body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status = HTTPStatus.INTERNAL_SERVER_ERROR
+    chunks = []
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await request.app(scope, receive, send)
+
+    content = b"".join(chunks)
+    try:
+        response_body = orjson.loads(content) if content else None
+    except ValueError:
+        response_body = content.decode("utf-8", errors="replace")
+
+    return BatchSubResponse(status=status, body=response_body)
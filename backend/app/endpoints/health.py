@@ -0,0 +1,42 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+
+from app.container import AppContainer
+from app.exceptions import ServiceUnavailableError
+from app.health import HealthCheck
+from app.responses import JSONResponse
+from app.schemas import HealthStatus
+
+router = APIRouter(tags=["Health"], default_response_class=JSONResponse)
+
+
+@router.get(
+    "/health/live",
+    response_model=HealthStatus,
+    summary="Check that worker is alive",
+    description="""Always succeeds while worker is able to handle requests.""",
+)
+async def get_liveness():
+    return HealthStatus()
+
+
+@router.get(
+    "/health/ready",
+    response_model=HealthStatus,
+    summary="Check that worker is ready to serve requests",
+    description="""Raises 503 status code (Service Unavailable) while worker is
+    warming up or draining on shutdown, or if database or Redis is
+    unavailable.""",
+)
+@inject
+async def get_readiness(
+    health_check: HealthCheck = Depends(Provide[AppContainer.health_check]),
+):
+    if not health_check.is_ready:
+        raise ServiceUnavailableError(details="Worker is not ready")
+
+    checks = await health_check.check()
+    for name, is_available in checks.items():
+        if not is_available:
+            raise ServiceUnavailableError(details=f"Service {name} is unavailable")
+    return HealthStatus(checks=checks)
@@ -0,0 +1,78 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.cache import RedisCache
+from app.container import AppContainer
+from app.db import Database
+from app.hashing import PasswordHasher
+from app.metrics import Metrics
+from app.redis import RedisDatabase
+from app.repositories import ArticleRepository, UserRepository
+from app.responses import JSONResponse
+from app.schemas import PoolsStats
+from app.token_cache import TokenCache
+
+router = APIRouter(tags=["Stats"], default_response_class=JSONResponse)
+
+
+@router.get(
+    "/stats/pools",
+    response_model=PoolsStats,
+    summary="Get connection pools usage",
+    description="""Returns size and usage of database and Redis connection pools
+    of the current worker. `wait_time` is total time in seconds spent on waiting
+    for free connection.""",
+)
+@inject
+async def get_pools_stats(
+    db: Database = Depends(Provide[AppContainer.db]),
+    redis_db: RedisDatabase = Depends(Provide[AppContainer.redis_db]),
+):
+    return PoolsStats(database=db.pool_stats(), redis=redis_db.pool_stats())
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Get metrics in Prometheus format",
+    description="""Returns per-route requests counts and latencies, SQL and
+    Redis usage, connection pools, caches and coalesced repository reads usage
+    of the current worker.""",
+)
+@inject
+async def get_metrics(
+    metrics: Metrics = Depends(Provide[AppContainer.metrics]),
+    db: Database = Depends(Provide[AppContainer.db]),
+    redis_db: RedisDatabase = Depends(Provide[AppContainer.redis_db]),
+    article_cache: RedisCache = Depends(Provide[AppContainer.article_cache]),
+    access_token_cache: TokenCache = Depends(Provide[AppContainer.access_token_cache]),
+    password_hasher: PasswordHasher = Depends(Provide[AppContainer.password_hasher]),
+    article_repo: ArticleRepository = Depends(Provide[AppContainer.article_repository]),
+    user_repo: UserRepository = Depends(Provide[AppContainer.user_repository]),
+):
+    values = {
+        "article_cache_hits_total": article_cache.hits,
+        "article_cache_misses_total": article_cache.misses,
+        "access_token_cache_hits_total": access_token_cache.hits,
+        "access_token_cache_misses_total": access_token_cache.misses,
+        "access_token_cache_size": len(access_token_cache),
+        "password_hasher_queue_depth": password_hasher.queue_depth,
+        "password_hasher_hashes_total": password_hasher.hashes_count,
+        "password_hasher_rejects_total": password_hasher.rejects_count,
+        "password_hasher_wait_seconds_total": password_hasher.wait_time,
+        "password_hasher_hash_seconds_total": password_hasher.hash_time,
+    }
+    values.update({f"db_pool_{k}": v for k, v in db.pool_stats().items()})
+    values.update({f"redis_pool_{k}": v for k, v in redis_db.pool_stats().items()})
+    for name, repo in (("article", article_repo), ("user", user_repo)):
+        values.update(
+            {
+                f"{name}_repository_single_flight_{k}": v
+                for k, v in repo.single_flight.stats().items()
+            }
+        )
+
+    return PlainTextResponse(
+        metrics.render(values), media_type="text/plain; version=0.0.4"
+    )
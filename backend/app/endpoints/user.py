@@ -1,20 +1,28 @@
+from http import HTTPStatus
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 
+import app.config as config
+from app.conditional_requests import content_etag, is_not_modified
 from app.container import AppContainer
-from app.dependencies import validate_access_token
+from app.dependencies import limit_rate, validate_access_token
 from app.exceptions import ContentNotFoundError
-from app.schemas import UserCreateSchema, UserSchema
+from app.responses import JSONResponse, dumps
+from app.schemas import UserBulkItem, UserCreateSchema, UserSchema
 from app.services import UserService
 
-router = APIRouter(prefix="/user", tags=["User"])
+router = APIRouter(tags=["User"], default_response_class=JSONResponse)
 
 
 @router.post(
-    "",
+    "/user",
     response_model=UserSchema,
     summary="Create user profile",
-    description="This method should be used for user registration",
+    description="""This method should be used for user registration. Requests
+    are limited per client IP address, 429 status code (Too Many Requests) is
+    returned with `Retry-After` header when limit is exceeded.""",
+    dependencies=[Depends(limit_rate)],
 )
 @inject
 async def create_user(
@@ -26,7 +34,7 @@ async def create_user(
     )
 
 
-@router.put("", response_model=UserSchema, summary="Update current user")
+@router.put("/user", response_model=UserSchema, summary="Update current user")
 @inject
 async def update_current_user(
     user_data: UserSchema,
@@ -37,22 +45,72 @@ async def update_current_user(
     return await user_service.update(user_data)
 
 
-@router.get("", response_model=UserSchema, summary="Get current user")
+@router.get(
+    "/user",
+    response_model=UserSchema,
+    summary="Get current user",
+    description="Supports conditional requests with `If-None-Match` header.",
+)
 @inject
 async def get_current_user(
+    request: Request,
     user_service: UserService = Depends(Provide[AppContainer.user_service]),
     user_id: int = Depends(validate_access_token),
 ):
-    return await user_service.get_by_id(user_id)
+    user = await user_service.get_by_id(user_id)
+    return conditional_response(request, dumps(user), "private, no-cache")
 
 
-@router.get("/{id}", response_model=UserSchema, summary="Get user by id")
+@router.get(
+    "/user/{id}",
+    response_model=UserSchema,
+    summary="Get user by id",
+    description="Supports conditional requests with `If-None-Match` header.",
+)
 @inject
 async def get_user_by_id(
     id: int,
+    request: Request,
     user_service: UserService = Depends(Provide[AppContainer.user_service]),
 ):
     user = await user_service.get_by_id(id)
     if user is None:
         raise ContentNotFoundError()
-    return user
+    return conditional_response(request, dumps(user), "no-cache")
+
+
+@router.get(
+    "/users",
+    response_model=list[UserBulkItem],
+    summary="Get many users by ids",
+    description="""Returns users in the order of requested `ids`. Missing users
+    are returned with an error instead of user.""",
+)
+@inject
+async def get_users_by_ids(
+    ids: list[int] = Query(min_items=1, max_items=config.BULK_MAX_IDS),
+    user_service: UserService = Depends(Provide[AppContainer.user_service]),
+):
+    users = await user_service.get_many(ids)
+
+    return JSONResponse(
+        [
+            UserBulkItem(id=id, user=users[id])
+            if id in users
+            else UserBulkItem.from_exception(id, ContentNotFoundError)
+            for id in ids
+        ]
+    )
+
+
+def conditional_response(
+    request: Request, content: bytes, cache_control: str
+) -> Response:
+    """
+    Returns user content or 304 status code (Not Modified) if client has it.
+    User profile is small, so its version is a hash of the content.
+    """
+    headers = {"ETag": content_etag(content), "Cache-Control": cache_control}
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(content, media_type=JSONResponse.media_type, headers=headers)
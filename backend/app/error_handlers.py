@@ -18,6 +18,7 @@ def handle_app_exception(req, exc: AppException):
     return JSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse(error_code=exc.error_code, details=exc.details).dict(),
+        headers=exc.headers,
     )
 
 
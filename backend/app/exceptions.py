@@ -8,6 +8,7 @@ class AppException(Exception):
     status_code: ClassVar[int] = HTTPStatus.INTERNAL_SERVER_ERROR
     error_code: ClassVar[int] = 0
     details: ClassVar[str] = "App exception"
+    headers: dict[str, str] | None = None
 
     def __init__(
         self,
@@ -81,3 +82,37 @@ class TakenLoginError(AppException):
     status_code = HTTPStatus.BAD_REQUEST
     error_code = 9
     details = "This login is already taken"
+
+
+class ServiceUnavailableError(AppException):
+    status_code = HTTPStatus.SERVICE_UNAVAILABLE
+    error_code = 10
+    details = "Service is overloaded, try again later"
+
+
+class BatchTimeoutError(AppException):
+    status_code = HTTPStatus.GATEWAY_TIMEOUT
+    error_code = 11
+    details = "Request didn't fit into batch time budget"
+
+
+class TooManyRequestsError(AppException):
+    status_code = HTTPStatus.TOO_MANY_REQUESTS
+    error_code = 12
+    details = "Too many requests, try again later"
+
+    def __init__(self, retry_after: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+class UnsupportedContentEncodingError(AppException):
+    status_code = HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+    error_code = 13
+    details = "Content encoding of request body is not supported"
+
+
+class PayloadTooLargeError(AppException):
+    status_code = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    error_code = 14
+    details = "Request body is too large"
@@ -1,9 +1,16 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.exceptions import HTTPException, RequestValidationError
 
+from app.compression import CompressionMiddleware
 from app.container import AppContainer
+from app.db import ReadYourWritesMiddleware
 from app.endpoints.article import router as article_router
 from app.endpoints.auth import router as auth_router
+from app.endpoints.batch import router as batch_router
+from app.endpoints.health import router as health_router
+from app.endpoints.stats import router as stats_router
 from app.endpoints.user import router as user_router
 from app.error_handlers import (
     handle_app_exception,
@@ -11,7 +18,9 @@ from app.error_handlers import (
     handle_validation_error,
 )
 from app.exceptions import AppException
+from app.metrics import MetricsMiddleware
 from app.settings import AppSettings
+from app.tasks import run_periodically
 
 APP_DESCRIPTION = """
 
@@ -36,15 +45,70 @@ def create_app() -> FastAPI:
     app.include_router(user_router)
     app.include_router(article_router)
     app.include_router(auth_router)
+    app.include_router(batch_router)
+    app.include_router(stats_router)
+    app.include_router(health_router)
 
     app.add_exception_handler(AppException, handle_app_exception)
     app.add_exception_handler(RequestValidationError, handle_validation_error)
     app.add_exception_handler(HTTPException, handle_http_exception)
 
+    app.add_middleware(CompressionMiddleware)
+    if container.config.database_replica_urls():
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            pin_time=container.config.db_primary_pin_time(),
+            redis_client_factory=container.redis_db().client,
+        )
+    app.add_middleware(MetricsMiddleware, metrics=container.metrics())
+
     db = container.db()
+    background_tasks: list[asyncio.Task] = []
 
     @app.on_event("startup")
     async def on_startup():
-        await db.create_database()
+        await db.check_schema_version()
+
+        if container.config.database_replica_urls():
+            await db.check_replicas()
+            background_tasks.append(
+                asyncio.create_task(
+                    run_periodically(
+                        container.config.db_replica_check_interval(),
+                        db.check_replicas,
+                    )
+                )
+            )
+
+        article_service = container.article_service()
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    container.config.views_flush_interval(),
+                    article_service.flush_views,
+                )
+            )
+        )
+
+        # Worker accepts requests only after startup, so connections and
+        # lazily built OpenAPI schema are prepared before the first request
+        await db.warm_up(container.config.db_warm_up_connections())
+        await container.redis_db().warm_up(container.config.redis_warm_up_connections())
+        app.openapi()
+        container.health_check().is_ready = True
+
+    @app.on_event("shutdown")
+    async def on_shutdown():
+        container.health_check().is_ready = False
+
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+
+        await container.article_service().flush_views()
+        container.password_hasher().close()
+
+        await container.redis_db().close()
+        await db.dispose()
 
     return app
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import pbkdf2_hmac
+
+import app.config as config
+from app.exceptions import ServiceUnavailableError
+
+
+def compute_password_key(password: str, salt: bytes) -> bytes:
+    return pbkdf2_hmac(
+        config.PASSWORD_HASH_ALGORITHM,
+        password.encode("utf-8"),
+        salt,
+        config.PASSWORD_HASH_ITERATIONS,
+        config.PASSWORD_KEY_LENGTH,
+    )
+
+
+class PasswordHasher:
+    """
+    Computes password keys in a dedicated thread pool, so hashing doesn't
+    block the event loop (`pbkdf2_hmac` releases the GIL). Count of waiting
+    tasks is bounded and new tasks are rejected when the queue is full.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self._workers = workers
+        self._max_tasks = workers + queue_size
+        self._tasks = 0
+
+        self.hashes_count = 0
+        self.rejects_count = 0
+        self.wait_time = 0.0
+        self.hash_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self._tasks - self._workers, 0)
+
+    async def get_password_key(self, password: str, salt: bytes) -> bytes:
+        """
+        Raises:
+            ServiceUnavailableError: Hashing queue is full
+        """
+        if self._tasks >= self._max_tasks:
+            self.rejects_count += 1
+            raise ServiceUnavailableError()
+
+        self._tasks += 1
+        try:
+            queued_time = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            start_time, hash_time, password_key = await loop.run_in_executor(
+                self._executor, self._hash, password, salt
+            )
+        finally:
+            self._tasks -= 1
+
+        self.hashes_count += 1
+        self.wait_time += start_time - queued_time
+        self.hash_time += hash_time
+        return password_key
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _hash(password: str, salt: bytes) -> tuple[float, float, bytes]:
+        start_time = time.perf_counter()
+        password_key = compute_password_key(password, salt)
+        return start_time, time.perf_counter() - start_time, password_key
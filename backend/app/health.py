@@ -0,0 +1,29 @@
+import asyncio
+
+from app.db import Database
+from app.redis import RedisDatabase
+
+
+class HealthCheck:
+    """
+    Readiness of the app worker to serve requests. Worker is ready after it
+    has been warmed up and until it starts draining on shutdown.
+    """
+
+    def __init__(self, db: Database, redis_db: RedisDatabase, timeout: float):
+        self._db = db
+        self._redis_db = redis_db
+        self._timeout = timeout
+        self.is_ready = False
+
+    async def check(self) -> dict[str, bool]:
+        """Returns availability of services used by the app."""
+        results = await asyncio.gather(
+            asyncio.wait_for(self._db.ping(), self._timeout),
+            asyncio.wait_for(self._redis_db.ping(), self._timeout),
+            return_exceptions=True,
+        )
+        return {
+            name: not isinstance(result, BaseException)
+            for name, result in zip(("database", "redis"), results)
+        }
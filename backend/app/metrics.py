@@ -0,0 +1,232 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestContext:
+    """Accounting of DB and Redis usage made by the current request."""
+
+    __slots__ = ("sql_count", "sql_time", "redis_count", "redis_time")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.redis_count = 0
+        self.redis_time = 0.0
+
+
+request_context: ContextVar[RequestContext | None] = ContextVar(
+    "request_context", default=None
+)
+
+
+def count_redis_commands(count: int, duration: float):
+    context = request_context.get()
+    if context is not None:
+        context.redis_count += count
+        context.redis_time += duration
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Accounts SQL statements executed by `engine` in the current request."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info["statement_start_time"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        duration = time.perf_counter() - conn.info.pop("statement_start_time")
+
+        request = request_context.get()
+        if request is not None:
+            request.sql_count += 1
+            request.sql_time += duration
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class RouteMetrics:
+    __slots__ = (
+        "statuses",
+        "latency",
+        "sql_count",
+        "sql_time",
+        "redis_count",
+        "redis_time",
+    )
+
+    def __init__(self):
+        self.statuses: dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.redis_count = 0
+        self.redis_time = 0.0
+
+
+class Metrics:
+    """
+    In-process metrics of the app worker. Counters are plain numbers, because
+    they are changed only from the event loop thread.
+    """
+
+    def __init__(self):
+        self._routes: dict[tuple[str, str], RouteMetrics] = {}
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        context: RequestContext,
+    ):
+        route_metrics = self._routes.get((method, route))
+        if route_metrics is None:
+            route_metrics = self._routes[(method, route)] = RouteMetrics()
+
+        route_metrics.statuses[status] = route_metrics.statuses.get(status, 0) + 1
+        route_metrics.latency.observe(duration)
+        route_metrics.sql_count += context.sql_count
+        route_metrics.sql_time += context.sql_time
+        route_metrics.redis_count += context.redis_count
+        route_metrics.redis_time += context.redis_time
+
+    def render(self, values: dict[str, float] | None = None) -> str:
+        """
+        Returns metrics in Prometheus text format.
+
+        Args:
+            values: Additional values collected at the moment of scraping.
+                Values with `_total` suffix are exposed as counters
+        """
+        lines = []
+
+        def family(name: str, type: str, help: str, samples: Iterable[str]):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type}")
+            lines.extend(samples)
+
+        routes = sorted(self._routes.items())
+
+        family(
+            "http_requests_total",
+            "counter",
+            "Count of handled HTTP requests",
+            (
+                f"http_requests_total{{{_labels(method, route)},"
+                f'status="{status}"}} {count}'
+                for (method, route), m in routes
+                for status, count in sorted(m.statuses.items())
+            ),
+        )
+        family(
+            "http_request_duration_seconds",
+            "histogram",
+            "Duration of HTTP requests handling",
+            (
+                sample
+                for (method, route), m in routes
+                for sample in _histogram_samples(
+                    "http_request_duration_seconds", _labels(method, route), m.latency
+                )
+            ),
+        )
+
+        for name, attr, help in (
+            ("sql_statements_total", "sql_count", "Count of executed SQL statements"),
+            ("sql_duration_seconds_total", "sql_time", "Time spent on SQL statements"),
+            ("redis_commands_total", "redis_count", "Count of sent Redis commands"),
+            ("redis_duration_seconds_total", "redis_time", "Time spent on Redis"),
+        ):
+            family(
+                name,
+                "counter",
+                help,
+                (
+                    f"{name}{{{_labels(method, route)}}} {getattr(m, attr)}"
+                    for (method, route), m in routes
+                ),
+            )
+
+        for name, value in sorted((values or {}).items()):
+            type = "counter" if name.endswith("_total") else "gauge"
+            lines.append(f"# TYPE {name} {type}")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware which measures handling of HTTP requests."""
+
+    def __init__(self, app: ASGIApp, metrics: Metrics):
+        self._app = app
+        self._metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        context = RequestContext()
+        token = request_context.set(context)
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start_time = time.perf_counter()
+        try:
+            await self._app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+            request_context.reset(token)
+
+            route = scope.get("route")
+            self._metrics.observe_request(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status,
+                duration,
+                context,
+            )
+
+
+def _labels(method: str, route: str) -> str:
+    return f'method="{method}",route="{route}"'
+
+
+def _histogram_samples(name: str, labels: str, histogram: Histogram):
+    count = 0
+    for bucket, bucket_count in zip(histogram.buckets, histogram.counts):
+        count += bucket_count
+        yield f'{name}_bucket{{{labels},le="{bucket}"}} {count}'
+
+    count += histogram.counts[-1]
+    yield f'{name}_bucket{{{labels},le="+Inf"}} {count}'
+    yield f"{name}_sum{{{labels}}} {histogram.sum}"
+    yield f"{name}_count{{{labels}}} {count}"
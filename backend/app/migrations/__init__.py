@@ -0,0 +1,8 @@
+# flake8: noqa F401
+from .runner import (
+    LATEST_VERSION,
+    SchemaVersionError,
+    apply_migrations,
+    check_schema_version,
+    get_schema_version,
+)
@@ -0,0 +1,62 @@
+"""
+Applies database migrations out of band of the app workers.
+
+Usage:
+    python -m app.migrations upgrade [--target VERSION]
+    python -m app.migrations status
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.exc import DBAPIError
+
+from app.db import Database
+from app.migrations import LATEST_VERSION, apply_migrations, get_schema_version
+from app.settings import DatabaseSettings
+
+
+async def upgrade(db: Database, target: int | None):
+    applied = await apply_migrations(db.engine, target)
+    if applied:
+        print(f"Applied migrations: {', '.join(map(str, applied))}")
+    else:
+        print("Database schema is up to date")
+
+
+async def status(db: Database):
+    async with db.engine.connect() as conn:
+        try:
+            version = await get_schema_version(conn)
+        except DBAPIError:
+            version = None
+
+    print(f"Current version: {version}, latest version: {LATEST_VERSION}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(prog="python -m app.migrations")
+    parser.add_argument(
+        "--database-url", help="Database URL. Taken from app settings by default"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser("upgrade", help="Apply migrations")
+    upgrade_parser.add_argument("--target", type=int, help="Version to upgrade to")
+    subparsers.add_parser("status", help="Show schema version")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("app.migrations").setLevel(logging.INFO)
+
+    db = Database(args.database_url or DatabaseSettings().database_url)
+    try:
+        if args.command == "upgrade":
+            await upgrade(db, args.target)
+        else:
+            await status(db)
+    finally:
+        await db.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
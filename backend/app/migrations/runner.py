@@ -0,0 +1,147 @@
+import importlib
+import logging
+import pkgutil
+from contextlib import asynccontextmanager
+from types import ModuleType
+
+from sqlalchemy import Column, Integer, MetaData, Table, insert, select, text, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.migrations import versions
+
+# Arbitrary key of PostgreSQL advisory lock held while migrations are applied
+MIGRATIONS_LOCK_KEY = 0x6D626C67
+
+logger = logging.getLogger(__name__)
+
+schema_version_table = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, nullable=False),
+)
+
+
+class SchemaVersionError(Exception):
+    pass
+
+
+def load_migrations() -> list[ModuleType]:
+    """Returns migration modules sorted by version."""
+    migrations = sorted(
+        (
+            importlib.import_module(f"{versions.__name__}.{module.name}")
+            for module in pkgutil.iter_modules(versions.__path__)
+        ),
+        key=lambda m: m.VERSION,
+    )
+    if [m.VERSION for m in migrations] != list(range(1, len(migrations) + 1)):
+        raise SchemaVersionError("Migration versions should be sequential")
+
+    return migrations
+
+
+MIGRATIONS = load_migrations()
+LATEST_VERSION = len(MIGRATIONS)
+
+
+async def get_schema_version(conn: AsyncConnection) -> int | None:
+    """
+    Returns:
+        Version of the applied schema. None if there is no version table or
+        it is empty
+
+    Raises:
+        DBAPIError: Version table doesn't exist
+    """
+    return await conn.scalar(select(schema_version_table.c.version))
+
+
+async def check_schema_version(engine: AsyncEngine):
+    """
+    Checks with a single query that database schema is not older than the
+    app requires. Newer schema is allowed, so migrations can be applied
+    before new version of the app is rolled out.
+
+    Raises:
+        SchemaVersionError: Migrations should be applied
+    """
+    try:
+        async with engine.connect() as conn:
+            version = await get_schema_version(conn)
+    except DBAPIError as e:
+        raise SchemaVersionError(
+            "Database schema is not initialized. "
+            "Apply migrations with `python -m app.migrations upgrade`"
+        ) from e
+
+    if version is None or version < LATEST_VERSION:
+        raise SchemaVersionError(
+            f"Database schema version {version} is older than required "
+            f"{LATEST_VERSION}. Apply migrations with "
+            "`python -m app.migrations upgrade`"
+        )
+
+
+async def apply_migrations(engine: AsyncEngine, target: int | None = None) -> list[int]:
+    """
+    Applies not yet applied migrations up to `target` version. Every
+    migration is committed with the version update, so interrupted run can be
+    simply restarted.
+
+    Returns:
+        Versions of applied migrations
+    """
+    target = LATEST_VERSION if target is None else target
+
+    async with _migrations_lock(engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(schema_version_table.create, checkfirst=True)
+            version = await get_schema_version(conn)
+            if version is None:
+                version = 0
+                await conn.execute(insert(schema_version_table).values(version=0))
+
+        applied = []
+        for migration in MIGRATIONS[version:target]:
+            logger.info("Applying migration %s", migration.__name__)
+
+            if getattr(migration, "TRANSACTIONAL", True):
+                async with engine.begin() as conn:
+                    await migration.upgrade(conn)
+                    await _set_schema_version(conn, migration.VERSION)
+            else:
+                async with engine.connect() as conn:
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                    await migration.upgrade(conn)
+                    await _set_schema_version(conn, migration.VERSION)
+
+            applied.append(migration.VERSION)
+
+        return applied
+
+
+async def _set_schema_version(conn: AsyncConnection, version: int):
+    await conn.execute(update(schema_version_table).values(version=version))
+
+
+@asynccontextmanager
+async def _migrations_lock(engine: AsyncEngine):
+    """Prevents concurrent runs of migrations on PostgreSQL."""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+
+    # Lock is held by the session in autocommit mode, because open transaction
+    # would block `CREATE INDEX CONCURRENTLY` made by migrations
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATIONS_LOCK_KEY}
+        )
+        try:
+            yield
+        finally:
+            await conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATIONS_LOCK_KEY}
+            )
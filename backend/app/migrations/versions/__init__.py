@@ -0,0 +1,11 @@
+"""
+Migration scripts. Every module is named as `v<version>_<name>` and has:
+    - `VERSION`: sequential number of migration starting from 1
+    - `async def upgrade(conn: AsyncConnection)`: applies migration
+    - `TRANSACTIONAL` (optional): set to False for statements which can't be
+        run inside transaction, e.g. `CREATE INDEX CONCURRENTLY`. Such
+        migrations are run in autocommit mode and must be idempotent
+
+Scripts must not import models, because models describe only the latest
+schema.
+"""
@@ -0,0 +1,53 @@
+"""Initial schema, which was earlier created by `create_all` on startup."""
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import func
+
+VERSION = 1
+
+metadata = MetaData()
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("email", String(254), nullable=False),
+    Column("password_salt", LargeBinary(64), nullable=False),
+    Column("password_key", LargeBinary(64), nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("creation_date", Date, nullable=False, server_default=func.current_date()),
+    Column("display_name", String(50), nullable=False),
+    Index("ix_users_email", "email", unique=True),
+)
+
+Table(
+    "articles",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("author_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("creation_time", DateTime, nullable=False, server_default=func.now()),
+    Column("update_time", DateTime, nullable=False, server_default=func.now()),
+    Column("title", String(150), nullable=False),
+    Column("body", JSON, nullable=False),
+    Column("is_published", Boolean, nullable=False),
+    Column("views_count", Integer, nullable=False),
+    Index("ix_articles_author_id", "author_id"),
+)
+
+
+async def upgrade(conn: AsyncConnection):
+    # Databases created before migrations already have these tables
+    await conn.run_sync(metadata.create_all, checkfirst=True)
@@ -0,0 +1,30 @@
+"""
+Replaces index on articles author with composite indexes used by keyset
+pagination. On PostgreSQL indexes are built concurrently without blocking
+writes. If build fails, invalid index has to be dropped before rerun.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 2
+TRANSACTIONAL = False
+
+INDEXES = {
+    "ix_articles_author_id_id": "author_id, id",
+    "ix_articles_author_id_is_published_id": "author_id, is_published, id",
+}
+
+
+async def upgrade(conn: AsyncConnection):
+    concurrently = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+
+    for name, columns in INDEXES.items():
+        await conn.execute(
+            text(
+                f"CREATE INDEX {concurrently}IF NOT EXISTS {name} "
+                f"ON articles ({columns})"
+            )
+        )
+    await conn.execute(
+        text(f"DROP INDEX {concurrently}IF EXISTS ix_articles_author_id")
+    )
@@ -0,0 +1,18 @@
+"""
+Converts articles body to JSONB, so it can be indexed and partially updated
+inside database. Column type change rewrites the table under exclusive lock,
+which is short while the table is small. Other databases keep JSON type.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 3
+
+
+async def upgrade(conn: AsyncConnection):
+    if conn.dialect.name != "postgresql":
+        return
+
+    await conn.execute(
+        text("ALTER TABLE articles ALTER COLUMN body TYPE JSONB USING body::jsonb")
+    )
@@ -0,0 +1,64 @@
+"""
+Adds full-text search vector of articles with GIN index. Vectors of
+existing articles are filled in small batches, each in its own transaction,
+so writes are not blocked for long. Search is available only on PostgreSQL,
+other databases get a plain column.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 4
+TRANSACTIONAL = False
+
+BATCH_SIZE = 1000
+
+SEARCH_VECTOR = """
+    setweight(to_tsvector('english', title), 'A')
+    || setweight(
+        jsonb_to_tsvector(
+            'english',
+            jsonb_path_query_array(
+                body,
+                '$[*] ? (@.type == "header" || @.type == "paragraph"
+                    || @.type == "quote" || @.type == "list").content'
+            ),
+            '["string"]'
+        ),
+        'B'
+    )
+"""
+
+
+async def upgrade(conn: AsyncConnection):
+    if conn.dialect.name != "postgresql":
+        columns = await conn.run_sync(
+            lambda c: {c["name"] for c in inspect(c).get_columns("articles")}
+        )
+        if "search_vector" not in columns:
+            await conn.execute(
+                text("ALTER TABLE articles ADD COLUMN search_vector TEXT")
+            )
+        return
+
+    await conn.execute(
+        text("ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    )
+
+    while True:
+        result = await conn.execute(
+            text(
+                f"UPDATE articles SET search_vector = {SEARCH_VECTOR} "
+                "WHERE id IN (SELECT id FROM articles WHERE search_vector IS NULL "
+                "ORDER BY id LIMIT :batch_size)"
+            ),
+            {"batch_size": BATCH_SIZE},
+        )
+        if result.rowcount == 0:
+            break
+
+    await conn.execute(
+        text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_articles_search_vector "
+            "ON articles USING gin (search_vector)"
+        )
+    )
@@ -0,0 +1,54 @@
+"""
+Adds publish time of articles used by the feed and partial index over
+published articles, so pages of the feed are read by range scan. Publish time
+of already published articles is filled with their update time in small
+batches, each in its own transaction.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 5
+TRANSACTIONAL = False
+
+BATCH_SIZE = 1000
+
+
+async def upgrade(conn: AsyncConnection):
+    is_postgresql = conn.dialect.name == "postgresql"
+
+    if is_postgresql:
+        await conn.execute(
+            text(
+                "ALTER TABLE articles "
+                "ADD COLUMN IF NOT EXISTS publish_time TIMESTAMP"
+            )
+        )
+    else:
+        columns = await conn.run_sync(
+            lambda c: {c["name"] for c in inspect(c).get_columns("articles")}
+        )
+        if "publish_time" not in columns:
+            await conn.execute(
+                text("ALTER TABLE articles ADD COLUMN publish_time TIMESTAMP")
+            )
+
+    while True:
+        result = await conn.execute(
+            text(
+                "UPDATE articles SET publish_time = update_time "
+                "WHERE id IN (SELECT id FROM articles "
+                "WHERE is_published AND publish_time IS NULL "
+                "ORDER BY id LIMIT :batch_size)"
+            ),
+            {"batch_size": BATCH_SIZE},
+        )
+        if result.rowcount == 0:
+            break
+
+    concurrently = "CONCURRENTLY " if is_postgresql else ""
+    await conn.execute(
+        text(
+            f"CREATE INDEX {concurrently}IF NOT EXISTS ix_articles_feed "
+            "ON articles (publish_time, id) WHERE is_published"
+        )
+    )
@@ -0,0 +1,46 @@
+"""
+Adds function which applies block operations of `PATCH /article/{id}` to
+articles body inside database. Indexes of operations must be checked before
+call. Other databases apply operations in the app.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 6
+
+APPLY_BLOCK_OPERATIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION apply_article_block_operations(
+    body jsonb, operations jsonb
+) RETURNS jsonb LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    operation jsonb;
+    idx text;
+BEGIN
+    FOR operation IN SELECT jsonb_array_elements(operations) LOOP
+        idx := operation ->> 'index';
+        CASE operation ->> 'op'
+            WHEN 'insert' THEN
+                body := jsonb_insert(body, ARRAY[idx], operation -> 'block');
+            WHEN 'replace' THEN
+                body := jsonb_set(body, ARRAY[idx], operation -> 'block');
+            WHEN 'delete' THEN
+                body := body - idx::int;
+            WHEN 'move' THEN
+                body := jsonb_insert(
+                    body - idx::int,
+                    ARRAY[operation ->> 'to_index'],
+                    body -> idx::int
+                );
+        END CASE;
+    END LOOP;
+    RETURN body;
+END
+$$
+"""
+
+
+async def upgrade(conn: AsyncConnection):
+    if conn.dialect.name != "postgresql":
+        return
+
+    await conn.execute(text(APPLY_BLOCK_OPERATIONS_FUNCTION))
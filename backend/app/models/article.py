@@ -1,10 +1,10 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
-from sqlalchemy.types import String
+from sqlalchemy.types import JSON, String
 
 import app.config as config
 from app.db import Base
@@ -13,15 +13,34 @@ from app.schemas.article_blocks import ArticleBlock
 
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        Index("ix_articles_author_id_id", "author_id", "id"),
+        Index(
+            "ix_articles_author_id_is_published_id", "author_id", "is_published", "id"
+        ),
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_articles_feed",
+            "publish_time",
+            "id",
+            postgresql_where=text("is_published"),
+            sqlite_where=text("is_published"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     author = relationship("User", back_populates="articles")
     creation_time: Mapped[datetime] = mapped_column(server_default=func.now())
     update_time: Mapped[datetime] = mapped_column(
         server_default=func.now(), server_onupdate=func.now()
     )
     title: Mapped[str] = mapped_column(String(config.ARTICLE_TITLE_LENGTH))
-    body: Mapped[list[ArticleBlock]] = mapped_column(JSON(), default=[])
+    body: Mapped[list[ArticleBlock]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), default=[]
+    )
     is_published: Mapped[bool] = mapped_column(default=False)
+    publish_time: Mapped[datetime | None] = mapped_column(default=None)
     views_count: Mapped[int] = mapped_column(default=0)
+    # Maintained by repository on save. Available only on PostgreSQL
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR(), deferred=True)
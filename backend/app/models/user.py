@@ -20,7 +20,7 @@ class User(Base):
     )
     password_key: Mapped[bytes] = mapped_column(LargeBinary(config.PASSWORD_KEY_LENGTH))
     is_active: Mapped[bool] = mapped_column(default=True)
-    creation_date: Mapped[date] = mapped_column(server_default=func.now())
+    creation_date: Mapped[date] = mapped_column(server_default=func.current_date())
     display_name: Mapped[str] = mapped_column(String(config.USER_DISPLAY_NAME_LENGTH))
 
     articles = relationship("Article", back_populates="author")
@@ -0,0 +1,129 @@
+import math
+from contextlib import AbstractAsyncContextManager
+from json import JSONDecodeError
+from typing import Callable
+
+from redis.asyncio import Redis
+from starlette.requests import Request
+
+from app.exceptions import TooManyRequestsError
+from app.redis import make_script
+
+# Generic cell rate algorithm, i.e. token bucket which stores only the time
+# when bucket becomes full. Request is allowed only if it fits into limits of
+# all keys, so rejected requests don't consume limits.
+# KEYS: limited keys
+# ARGV: count of requests and period in seconds for each key
+# Returns seconds to wait before request is allowed or `false` if allowed
+RATE_LIMIT_SCRIPT = make_script(
+    """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local retry_after = 0
+local full_times = {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i - 1])
+    local period = tonumber(ARGV[2 * i])
+
+    local full_time = math.max(tonumber(redis.call("GET", key)) or now, now)
+    full_times[i] = full_time + period / limit
+    retry_after = math.max(retry_after, full_times[i] - period - now)
+end
+
+if retry_after > 0 then
+    return tostring(retry_after)
+end
+
+for i, key in ipairs(KEYS) do
+    redis.call(
+        "SET",
+        key,
+        string.format("%.6f", full_times[i]),
+        "PX",
+        math.ceil((full_times[i] - now) * 1000)
+    )
+end
+return false
+"""
+)
+
+KEY_KINDS = ("ip", "email", "user")
+
+
+class RateLimiter:
+    """
+    Limits rate of requests to routes across all app workers. Limits are
+    configured per route by kind of key which identifies the client:
+        - `ip`: Client IP address
+        - `email`: Email from query parameters or JSON body
+        - `user`: Id of authorized user
+    """
+
+    def __init__(
+        self,
+        redis_client_factory: Callable[..., AbstractAsyncContextManager[Redis]],
+        limits: dict[str, dict[str, tuple[int, float]]],
+    ):
+        """
+        Args:
+            limits: Mapping of route, e.g. `GET /tokens`, to limits by key
+                kind. Limit is a count of requests per period in seconds
+        """
+        for route_limits in limits.values():
+            for kind in route_limits:
+                if kind not in KEY_KINDS:
+                    raise ValueError(f"Unknown kind of rate limit key: {kind}")
+
+        self._redis_client_factory = redis_client_factory
+        self._limits = limits
+
+    async def check(self, request: Request, user_id: int | None = None):
+        """
+        Counts request to the route.
+
+        Raises:
+            TooManyRequestsError: Request exceeds some of limits
+        """
+        route = f"{request.method} {request.scope['route'].path}"
+        limits = self._limits.get(route)
+        if not limits:
+            return
+
+        keys = []
+        args = []
+        for kind, (count, period) in limits.items():
+            value = await self._get_key(kind, request, user_id)
+            if value is not None:
+                keys.append(f"rate_limit:{route}:{kind}:{value}")
+                args.extend((count, period))
+
+        if not keys:
+            return
+
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            retry_after = await RATE_LIMIT_SCRIPT(keys=keys, args=args, client=redis)
+
+        if retry_after is not None:
+            raise TooManyRequestsError(retry_after=math.ceil(float(retry_after)))
+
+    async def _get_key(
+        self, kind: str, request: Request, user_id: int | None
+    ) -> str | None:
+        match kind:
+            case "ip":
+                return request.client.host if request.client else None
+            case "user":
+                return None if user_id is None else str(user_id)
+            case "email":
+                email = request.query_params.get("email")
+                if email is None and request.method in ("POST", "PUT", "PATCH"):
+                    try:
+                        body = await request.json()
+                    except (JSONDecodeError, UnicodeDecodeError):
+                        return None
+                    email = body.get("email") if isinstance(body, dict) else None
+                if not isinstance(email, str):
+                    return None
+                return email.strip().lower()
@@ -1,21 +1,250 @@
+import asyncio
+import time
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from typing import Callable
 
-from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
+from redis.typing import EncodableT
+
+import app.config as config
+from app.metrics import count_redis_commands
+
+
+def make_script(script: str) -> AsyncScript:
+    """
+    Returns Lua script which isn't bound to any client. Its digest is computed
+    once, and it is run by the client passed with `client` argument.
+    """
+    return AsyncScript(None, script.encode())
+
+
+# KEYS: lock
+# ARGV: token of lock owner
+RELEASE_LOCK_SCRIPT = make_script(
+    """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+)
+
+
+async def release_lock(redis: Redis, key: str, token: str) -> bool:
+    """
+    Deletes lock only if it is still held by owner of the token, so lock
+    which has expired and was acquired by someone else is left intact.
+    """
+    return bool(await RELEASE_LOCK_SCRIPT(keys=[key], args=[token], client=redis))
+
+
+class TimedBlockingConnectionPool(BlockingConnectionPool):
+    """Connection pool which measures time spent on waiting for connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts_count = 0
+        self.wait_time = 0.0
+
+    async def get_connection(self, command_name, *keys, **options):
+        start_time = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        finally:
+            self.checkouts_count += 1
+            self.wait_time += time.perf_counter() - start_time
+
+
+class AutoPipeline:
+    """
+    Coalesces commands sent by concurrently running tasks into pipelines.
+    Commands are collected for `delay` seconds or until `max_batch_size`
+    commands are queued and then are sent in a single round trip over one
+    connection. Each caller receives result or error of its own command.
+    """
+
+    def __init__(self, redis: Redis, max_batch_size: int, delay: float):
+        self._redis = redis
+        self._max_batch_size = max_batch_size
+        self._delay = delay
+        self._batch: list[tuple[tuple[EncodableT, ...], dict, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        self.batches_count = 0
+        self.commands_count = 0
+
+    async def execute_command(self, *args: EncodableT, **options):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((args, options, future))
+
+        if len(self._batch) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._delay, self._flush)
+
+        return await future
+
+    async def flush(self):
+        """Sends queued commands and waits until all sent batches complete."""
+        self._flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._execute(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(
+        self, batch: list[tuple[tuple[EncodableT, ...], dict, asyncio.Future]]
+    ):
+        self.batches_count += 1
+        self.commands_count += len(batch)
+
+        pipe: Pipeline = self._redis.pipeline(transaction=False)
+        for args, options, _ in batch:
+            pipe.pipeline_execute_command(*args, **options)
+
+        try:
+            results = await pipe.execute(raise_on_error=False)
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class InstrumentedRedis(Redis):
+    """
+    Redis client which accounts commands sent by the current request.
+    Commands are sent through `auto_pipeline` if it is given.
+    """
+
+    def __init__(self, *args, auto_pipeline: AutoPipeline | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._auto_pipeline = auto_pipeline
+
+    async def execute_command(self, *args, **options):
+        start_time = time.perf_counter()
+        try:
+            if self._auto_pipeline is not None:
+                return await self._auto_pipeline.execute_command(*args, **options)
+            return await super().execute_command(*args, **options)
+        finally:
+            count_redis_commands(1, time.perf_counter() - start_time)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None):
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        commands_count = len(self.command_stack)
+        start_time = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            count_redis_commands(commands_count, time.perf_counter() - start_time)
 
 
 class RedisDatabase:
-    def __init__(self, url: str):
-        self._conn_poll = ConnectionPool.from_url(url)
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = config.REDIS_MAX_CONNECTIONS,
+        pool_timeout: float = config.REDIS_POOL_TIMEOUT,
+        pipeline_max_batch_size: int = config.REDIS_PIPELINE_MAX_BATCH_SIZE,
+        pipeline_delay: float = config.REDIS_PIPELINE_DELAY,
+    ):
+        """
+        Args:
+            pipeline_max_batch_size: Max count of commands coalesced into one
+                pipeline. Commands are sent one by one if it is less than 2
+            pipeline_delay: Time in seconds during which commands are coalesced
+        """
+        self._conn_poll = TimedBlockingConnectionPool.from_url(
+            url, max_connections=max_connections, timeout=pool_timeout
+        )
+
+        self._auto_pipeline = None
+        if pipeline_max_batch_size > 1:
+            self._auto_pipeline = AutoPipeline(
+                Redis(connection_pool=self._conn_poll),
+                pipeline_max_batch_size,
+                pipeline_delay,
+            )
+        self._client = InstrumentedRedis(
+            connection_pool=self._conn_poll, auto_pipeline=self._auto_pipeline
+        )
 
     @property
     def connection_pool(self):
         return self._conn_poll
 
-    @asynccontextmanager
-    async def client(self) -> Callable[..., AbstractAsyncContextManager[Redis]]:
+    def pool_stats(self) -> dict[str, int | float]:
+        pool = self._conn_poll
+        return {
+            "size": pool.max_connections,
+            "created": len(pool._connections),
+            "checked_out": pool.max_connections - pool.pool.qsize(),
+            "checkouts_count": pool.checkouts_count,
+            "wait_time": pool.wait_time,
+            **(
+                {
+                    "pipeline_batches_count": self._auto_pipeline.batches_count,
+                    "pipeline_commands_count": self._auto_pipeline.commands_count,
+                }
+                if self._auto_pipeline is not None
+                else {}
+            ),
+        }
+
+    async def warm_up(self, connections_count: int):
+        """
+        Opens pool connections in advance, so the first requests don't wait
+        for them.
+        """
+        pool = self._conn_poll
+        connections = []
         try:
-            client = Redis(connection_pool=self._conn_poll)
-            yield client
+            for _ in range(min(connections_count, pool.max_connections)):
+                connections.append(await pool.get_connection("PING"))
         finally:
-            await client.close()
+            for connection in connections:
+                await pool.release(connection)
+
+    async def ping(self):
+        await self._client.ping()
+
+    async def close(self):
+        """Sends commands queued by auto pipeline and closes all connections."""
+        if self._auto_pipeline is not None:
+            await self._auto_pipeline.flush()
+        await self._conn_poll.disconnect()
+
+    @asynccontextmanager
+    async def client(self) -> Callable[..., AbstractAsyncContextManager[Redis]]:
+        """Provides client shared by all tasks."""
+        yield self._client
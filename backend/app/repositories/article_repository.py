@@ -1,10 +1,52 @@
 from contextlib import AbstractAsyncContextManager
+from datetime import datetime
 from typing import Callable
 
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH, REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import select
+from sqlalchemy.sql import (
+    ColumnElement,
+    bindparam,
+    cast,
+    column,
+    func,
+    literal_column,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.types import REAL, Integer
 
+import app.config as config
+from app.db import is_pinned_to_primary
 from app.models import Article
+from app.schemas import ArticleBodyPatch
+from app.single_flight import SingleFlight
+
+SEARCHABLE_BLOCKS_PATH = (
+    '$[*] ? (@.type == "header" || @.type == "paragraph" '
+    '|| @.type == "quote" || @.type == "list").content'
+)
+
+
+def _search_language() -> ColumnElement:
+    return literal_column(f"'{config.ARTICLE_SEARCH_LANGUAGE}'", REGCONFIG)
+
+
+def _search_vector() -> ColumnElement:
+    """Returns search vector built from article title and text blocks."""
+    title_vector = func.to_tsvector(_search_language(), Article.title)
+    blocks_vector = func.jsonb_to_tsvector(
+        _search_language(),
+        func.jsonb_path_query_array(
+            Article.body, literal_column(f"'{SEARCHABLE_BLOCKS_PATH}'", JSONPATH)
+        ),
+        literal_column("""'["string"]'""", JSONB),
+    )
+    return func.setweight(title_vector, literal_column("'A'")).op("||")(
+        func.setweight(blocks_vector, literal_column("'B'"))
+    )
 
 
 class ArticleRepository:
@@ -12,33 +54,315 @@ class ArticleRepository:
         self, session_factory: Callable[..., AbstractAsyncContextManager[AsyncSession]]
     ):
         self.session_factory = session_factory
+        self.single_flight = SingleFlight()
 
-    async def get_by_id(self, id: int) -> Article | None:
+    async def get_by_id(
+        self, id: int, for_update: bool = False, from_primary: bool = False
+    ) -> Article | None:
+        """
+        Concurrent reads of the same article share one query and the returned
+        object, so it must not be modified unless `for_update` is set. Reads
+        not for update may be served by a replica unless `from_primary` is
+        set, e.g. when article is stored in the cache for longer than replicas
+        may lag.
+        """
+        if for_update:
+            return await self._get_by_id(id)
+
+        from_primary = from_primary or is_pinned_to_primary()
+        return await self.single_flight.do(
+            ("get_by_id", id, from_primary),
+            lambda: self._get_by_id(id, read_only=not from_primary),
+        )
+
+    async def get_version(self, id: int) -> tuple[int, bool, datetime, int] | None:
+        """
+        Returns author id, publication flag, update time and views count of
+        article without loading its body.
+        """
         session: AsyncSession
         async with self.session_factory() as session:
-            return await session.get(Article, id)
+            result = await session.execute(
+                select(
+                    Article.author_id,
+                    Article.is_published,
+                    Article.update_time,
+                    Article.views_count,
+                ).where(Article.id == id)
+            )
+            row = result.one_or_none()
+            return None if row is None else tuple(row)
+
+    async def get_many(self, ids: list[int]) -> list[Article]:
+        """Returns existing articles with given ids in arbitrary order."""
+        session: AsyncSession
+        async with self.session_factory() as session:
+            result = await session.execute(select(Article).where(Article.id.in_(ids)))
+            return list(result.scalars().all())
 
     async def get_by_author_id(self, author_id: int) -> list[Article]:
+        """
+        Concurrent reads of the same author's articles share one query and
+        the returned objects, so they must not be modified. Articles may be
+        read from a replica.
+        """
+        return await self.single_flight.do(
+            ("get_by_author_id", author_id, is_pinned_to_primary()),
+            lambda: self._get_by_author_id(author_id),
+        )
+
+    async def get_ids_by_author_id(
+        self,
+        author_id: int,
+        published_only: bool,
+        before_id: int | None,
+        limit: int,
+    ) -> list[int]:
+        """
+        Returns page of author's articles ids ordered from newest to oldest.
+        Query is served by range scan over `(author_id, is_published, id)` or
+        `(author_id, id)` index, so its cost depends only on page size.
+
+        Args:
+            author_id: Id of articles author
+            published_only: Whether private articles should be skipped
+            before_id: Only articles with lower id are returned if given
+            limit: Max count of returned ids
+        """
+        query = select(Article.id).where(Article.author_id == author_id)
+        if published_only:
+            query = query.where(Article.is_published.is_(True))
+        if before_id is not None:
+            query = query.where(Article.id < before_id)
+
         session: AsyncSession
         async with self.session_factory() as session:
             result = await session.execute(
-                select(Article).where(Article.author_id == author_id)
+                query.order_by(Article.id.desc()).limit(limit)
             )
             return list(result.scalars().all())
 
-    async def save(self, article: Article):
+    async def get_published_page(
+        self, after: tuple[datetime, int] | None, limit: int
+    ) -> list[tuple[datetime, int]]:
+        """
+        Returns page of published articles ordered from the most recently
+        published. Query is served by backward range scan over partial
+        `(publish_time, id)` index, so its cost depends only on page size.
+
+        Args:
+            after: Publish time and id of the last article of the previous page
+            limit: Max count of returned articles
+
+        Returns:
+            Pairs of article publish time and id
+        """
+        query = select(Article.publish_time, Article.id).where(
+            Article.is_published.is_(True)
+        )
+        if after is not None:
+            query = query.where(tuple_(Article.publish_time, Article.id) < after)
+
+        session: AsyncSession
+        async with self.session_factory() as session:
+            result = await session.execute(
+                query.order_by(Article.publish_time.desc(), Article.id.desc()).limit(
+                    limit
+                )
+            )
+            return [tuple(row) for row in result.all()]
+
+    async def save(self, article: Article) -> Article:
         session: AsyncSession
         async with self.session_factory() as session:
             session.add(article)
             await session.flush()
+
+            # Search vector is computed from the flushed row values
+            if session.bind.dialect.name == "postgresql":
+                await session.execute(
+                    update(Article)
+                    .where(Article.id == article.id)
+                    .values(search_vector=_search_vector())
+                    .execution_options(synchronize_session=False)
+                )
+
             await session.commit()
+            return article
+
+    async def update_body(
+        self, id: int, patch: ArticleBodyPatch, update_time: datetime
+    ) -> Article | None:
+        """
+        Applies block operations to article body. On PostgreSQL body is
+        changed inside database, so only operations are sent to it.
 
-    async def add_view(self, id: int):
+        Returns:
+            Updated article or `None` if article doesn't exist or indexes of
+            operations are out of its body
+        """
+        min_body_length = patch.min_body_length()
+
+        session: AsyncSession
         async with self.session_factory() as session:
-            article = await session.get(Article, id)
+            if session.bind.dialect.name != "postgresql":
+                article = await session.get(Article, id)
+                if article is None or len(article.body) < min_body_length:
+                    return None
+
+                article.body = patch.apply(article.body)
+                article.update_time = update_time
+                await session.commit()
+                return article
+
+            operations = patch.dict()["operations"]
+            result = await session.scalars(
+                update(Article)
+                .where(
+                    Article.id == id,
+                    func.jsonb_array_length(Article.body) >= min_body_length,
+                )
+                .values(
+                    body=func.apply_article_block_operations(
+                        Article.body, bindparam("operations", operations, JSONB)
+                    ),
+                    update_time=update_time,
+                )
+                .returning(Article)
+                .execution_options(synchronize_session=False)
+            )
+            article = result.one_or_none()
             if article is None:
+                return None
+
+            await session.execute(
+                update(Article)
+                .where(Article.id == id)
+                .values(search_vector=_search_vector())
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return article
+
+    async def search_published(
+        self, query: str, after: tuple[float, int] | None, limit: int
+    ) -> list[tuple[int, float]]:
+        """
+        Returns page of published articles matching search query ordered by
+        rank from highest to lowest. Matching articles are found with GIN
+        index over `search_vector`. Works only on PostgreSQL.
+
+        Args:
+            query: Search query in web search engines syntax
+            after: Rank and id of the last article of the previous page
+            limit: Max count of returned articles
+
+        Returns:
+            Pairs of article id and rank
+        """
+        ts_query = func.websearch_to_tsquery(_search_language(), query)
+        rank = func.ts_rank(Article.search_vector, ts_query, type_=REAL)
+
+        stmt = select(Article.id, rank).where(
+            Article.is_published.is_(True),
+            Article.search_vector.bool_op("@@")(ts_query),
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(rank, Article.id) < tuple_(cast(after[0], REAL), after[1])
+            )
+
+        session: AsyncSession
+        async with self.session_factory() as session:
+            result = await session.execute(
+                stmt.order_by(rank.desc(), Article.id.desc()).limit(limit)
+            )
+            return [(id, rank) for id, rank in result.all()]
+
+    async def _get_by_id(self, id: int, read_only: bool = False) -> Article | None:
+        session: AsyncSession
+        async with self.session_factory(read_only=read_only) as session:
+            return await session.get(Article, id)
+
+    async def _get_by_author_id(self, author_id: int) -> list[Article]:
+        session: AsyncSession
+        async with self.session_factory(read_only=True) as session:
+            result = await session.execute(
+                select(Article).where(Article.author_id == author_id)
+            )
+            return list(result.scalars().all())
+
+    async def add_views(self, views: dict[int, int]):
+        """
+        Increases views counters of many articles at once. Rows are updated
+        with batched multi-row `UPDATE ... FROM (VALUES ...)` statements
+        inside a single transaction. Databases without such syntax (SQLite) get
+        a plain executemany update.
+
+        Args:
+            views: Mapping of article id to count of new views
+        """
+        if not views:
+            return
+
+        items = list(views.items())
+        batch_size = config.ARTICLE_VIEWS_FLUSH_BATCH_SIZE
+
+        session: AsyncSession
+        async with self.session_factory() as session:
+            if session.bind.dialect.name != "postgresql":
+                await session.execute(
+                    update(Article.__table__)
+                    .where(Article.id == bindparam("article_id"))
+                    .values(views_count=Article.views_count + bindparam("views")),
+                    [{"article_id": id, "views": count} for id, count in items],
+                )
+                await session.commit()
                 return
 
-            article.views_count = Article.views_count + 1
-            await session.flush()
+            for i in range(0, len(items), batch_size):
+                batch = items[i : i + batch_size]  # noqa: E203
+                deltas = values(
+                    column("id", Integer), column("views", Integer), name="deltas"
+                ).data(batch)
+
+                await session.execute(
+                    update(Article)
+                    .where(Article.id == deltas.c.id)
+                    .values(views_count=Article.views_count + deltas.c.views)
+                    .execution_options(synchronize_session=False)
+                )
             await session.commit()
+
+    async def update_search_vectors(self, min_id: int, max_id: int) -> int:
+        """
+        Computes missing search vectors of articles with ids in the given
+        range, e.g. after bulk import. Rows are updated in batches of
+        `ARTICLE_SEARCH_INDEX_BATCH_SIZE` ids, each in its own transaction, so
+        locks are held shortly. Works only on PostgreSQL.
+
+        Returns:
+            Count of updated articles
+        """
+        batch_size = config.ARTICLE_SEARCH_INDEX_BATCH_SIZE
+        count = 0
+
+        session: AsyncSession
+        async with self.session_factory() as session:
+            if session.bind.dialect.name != "postgresql":
+                return 0
+
+            for start_id in range(min_id, max_id + 1, batch_size):
+                result = await session.execute(
+                    update(Article)
+                    .where(
+                        Article.id >= start_id,
+                        Article.id < start_id + batch_size,
+                        Article.search_vector.is_(None),
+                    )
+                    .values(search_vector=_search_vector())
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+                count += result.rowcount
+        return count
@@ -4,7 +4,9 @@ from typing import Callable
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import select
 
+from app.db import is_pinned_to_primary
 from app.models import User
+from app.single_flight import SingleFlight
 
 
 class UserRepository:
@@ -12,20 +14,42 @@ class UserRepository:
         self, session_factory: Callable[..., AbstractAsyncContextManager[AsyncSession]]
     ):
         self.session_factory = session_factory
+        self.single_flight = SingleFlight()
 
-    async def get_by_id(self, id: int) -> User | None:
+    async def get_by_id(self, id: int, for_update: bool = False) -> User | None:
+        """
+        Concurrent reads of the same user share one query and the returned
+        object, so it must not be modified unless `for_update` is set. Reads
+        not for update may be served by a replica.
+        """
+        if for_update:
+            return await self._get_by_id(id)
+        return await self.single_flight.do(
+            ("get_by_id", id, is_pinned_to_primary()),
+            lambda: self._get_by_id(id, read_only=True),
+        )
+
+    async def get_many(self, ids: list[int]) -> list[User]:
+        """Returns existing users with given ids in arbitrary order."""
         session: AsyncSession
         async with self.session_factory() as session:
-            return await session.get(User, id)
+            result = await session.execute(select(User).where(User.id.in_(ids)))
+            return list(result.scalars().all())
 
-    async def get_by_email(self, email: str) -> User | None:
+    async def get_by_email(self, email: str, from_primary: bool = False) -> User | None:
+        """User may be read from a replica unless `from_primary` is set."""
         session: AsyncSession
-        async with self.session_factory() as session:
+        async with self.session_factory(read_only=not from_primary) as session:
             result = await session.execute(
                 select(User).where(User.email == email).limit(1)
             )
             return result.scalar_one_or_none()
 
+    async def _get_by_id(self, id: int, read_only: bool = False) -> User | None:
+        session: AsyncSession
+        async with self.session_factory(read_only=read_only) as session:
+            return await session.get(User, id)
+
     async def save(self, user: User) -> User:
         session: AsyncSession
         async with self.session_factory() as session:
@@ -0,0 +1,30 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _encode_model(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializes content into JSON. Pydantic models are serialized by their
+    fields values as is, without validation and conversion.
+    """
+    return orjson.dumps(content, default=_encode_model, option=orjson.OPT_NON_STR_KEYS)
+
+
+class JSONResponse(ORJSONResponse):
+    """
+    Response serialized with orjson. Returning it from endpoint skips
+    validation of the content against `response_model`, so it should be used
+    for data which was already validated on write.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -8,9 +8,25 @@ from .article_blocks import (
     ArticleParagraph,
     ArticleQuote,
 )
+from .article_body_patch import (
+    ArticleBlockDelete,
+    ArticleBlockInsert,
+    ArticleBlockMove,
+    ArticleBlockOperation,
+    ArticleBlockReplace,
+    ArticleBodyPatch,
+)
 from .article_create_schema import ArticleCreateSchema
 from .article_schema import ArticleSchema
+from .articles_feed_page import ArticlesFeedPage
+from .articles_search_page import ArticlesSearchPage
 from .auth_tokens import AuthTokens
+from .batch import BatchSubRequest, BatchSubResponse
+from .bulk_items import ArticleBulkItem, BulkItem, UserBulkItem
+from .bulk_records import ArticleRecord, UserRecord
 from .error_response import ErrorResponse
+from .health_status import HealthStatus
+from .orm_schema import ORMSchema
+from .pools_stats import PoolsStats
 from .user_create_schema import UserCreateSchema
 from .user_schema import UserSchema
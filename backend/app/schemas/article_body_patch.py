@@ -0,0 +1,87 @@
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field, conint, conlist
+
+import app.config as config
+from app.schemas.article_blocks import ArticleBlock
+
+
+class ArticleBlockInsert(BaseModel):
+    """Inserts block before block with given index or appends it."""
+
+    op: Literal["insert"]
+    index: conint(ge=0)
+    block: ArticleBlock
+
+
+class ArticleBlockReplace(BaseModel):
+    op: Literal["replace"]
+    index: conint(ge=0)
+    block: ArticleBlock
+
+
+class ArticleBlockDelete(BaseModel):
+    op: Literal["delete"]
+    index: conint(ge=0)
+
+
+class ArticleBlockMove(BaseModel):
+    """Moves block, so it gets `to_index` index in the changed body."""
+
+    op: Literal["move"]
+    index: conint(ge=0)
+    to_index: conint(ge=0)
+
+
+ArticleBlockOperation = Annotated[
+    ArticleBlockInsert | ArticleBlockReplace | ArticleBlockDelete | ArticleBlockMove,
+    Field(discriminator="op"),
+]
+
+
+class ArticleBodyPatch(BaseModel):
+    operations: conlist(
+        ArticleBlockOperation,
+        min_items=1,
+        max_items=config.ARTICLE_PATCH_MAX_OPERATIONS,
+    )
+
+    def min_body_length(self) -> int:
+        """
+        Returns min length of body to which operations can be applied, i.e.
+        indexes of all operations are inside the body changed by previous
+        operations.
+        """
+        min_length = 0
+        length_delta = 0
+        for operation in self.operations:
+            match operation:
+                case ArticleBlockInsert():
+                    min_length = max(min_length, operation.index - length_delta)
+                    length_delta += 1
+                case ArticleBlockReplace() | ArticleBlockDelete():
+                    min_length = max(min_length, operation.index + 1 - length_delta)
+                    if isinstance(operation, ArticleBlockDelete):
+                        length_delta -= 1
+                case ArticleBlockMove():
+                    index = max(operation.index, operation.to_index)
+                    min_length = max(min_length, index + 1 - length_delta)
+        return min_length
+
+    def apply(self, body: list[dict]) -> list[dict]:
+        """
+        Returns body changed by operations. Body must have at least
+        `min_body_length()` blocks.
+        """
+        body = list(body)
+        for operation in self.operations:
+            match operation:
+                case ArticleBlockInsert():
+                    body.insert(operation.index, operation.block.dict())
+                case ArticleBlockReplace():
+                    body[operation.index] = operation.block.dict()
+                case ArticleBlockDelete():
+                    del body[operation.index]
+                case ArticleBlockMove():
+                    body.insert(operation.to_index, body.pop(operation.index))
+        return body
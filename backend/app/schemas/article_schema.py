@@ -1,12 +1,13 @@
 from datetime import datetime
 
-from pydantic import BaseModel, constr
+from pydantic import constr
 
 import app.config as config
 from app.schemas.article_blocks import ArticleBlock
+from app.schemas.orm_schema import ORMSchema
 
 
-class ArticleSchema(BaseModel):
+class ArticleSchema(ORMSchema):
     id: int | None
     author_id: int | None
     creation_time: datetime | None
@@ -16,6 +17,3 @@ class ArticleSchema(BaseModel):
     is_published: bool
     views_count: int | None
     likes_count: int | None
-
-    class Config:
-        orm_mode = True
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class ArticlesFeedPage(BaseModel):
+    ids: list[int]
+    next_cursor: str | None = None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class ArticlesSearchPage(BaseModel):
+    ids: list[int]
+    next_cursor: str | None = None
@@ -0,0 +1,24 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, validator
+
+
+class BatchSubRequest(BaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    params: dict[str, str | int | list[str | int]] = {}
+    headers: dict[str, str] = {}
+    body: Any = None
+
+    @validator("path")
+    def check_path(cls, path: str):
+        if not path.startswith("/"):
+            raise ValueError("Path should be absolute")
+        if path.rstrip("/") == "/batch":
+            raise ValueError("Batch requests can't be nested")
+        return path
+
+
+class BatchSubResponse(BaseModel):
+    status: int
+    body: Any = None
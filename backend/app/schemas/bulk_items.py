@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+from app.exceptions import AppException
+from app.schemas.article_schema import ArticleSchema
+from app.schemas.error_response import ErrorResponse
+from app.schemas.user_schema import UserSchema
+
+
+class BulkItem(BaseModel):
+    id: int
+    error: ErrorResponse | None = None
+
+    @classmethod
+    def from_exception(cls, id: int, exc: type[AppException]):
+        return cls(
+            id=id, error=ErrorResponse(error_code=exc.error_code, details=exc.details)
+        )
+
+
+class ArticleBulkItem(BulkItem):
+    article: ArticleSchema | None = None
+
+
+class UserBulkItem(BulkItem):
+    user: UserSchema | None = None
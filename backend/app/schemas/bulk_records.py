@@ -0,0 +1,95 @@
+from datetime import date, datetime, timezone
+
+from email_validator import validate_email
+from pydantic import BaseModel, conint, constr, root_validator, validator
+
+import app.config as config
+from app.schemas.article_blocks import ArticleBlock
+
+
+def _to_naive_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class UserRecord(BaseModel):
+    """
+    User of bulk import. Password is given either as hex encoded salt and key
+    computed in advance or as plain text which is hashed during import.
+    """
+
+    id: conint(ge=1) | None = None
+    email: constr(max_length=config.USER_EMAIL_LENGTH)
+    display_name: constr(
+        strip_whitespace=True, min_length=1, max_length=config.USER_DISPLAY_NAME_LENGTH
+    )
+    password_salt: bytes | None = None
+    password_key: bytes | None = None
+    password: constr(
+        min_length=config.USER_PASSWORD_MIN_LENGTH,
+        max_length=config.USER_PASSWORD_MAX_LENGTH,
+    ) | None = None
+    is_active: bool = True
+    creation_date: date | None = None
+
+    @validator("email")
+    def normalize_email(cls, email: str):
+        return validate_email(email, check_deliverability=False).email
+
+    @validator("password_salt", "password_key", pre=True)
+    def decode_hex(cls, value):
+        if isinstance(value, str):
+            return bytes.fromhex(value)
+        return value
+
+    @root_validator(skip_on_failure=True)
+    def check_password(cls, values: dict):
+        salt, key = values["password_salt"], values["password_key"]
+        if salt is None and key is None:
+            if values["password"] is None:
+                raise ValueError("Either password or its salt and key are required")
+            return values
+
+        if salt is None or key is None:
+            raise ValueError("Password salt and key must be given together")
+        if not 0 < len(salt) <= config.PASSWORD_SALT_LENGTH:
+            raise ValueError("Invalid length of password salt")
+        if len(key) != config.PASSWORD_KEY_LENGTH:
+            raise ValueError("Invalid length of password key")
+        return values
+
+
+class ArticleRecord(BaseModel):
+    """
+    Article of bulk import. Publish time of published articles is their
+    update time by default. Times without time zone are treated as UTC.
+    """
+
+    id: conint(ge=1) | None = None
+    author_id: int
+    title: constr(
+        strip_whitespace=True, min_length=1, max_length=config.ARTICLE_TITLE_LENGTH
+    )
+    body: list[ArticleBlock] = []
+    is_published: bool = False
+    creation_time: datetime | None = None
+    update_time: datetime | None = None
+    publish_time: datetime | None = None
+    views_count: conint(ge=0) = 0
+
+    _normalize_times = validator(
+        "creation_time", "update_time", "publish_time", allow_reuse=True
+    )(_to_naive_utc)
+
+    @root_validator(skip_on_failure=True)
+    def fill_times(cls, values: dict):
+        values["creation_time"] = (
+            values["creation_time"] or values["update_time"] or datetime.utcnow()
+        )
+        values["update_time"] = values["update_time"] or values["creation_time"]
+        if not values["is_published"]:
+            values["publish_time"] = None
+        elif values["publish_time"] is None:
+            values["publish_time"] = values["update_time"]
+        return values
@@ -0,0 +1,8 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class HealthStatus(BaseModel):
+    status: Literal["ok"] = "ok"
+    checks: dict[str, bool] = {}
@@ -0,0 +1,22 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class ORMSchema(BaseModel):
+    class Config:
+        orm_mode = True
+
+    @classmethod
+    def construct_from_orm(cls, obj: Any):
+        """
+        Creates schema from ORM object without validation. Should be used
+        only for data which was validated before it was written to database.
+        """
+        return cls.construct(
+            **{
+                name: getattr(obj, name)
+                for name in cls.__fields__
+                if hasattr(obj, name)
+            }
+        )
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, StrictInt
+
+
+class PoolsStats(BaseModel):
+    database: dict[str, StrictInt | float]
+    redis: dict[str, StrictInt | float]
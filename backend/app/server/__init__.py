@@ -0,0 +1,84 @@
+"""
+Production launcher of the app. Runs several worker processes with uvloop
+event loop and httptools HTTP parser, which share one listening socket.
+"""
+import asyncio
+import logging
+import sys
+from types import FrameType
+
+from uvicorn import Config, Server
+from uvicorn.importer import import_from_string
+from uvicorn.supervisors import Multiprocess
+
+from app.health import HealthCheck
+
+APP = "app.main:app"
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class DrainingServer(Server):
+    """
+    Server which keeps serving requests for `drain_delay` seconds after the
+    first shutdown signal, while readiness check of the app fails, so load
+    balancer stops sending new requests before the socket is closed. Then
+    in-flight requests are completed and the app is shut down.
+    """
+
+    def __init__(self, config: Config, drain_delay: float):
+        super().__init__(config)
+        self.drain_delay = drain_delay
+        self.is_draining = False
+        self._health_check: HealthCheck | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def install_signal_handlers(self):
+        # Signal handler only switches flags, so everything it needs is
+        # resolved beforehand
+        app = import_from_string(self.config.app)
+        self._health_check = app.container.health_check()
+        self._loop = asyncio.get_running_loop()
+        super().install_signal_handlers()
+
+    def handle_exit(self, sig: int, frame: FrameType | None):
+        # Repeated signal stops the worker without waiting
+        if self.is_draining or self.drain_delay <= 0:
+            super().handle_exit(sig, frame)
+            return
+
+        self.is_draining = True
+        logger.info("Draining for %.1f seconds before shutdown", self.drain_delay)
+
+        self._health_check.is_ready = False
+        self._loop.call_later(self.drain_delay, super().handle_exit, sig, frame)
+
+
+def run(host: str, port: int, workers: int, drain_delay: float, **options):
+    """
+    Runs the app until shutdown signal. Each worker prepares connection pools
+    before it starts accepting requests.
+
+    Args:
+        options: Other options of `uvicorn.Config`
+    """
+    config = Config(
+        APP,
+        host=host,
+        port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        **options,
+    )
+    server = DrainingServer(config, drain_delay)
+
+    if config.workers > 1:
+        sock = config.bind_socket()
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+    if config.workers == 1 and not server.started:
+        sys.exit(3)
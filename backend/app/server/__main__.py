@@ -0,0 +1,50 @@
+"""
+Runs the app in production mode.
+
+Usage:
+    python -m app.server [--host HOST] [--port PORT] [--workers COUNT]
+"""
+import argparse
+import os
+
+import app.config as config
+from app.server import run
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("BACKEND_PORT", 8000))
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        help="Count of worker processes. Count of CPUs by default",
+    )
+    parser.add_argument(
+        "--drain-delay",
+        type=float,
+        default=config.SERVER_DRAIN_DELAY,
+        help="Seconds to serve requests after shutdown signal before closing",
+    )
+    parser.add_argument(
+        "--forwarded-allow-ips",
+        help="Comma separated IPs of proxies trusted to set client address",
+    )
+    parser.add_argument("--no-access-log", action="store_true")
+    args = parser.parse_args()
+
+    run(
+        args.host,
+        args.port,
+        args.workers,
+        args.drain_delay,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+        access_log=not args.no_access_log,
+    )
+
+
+if __name__ == "__main__":
+    main()
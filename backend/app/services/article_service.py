@@ -1,62 +1,574 @@
+import asyncio
+import os
+import re
+import time
 from contextlib import AbstractAsyncContextManager
-from typing import Callable
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple
 
+import orjson
 from starlette.datastructures import Address
 
 import app.config as config
-from app.exceptions import ContentNotFoundError
+from app.cache import RedisCache
+from app.compression import complete_partial, compress_partial
+from app.exceptions import ContentNotFoundError, InvalidInputFormatError
 from app.models import Article
-from app.redis import Redis
+from app.redis import Redis, release_lock
 from app.repositories import ArticleRepository
-from app.schemas import ArticleSchema
+from app.responses import dumps
+from app.schemas import (
+    ArticleBodyPatch,
+    ArticleSchema,
+    ArticlesFeedPage,
+    ArticlesSearchPage,
+)
+
+VIEWS_PENDING_KEY = "articles:views:pending"
+VIEWS_FLUSHING_KEY = "articles:views:flushing"
+VIEWS_FLUSH_LOCK_KEY = "articles:views:flush_lock"
+FEED_KEY = "articles:feed"
+FEED_REBUILD_LOCK_KEY = "articles:feed:rebuild_lock"
+# Exists if the oldest entries were trimmed from the feed
+FEED_TRUNCATED_KEY = "articles:feed:truncated"
+# Feed member which marks that feed is built. Sorts before all entries
+FEED_BUILT_MARKER = "0"
+FEED_ENTRY_PATTERN = re.compile(r"\d{16}:\d{10}")
+EPOCH = datetime(1970, 1, 1)
+
+
+def article_cache_key(article_id: int, update_time: datetime) -> str:
+    """
+    Returns key of published article version. Updated article gets a new key,
+    so stale version can't be served after update.
+    """
+    return f"article:{article_id}:{update_time:%Y%m%d%H%M%S%f}:json"
+
+
+def views_count_completion(views_count: int) -> bytes:
+    """Returns ending of article JSON cached without its views count."""
+    return b',"views_count":%d}' % views_count
+
+
+def article_version_key(article_id: int) -> str:
+    return f"article:{article_id}:version"
+
+
+def compressed_article_key(
+    article_id: int, update_time: datetime, encoding: str
+) -> str:
+    return f"article:{article_id}:{update_time:%Y%m%d%H%M%S%f}:json:{encoding}"
+
+
+def published_article_keys(article_id: int, update_time: datetime) -> list[str]:
+    """Returns keys of published article version and its compressed variants."""
+    return [article_cache_key(article_id, update_time)] + [
+        compressed_article_key(article_id, update_time, encoding)
+        for encoding in config.COMPRESSION_ENCODINGS
+    ]
+
+
+def feed_entry(publish_time: datetime, article_id: int) -> str:
+    """
+    Returns member of the feed sorted set. All members have the same score and
+    are ordered lexicographically, so fields have fixed width to keep members
+    ordered by publish time and then by id.
+    """
+    microseconds = (publish_time - EPOCH) // timedelta(microseconds=1)
+    return f"{microseconds:016d}:{article_id:010d}"
+
+
+def trending_key(period: str, window: int) -> str:
+    return f"articles:trending:{period}:{window}"
+
+
+def parse_feed_entry(entry: str) -> tuple[datetime, int]:
+    microseconds, article_id = entry.split(":")
+    return EPOCH + timedelta(microseconds=int(microseconds)), int(article_id)
+
+
+class ArticleVersion(NamedTuple):
+    author_id: int
+    is_published: bool
+    update_time: datetime
+    # Persisted views count, which isn't a part of article version
+    views_count: int
 
 
 class ArticleService:
     def __init__(
         self,
         article_repo: ArticleRepository,
+        article_cache: RedisCache,
         redis_client_factory: Callable[..., AbstractAsyncContextManager[Redis]],
     ):
         self._article_repo = article_repo
+        self._article_cache = article_cache
         self._redis_client_factory = redis_client_factory
 
     async def create(self, title: str, author_id: int) -> ArticleSchema:
-        article = Article(title=title.strip(), author_id=author_id)
-
-        return ArticleSchema.from_orm(await self._article_repo.save(article))
+        article = ArticleSchema.from_orm(
+            await self._article_repo.save(
+                Article(title=title.strip(), author_id=author_id)
+            )
+        )
+        # Id may have been requested before the article existed
+        await self._article_cache.invalidate(article_version_key(article.id))
+        return article
 
     async def get_by_id(self, id: int) -> ArticleSchema | None:
-        article = await self._article_repo.get_by_id(id)
-        if article is None:
+        db_article = await self._article_repo.get_by_id(id)
+        if db_article is None:
+            return None
+
+        article = ArticleSchema.construct_from_orm(db_article)
+        await self._add_pending_views([article])
+        return article
+
+    async def get_many(self, ids: list[int]) -> dict[int, ArticleSchema]:
+        """
+        Returns:
+            Mapping of article id to article. Missing articles are skipped
+        """
+        db_articles = await self._article_repo.get_many(list(set(ids)))
+
+        articles = list(map(ArticleSchema.construct_from_orm, db_articles))
+        await self._add_pending_views(articles)
+        return {a.id: a for a in articles}
+
+    async def get_published_json(
+        self, id: int, version: ArticleVersion, encoding: str | None = None
+    ) -> tuple[bytes, str | None] | None:
+        """
+        Returns published article serialized into JSON. Articles are cached by
+        id and update time without views count, which is appended to each
+        response as count of `version` with views which are not flushed yet.
+
+        Compressed variants are cached as unfinished streams alongside the
+        article, and each response is completed with its views count. So
+        article is compressed with `PRECOMPRESSION_LEVELS` level only once
+        per version across all app workers.
+
+        Args:
+            version: Version of article returned by `get_version`
+            encoding: Encoding accepted by client. Articles smaller than
+                `COMPRESSION_MIN_SIZE` are not compressed
+
+        Returns:
+            Serialized article and its encoding or `None` if article doesn't
+            exist or is private
+        """
+        content = await self._article_cache.get(
+            article_cache_key(id, version.update_time),
+            lambda: self._load_published_json(id),
+        )
+        if not content:
             return None
-        return ArticleSchema.from_orm(article)
+
+        completion = views_count_completion(
+            version.views_count + (await self._get_pending_views([id]))[0]
+        )
+        if (
+            encoding is None
+            or len(content) + len(completion) < config.COMPRESSION_MIN_SIZE
+        ):
+            return content + completion, None
+
+        partial = await self._article_cache.get(
+            compressed_article_key(id, version.update_time, encoding),
+            lambda: asyncio.to_thread(
+                compress_partial,
+                content,
+                encoding,
+                config.PRECOMPRESSION_LEVELS[encoding],
+            ),
+        )
+        return complete_partial(partial, encoding, completion), encoding
+
+    async def get_version(self, id: int) -> ArticleVersion | None:
+        """
+        Returns fields which identify state of article and its persisted
+        views count without loading its body. Versions are served from the
+        cache, which is invalidated when article is updated or its views are
+        flushed.
+        """
+        content = await self._article_cache.get(
+            article_version_key(id), lambda: self._load_version_json(id)
+        )
+        if not content:
+            return None
+
+        author_id, is_published, update_time, views_count = orjson.loads(content)
+        return ArticleVersion(
+            author_id, is_published, datetime.fromisoformat(update_time), views_count
+        )
 
     async def get_by_author_id(self, author_id: int) -> list[ArticleSchema]:
         db_articles = await self._article_repo.get_by_author_id(author_id)
-        return list(map(ArticleSchema.from_orm, db_articles))
+
+        articles = list(map(ArticleSchema.construct_from_orm, db_articles))
+        await self._add_pending_views(articles)
+        return articles
+
+    async def get_ids_by_author_id(
+        self,
+        author_id: int,
+        include_private: bool,
+        before_id: int | None = None,
+        limit: int = config.ARTICLES_PAGE_SIZE,
+    ) -> list[int]:
+        return await self._article_repo.get_ids_by_author_id(
+            author_id, not include_private, before_id, limit
+        )
+
+    async def search(
+        self,
+        query: str,
+        cursor: str | None = None,
+        limit: int = config.ARTICLES_PAGE_SIZE,
+    ) -> ArticlesSearchPage:
+        """
+        Searches published articles by title and text blocks.
+
+        Args:
+            query: Search query in web search engines syntax
+            cursor: `next_cursor` of the previous page
+
+        Raises:
+            InvalidInputFormatError: Cursor is malformed
+        """
+        after = None
+        if cursor is not None:
+            try:
+                rank, id = cursor.split(":")
+                after = (float(rank), int(id))
+            except ValueError:
+                raise InvalidInputFormatError(details="Invalid search cursor")
+
+        results = await self._article_repo.search_published(query, after, limit)
+
+        next_cursor = None
+        if len(results) == limit:
+            id, rank = results[-1]
+            next_cursor = f"{rank!r}:{id}"
+
+        return ArticlesSearchPage(
+            ids=[id for id, _ in results], next_cursor=next_cursor
+        )
+
+    async def get_feed(
+        self, cursor: str | None = None, limit: int = config.ARTICLES_PAGE_SIZE
+    ) -> ArticlesFeedPage:
+        """
+        Returns page of published articles ordered from the most recently
+        published. Latest `ARTICLES_FEED_SIZE` articles are served from Redis
+        sorted set, older ones and the whole feed while the set is rebuilt are
+        read from the database.
+
+        Args:
+            cursor: `next_cursor` of the previous page
+
+        Raises:
+            InvalidInputFormatError: Cursor is malformed
+        """
+        after = None
+        if cursor is not None:
+            if FEED_ENTRY_PATTERN.fullmatch(cursor) is None:
+                raise InvalidInputFormatError(details="Invalid feed cursor")
+            after = parse_feed_entry(cursor)
+
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zscore(FEED_KEY, FEED_BUILT_MARKER)
+                pipe.exists(FEED_TRUNCATED_KEY)
+                pipe.zrevrangebylex(
+                    FEED_KEY,
+                    "+" if cursor is None else f"({cursor}",
+                    f"({FEED_BUILT_MARKER}",
+                    0,
+                    limit,
+                )
+                is_built, is_truncated, members = await pipe.execute()
+
+        if is_built is None:
+            await self._rebuild_feed()
+            entries = await self._article_repo.get_published_page(after, limit)
+        else:
+            entries = [parse_feed_entry(member.decode()) for member in members]
+            # Articles older than cached ones are left only in the database
+            if len(entries) < limit and is_truncated:
+                entries += await self._article_repo.get_published_page(
+                    entries[-1] if entries else after, limit - len(entries)
+                )
+
+        return ArticlesFeedPage(
+            ids=[id for _, id in entries],
+            next_cursor=feed_entry(*entries[-1]) if len(entries) == limit else None,
+        )
 
     async def update(self, article: ArticleSchema) -> ArticleSchema:
-        db_article = await self._article_repo.get_by_id(article.id)
+        db_article = await self._article_repo.get_by_id(article.id, for_update=True)
         if db_article is None:
             raise ContentNotFoundError()
 
+        was_published = db_article.is_published
+        prev_publish_time = db_article.publish_time
+        prev_update_time = db_article.update_time
+
         db_article.title = article.title.strip()
-        db_article.body = article.body
+        db_article.body = [block.dict() for block in article.body]
         db_article.is_published = article.is_published
+        db_article.update_time = datetime.utcnow()
+        if article.is_published and not was_published:
+            db_article.publish_time = db_article.update_time
+        elif not article.is_published:
+            db_article.publish_time = None
         db_article = await self._article_repo.save(db_article)
+        await self._article_cache.invalidate(
+            *published_article_keys(db_article.id, prev_update_time),
+            article_version_key(db_article.id),
+        )
 
-        return ArticleSchema.from_orm(db_article)
+        if article.is_published and not was_published:
+            await self._add_to_feed(feed_entry(db_article.publish_time, db_article.id))
+        elif was_published and not article.is_published:
+            await self._remove_from_trending(db_article.id)
+            if prev_publish_time is not None:
+                await self._remove_from_feed(
+                    feed_entry(prev_publish_time, db_article.id)
+                )
 
-    async def count_view(self, article_id: int, client_address: Address):
-        db_article = await self._article_repo.get_by_id(article_id)
+        article = ArticleSchema.construct_from_orm(db_article)
+        await self._add_pending_views([article])
+        return article
+
+    async def update_body(self, id: int, patch: ArticleBodyPatch) -> ArticleSchema:
+        """
+        Applies block operations to article body. Operations are applied in
+        order, each to the body changed by previous ones.
+
+        Raises:
+            ContentNotFoundError: Article doesn't exist
+            InvalidInputFormatError: Block index is out of article body
+        """
+        db_article = await self._article_repo.update_body(id, patch, datetime.utcnow())
         if db_article is None:
-            raise ContentNotFoundError()
+            if await self._article_repo.get_version(id) is None:
+                raise ContentNotFoundError()
+            raise InvalidInputFormatError(details="Block index is out of range")
+
+        # Cached article of the previous version just expires
+        await self._article_cache.invalidate(article_version_key(id))
+
+        article = ArticleSchema.construct_from_orm(db_article)
+        await self._add_pending_views([article])
+        return article
+
+    async def get_trending(
+        self, period: str, limit: int = config.ARTICLES_PAGE_SIZE
+    ) -> list[int]:
+        """
+        Returns ids of published articles with the highest score of views made
+        in the current and previous windows of period.
+
+        Args:
+            period: Name of period from `ARTICLES_TRENDING_PERIODS`
+        """
+        window = int(time.time() // config.ARTICLES_TRENDING_PERIODS[period])
+
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            ids = await redis.zrevrange(trending_key(period, window), 0, limit - 1)
+        return list(map(int, ids))
+
+    async def count_view(
+        self, article_id: int, client_address: Address, is_published: bool = True
+    ):
+        """
+        Counts article view made by client. Views are buffered in Redis and
+        written into the database later by `flush_views`. Repeated views from
+        the same client are ignored for `ARTICLE_VIEW_COUNT_DELAY` seconds.
+
+        Views of published articles also increase their trending scores. View
+        is added into the current window and, with halved weight, into the
+        next one, so score of the current window always includes decayed views
+        of the previous window. Each window expires when it ends.
+        """
+        redis_key = f"client:{client_address.host}:viewed_article:{article_id}"
+
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            is_new_view = await redis.set(
+                redis_key, "", ex=config.ARTICLE_VIEW_COUNT_DELAY, nx=True
+            )
+            if not is_new_view:
+                return
+
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hincrby(VIEWS_PENDING_KEY, article_id, 1)
+                if is_published:
+                    now = time.time()
+                    for period, length in config.ARTICLES_TRENDING_PERIODS.items():
+                        window = int(now // length)
+                        for w in (window, window + 1):
+                            key = trending_key(period, w)
+                            # Instead of decaying older scores, weight of new
+                            # views doubles every window. Weight is relative to
+                            # window start, so scores stay small
+                            weight = 2 ** ((now - w * length) / length)
+                            pipe.zincrby(key, weight, article_id)
+                            pipe.zremrangebyrank(
+                                key, 0, -config.ARTICLES_TRENDING_SIZE - 1
+                            )
+                            pipe.expireat(key, (w + 1) * length)
+                await pipe.execute()
+
+    async def flush_views(self) -> int:
+        """
+        Writes views buffered by `count_view` into the database. Only one
+        flush is performed at a time across all app workers. Lock is released
+        only by its owner, so flush which outlived the lock doesn't release
+        lock of another one.
 
-        redis_key = f"client:{client_address.host}:{client_address.port}:viewed_article:{article_id}"  # noqa: E501
+        Returns:
+            Count of updated articles
+        """
+        lock_token = os.urandom(16).hex()
 
+        redis: Redis
         async with self._redis_client_factory() as redis:
-            if redis.exists(redis_key):
+            is_locked = await redis.set(
+                VIEWS_FLUSH_LOCK_KEY,
+                lock_token,
+                px=int(config.ARTICLE_VIEWS_FLUSH_LOCK_LIFETIME * 1000),
+                nx=True,
+            )
+            if not is_locked:
+                return 0
+
+            try:
+                # Views left by interrupted flush are written first
+                if not await redis.exists(VIEWS_FLUSHING_KEY):
+                    if not await redis.exists(VIEWS_PENDING_KEY):
+                        return 0
+                    await redis.rename(VIEWS_PENDING_KEY, VIEWS_FLUSHING_KEY)
+
+                views = {
+                    int(id): int(count)
+                    for id, count in (await redis.hgetall(VIEWS_FLUSHING_KEY)).items()
+                }
+                await self._article_repo.add_views(views)
+                # Cached versions contain persisted views count
+                await self._article_cache.invalidate(*map(article_version_key, views))
+                await redis.delete(VIEWS_FLUSHING_KEY)
+
+                return len(views)
+            finally:
+                await release_lock(redis, VIEWS_FLUSH_LOCK_KEY, lock_token)
+
+    async def _add_to_feed(self, entry: str):
+        """Adds entry to the feed and trims the oldest entries beyond its size."""
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.zadd(FEED_KEY, {entry: 0})
+                pipe.zremrangebyrank(FEED_KEY, 1, -config.ARTICLES_FEED_SIZE - 1)
+                _, trimmed_count = await pipe.execute()
+
+            if trimmed_count:
+                await redis.set(FEED_TRUNCATED_KEY, "")
+
+    async def _remove_from_feed(self, entry: str):
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            await redis.zrem(FEED_KEY, entry)
+
+    async def _remove_from_trending(self, article_id: int):
+        now = time.time()
+
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            async with redis.pipeline(transaction=False) as pipe:
+                for period, length in config.ARTICLES_TRENDING_PERIODS.items():
+                    window = int(now // length)
+                    pipe.zrem(trending_key(period, window), article_id)
+                    pipe.zrem(trending_key(period, window + 1), article_id)
+                await pipe.execute()
+
+    async def _rebuild_feed(self):
+        """
+        Fills the feed with the latest published articles from the database
+        and marks it built. Only one rebuild is performed at a time across all
+        app workers, other requests are served from the database meanwhile.
+        Article unpublished during rebuild may be left in the feed. Lock is
+        released only by its owner, as in `flush_views`.
+        """
+        lock_token = os.urandom(16).hex()
+
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            is_locked = await redis.set(
+                FEED_REBUILD_LOCK_KEY,
+                lock_token,
+                ex=config.ARTICLES_FEED_REBUILD_LOCK_LIFETIME,
+                nx=True,
+            )
+            if not is_locked:
                 return
 
-            redis.set(redis_key, "", config.ARTICLE_VIEW_COUNT_DELAY)
-            await self._article_repo.add_view(article_id)
+            try:
+                entries = await self._article_repo.get_published_page(
+                    None, config.ARTICLES_FEED_SIZE
+                )
+                members = {feed_entry(*entry): 0 for entry in entries}
+                members[FEED_BUILT_MARKER] = 0
+
+                async with redis.pipeline(transaction=True) as pipe:
+                    pipe.zadd(FEED_KEY, members)
+                    pipe.zremrangebyrank(FEED_KEY, 1, -config.ARTICLES_FEED_SIZE - 1)
+                    if len(entries) == config.ARTICLES_FEED_SIZE:
+                        pipe.set(FEED_TRUNCATED_KEY, "")
+                    await pipe.execute()
+            finally:
+                await release_lock(redis, FEED_REBUILD_LOCK_KEY, lock_token)
+
+    async def _load_published_json(self, id: int) -> bytes:
+        # Article read from lagging replica would be cached as its new version
+        db_article = await self._article_repo.get_by_id(id, from_primary=True)
+        if db_article is None or not db_article.is_published:
+            return b""
+
+        # Views count is appended to each response by `get_published_json`
+        fields = dict(ArticleSchema.construct_from_orm(db_article).__dict__)
+        del fields["views_count"]
+        return dumps(fields)[:-1]
+
+    async def _load_version_json(self, id: int) -> bytes:
+        version = await self._article_repo.get_version(id)
+        if version is None:
+            return b""
+        return orjson.dumps(version)
+
+    async def _add_pending_views(self, articles: list[ArticleSchema]):
+        """Adds views which are not flushed yet to `views_count` of articles."""
+        if not articles:
+            return
+
+        pending_views = await self._get_pending_views([a.id for a in articles])
+        for article, views in zip(articles, pending_views):
+            article.views_count += views
+
+    async def _get_pending_views(self, ids: list[int]) -> list[int]:
+        """Returns count of articles views which are not flushed yet."""
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hmget(VIEWS_PENDING_KEY, ids)
+                pipe.hmget(VIEWS_FLUSHING_KEY, ids)
+                pending, flushing = await pipe.execute()
+
+        return [
+            sum(int(c) for c in counts if c is not None)
+            for counts in zip(pending, flushing)
+        ]
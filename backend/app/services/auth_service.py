@@ -1,23 +1,61 @@
 import os
+import time
 from base64 import urlsafe_b64encode
 from contextlib import AbstractAsyncContextManager
 from datetime import datetime, timedelta
+from hashlib import blake2b
 from typing import Callable
 
 from jose import ExpiredSignatureError, JWTError, jwt
 from redis.asyncio import Redis
+from redis.exceptions import WatchError
 
 import app.config as config
 from app.exceptions import ExpiredTokenError, InvalidTokenError
+from app.redis import make_script
+from app.token_cache import TokenCache
+
+REFRESH_TOKEN_KEY_PREFIX = "refresh_token:"
+
+# KEYS: used token, new token, used token in legacy unhashed format, index of
+# user tokens
+# ARGV: digest of used token, digest of new token, token lifetime, current time,
+# id of token owner
+ROTATE_REFRESH_TOKEN_SCRIPT = make_script(
+    """
+local user_id = redis.call("GET", KEYS[1]) or redis.call("GET", KEYS[3])
+if user_id ~= ARGV[5] then
+    return false
+end
+
+redis.call("DEL", KEYS[1], KEYS[3])
+redis.call("SET", KEYS[2], user_id, "EX", ARGV[3])
+redis.call("ZREM", KEYS[4], ARGV[1])
+redis.call("ZREMRANGEBYSCORE", KEYS[4], "-inf", ARGV[4])
+redis.call("ZADD", KEYS[4], ARGV[4] + ARGV[3], ARGV[2])
+redis.call("EXPIRE", KEYS[4], ARGV[3])
+return user_id
+"""
+)
+
+
+def refresh_token_digest(refresh_token: str) -> str:
+    return blake2b(refresh_token.encode(), digest_size=16).hexdigest()
+
+
+def refresh_tokens_index_key(user_id: int) -> str:
+    return f"user:{user_id}:refresh_tokens"
 
 
 class AuthService:
     def __init__(
         self,
         redis_client_factory: Callable[..., AbstractAsyncContextManager[Redis]],
+        token_cache: TokenCache,
         secret_key: str,
     ):
         self._redis_client_factory = redis_client_factory
+        self._token_cache = token_cache
         self._secret_key = secret_key
 
     async def generate_access_token(self, user_id: int) -> str:
@@ -32,23 +70,118 @@ class AuthService:
         )
 
     async def generate_refresh_token(self, user_id: int) -> str:
+        """
+        Generates new refresh token of user. Only digest of token is stored
+        in Redis and is added into the index of user tokens.
+        """
+        refresh_token = self._make_refresh_token()
+        digest = refresh_token_digest(refresh_token)
+        index_key = refresh_tokens_index_key(user_id)
+        now = int(time.time())
+
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.set(
+                    REFRESH_TOKEN_KEY_PREFIX + digest,
+                    user_id,
+                    config.REFRESH_TOKEN_LIFETIME,
+                )
+                pipe.zremrangebyscore(index_key, "-inf", now)
+                pipe.zadd(index_key, {digest: now + config.REFRESH_TOKEN_LIFETIME})
+                pipe.expire(index_key, config.REFRESH_TOKEN_LIFETIME)
+                await pipe.execute()
+
+        return refresh_token
+
+    async def rotate_refresh_token(self, refresh_token: str) -> tuple[int, str]:
+        """
+        Replaces refresh token provided by client with the new one. Token is
+        validated, reset and replaced atomically by a single server-side
+        script, so it can be used only once even by concurrent requests.
+        Owner of token is read beforehand to pass index of their tokens to
+        the script, which checks that token still belongs to them. Tokens
+        issued in legacy unhashed format are accepted until they expire.
+
+        Returns:
+            User id and new refresh token
+
+        Raises:
+            InvalidTokenError: Refresh token is invalid
+        """
+        new_refresh_token = self._make_refresh_token()
+        digest = refresh_token_digest(refresh_token)
+        new_digest = refresh_token_digest(new_refresh_token)
+        token_key = REFRESH_TOKEN_KEY_PREFIX + digest
+        legacy_token_key = f"refresh_token:{refresh_token}:user_id"
+
         redis: Redis
         async with self._redis_client_factory() as redis:
-            refresh_token: str = urlsafe_b64encode(
-                os.urandom(config.REFRESH_TOKEN_SIZE)
-            ).decode("utf-8")
-
-            await redis.set(
-                f"refresh_token:{refresh_token}:user_id",
-                user_id,
-                config.REFRESH_TOKEN_LIFETIME,
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.get(token_key)
+                pipe.get(legacy_token_key)
+                owner_id = next(filter(None, await pipe.execute()), None)
+            if owner_id is None:
+                raise InvalidTokenError(details="Invalid refresh token")
+
+            user_id = await ROTATE_REFRESH_TOKEN_SCRIPT(
+                keys=[
+                    token_key,
+                    REFRESH_TOKEN_KEY_PREFIX + new_digest,
+                    legacy_token_key,
+                    refresh_tokens_index_key(int(owner_id)),
+                ],
+                args=[
+                    digest,
+                    new_digest,
+                    config.REFRESH_TOKEN_LIFETIME,
+                    int(time.time()),
+                    owner_id,
+                ],
+                client=redis,
             )
-            return refresh_token
+
+        if user_id is None:
+            raise InvalidTokenError(details="Invalid refresh token")
+        return int(user_id), new_refresh_token
+
+    async def revoke_refresh_tokens(self, user_id: int) -> int:
+        """
+        Makes all refresh tokens of user invalid. Tokens from the index are
+        deleted in a transaction, which is retried if the index was changed
+        meanwhile, e.g. by concurrent rotation. Tokens issued in legacy format
+        are not indexed and stay valid until they expire.
+
+        Returns:
+            Count of revoked tokens
+        """
+        index_key = refresh_tokens_index_key(user_id)
+
+        redis: Redis
+        async with self._redis_client_factory() as redis:
+            async with redis.pipeline(transaction=True) as pipe:
+                while True:
+                    try:
+                        await pipe.watch(index_key)
+                        digests = await pipe.zrange(index_key, 0, -1)
+
+                        pipe.multi()
+                        pipe.delete(
+                            index_key,
+                            *(
+                                REFRESH_TOKEN_KEY_PREFIX + digest.decode()
+                                for digest in digests
+                            ),
+                        )
+                        await pipe.execute()
+                        return len(digests)
+                    except WatchError:
+                        continue
 
     async def validate_access_token(self, access_token: str) -> int:
         """
         Validates access token provided by client. Raises exception if
-        access_token is invalid.
+        access_token is invalid. Verified tokens are cached until they expire.
 
         Args:
             access_token: Query parameter provided by client
@@ -60,6 +193,10 @@ class AuthService:
             ExpiredTokenError: Access token is expired
             InvalidTokenError: Access token is not valid
         """
+        user_id = self._token_cache.get(access_token)
+        if user_id is not None:
+            return user_id
+
         try:
             claims = jwt.decode(
                 access_token,
@@ -73,37 +210,14 @@ class AuthService:
                     "require_aud": False,
                 },
             )
-            return int(claims.get("aud"))
+            user_id = int(claims.get("aud"))
         except ExpiredSignatureError:
             raise ExpiredTokenError()
         except JWTError:
             raise InvalidTokenError(details="Invalid access token")
 
-    async def validate_refresh_token(self, refresh_token: str) -> int:
-        """
-        Validates refresh token provided by client. Raises exception if
-        refresh_token is invalid.
-
-        Args:
-            refresh_token: Query parameter provided by client
-
-        Returns:
-            User id from decoded token
+        self._token_cache.put(access_token, user_id, claims["exp"])
+        return user_id
 
-        Raises:
-            InvalidTokenError: Refresh token is invalid
-        """
-        redis: Redis
-        async with self._redis_client_factory() as redis:
-            user_id: int = await redis.get(f"refresh_token:{refresh_token}:user_id")
-
-            if user_id is None:
-                raise InvalidTokenError(details="Invalid refresh token")
-
-            return user_id
-
-    async def reset_refresh_token(self, refresh_token: str):
-        """Makes given refresh token invalid."""
-        redis: Redis
-        async with self._redis_client_factory() as redis:
-            await redis.delete(f"refresh_token:{refresh_token}:user_id")
+    def _make_refresh_token(self) -> str:
+        return urlsafe_b64encode(os.urandom(config.REFRESH_TOKEN_SIZE)).decode("utf-8")
@@ -1,5 +1,4 @@
 import os
-from hashlib import pbkdf2_hmac
 
 from email_validator import EmailNotValidError, validate_email
 
@@ -9,24 +8,16 @@ from app.exceptions import (
     InvalidInputFormatError,
     TakenLoginError,
 )
+from app.hashing import PasswordHasher
 from app.models import User
 from app.repositories import UserRepository
 from app.schemas import UserSchema
 
 
 class UserService:
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: UserRepository, password_hasher: PasswordHasher):
         self._user_repo = user_repo
-
-    @staticmethod
-    def get_password_key(password: str, salt: bytes) -> bytes:
-        return pbkdf2_hmac(
-            config.PASSWORD_HASH_ALGORITHM,
-            password.encode("utf-8"),
-            salt,
-            config.PASSWORD_HASH_ITERATIONS,
-            config.PASSWORD_KEY_LENGTH,
-        )
+        self._password_hasher = password_hasher
 
     async def create(self, email: str, password: str, display_name: str) -> UserSchema:
         try:
@@ -36,11 +27,14 @@ class UserService:
         except EmailNotValidError:
             raise InvalidInputFormatError()
 
-        if (await self._user_repo.get_by_email(email)) is not None:
+        # Just registered users may be missing on replicas
+        if (await self._user_repo.get_by_email(email, from_primary=True)) is not None:
             raise TakenLoginError(details="This email is already taken")
 
         password_salt = os.urandom(config.PASSWORD_SALT_LENGTH)
-        password_key = self.get_password_key(password, password_salt)
+        password_key = await self._password_hasher.get_password_key(
+            password, password_salt
+        )
 
         user = User(
             email=normalized_email,
@@ -55,16 +49,24 @@ class UserService:
         user = await self._user_repo.get_by_id(id)
         if user is None or not user.is_active:
             return None
-        return UserSchema.from_orm(user)
+        return UserSchema.construct_from_orm(user)
+
+    async def get_many(self, ids: list[int]) -> dict[int, UserSchema]:
+        """
+        Returns:
+            Mapping of user id to active user. Missing users are skipped
+        """
+        users = await self._user_repo.get_many(list(set(ids)))
+        return {u.id: UserSchema.construct_from_orm(u) for u in users if u.is_active}
 
     async def get_by_email(self, email: str) -> UserSchema | None:
         user = await self._user_repo.get_by_email(email)
         if user is None or not user.is_active:
             return None
-        return UserSchema.from_orm(user)
+        return UserSchema.construct_from_orm(user)
 
     async def update(self, user: UserSchema) -> UserSchema:
-        db_user = await self._user_repo.get_by_id(user.id)
+        db_user = await self._user_repo.get_by_id(user.id, for_update=True)
         if db_user is None or not db_user.is_active:
             raise ContentNotFoundError()
 
@@ -78,5 +80,7 @@ class UserService:
         if user is None or not user.is_active:
             return False
 
-        password_key = self.get_password_key(password, user.password_salt)
+        password_key = await self._password_hasher.get_password_key(
+            password, user.password_salt
+        )
         return user.password_key == password_key
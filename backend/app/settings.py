@@ -1,10 +1,49 @@
 from pydantic import BaseSettings
 
+import app.config as config
+
 
 class AppSettings(BaseSettings):
     database_url: str
     redis_url: str
     secret_key: str
 
+    db_pool_size: int = config.DB_POOL_SIZE
+    db_max_overflow: int = config.DB_MAX_OVERFLOW
+    db_pool_timeout: float = config.DB_POOL_TIMEOUT
+    db_pool_recycle: int = config.DB_POOL_RECYCLE
+    db_pool_pre_ping: bool = config.DB_POOL_PRE_PING
+    db_statement_cache_size: int = config.DB_STATEMENT_CACHE_SIZE
+    db_warm_up_connections: int = config.DB_WARM_UP_CONNECTIONS
+    database_replica_urls: list[str] = []
+    db_replica_max_lag: float = config.DB_REPLICA_MAX_LAG
+    db_replica_check_interval: float = config.DB_REPLICA_CHECK_INTERVAL
+    db_replica_check_timeout: float = config.DB_REPLICA_CHECK_TIMEOUT
+    db_primary_pin_time: float = config.DB_PRIMARY_PIN_TIME
+    redis_max_connections: int = config.REDIS_MAX_CONNECTIONS
+    redis_pool_timeout: float = config.REDIS_POOL_TIMEOUT
+    redis_pipeline_max_batch_size: int = config.REDIS_PIPELINE_MAX_BATCH_SIZE
+    redis_pipeline_delay: float = config.REDIS_PIPELINE_DELAY
+    redis_warm_up_connections: int = config.REDIS_WARM_UP_CONNECTIONS
+    health_check_timeout: float = config.HEALTH_CHECK_TIMEOUT
+
+    password_hash_workers: int = config.PASSWORD_HASH_WORKERS
+    password_hash_queue_size: int = config.PASSWORD_HASH_QUEUE_SIZE
+
+    access_token_cache_size: int = config.ACCESS_TOKEN_CACHE_SIZE
+    rate_limits: dict[str, dict[str, tuple[int, float]]] = config.RATE_LIMITS
+
+    views_flush_interval: float = config.ARTICLE_VIEWS_FLUSH_INTERVAL
+    article_cache_lifetime: float = config.ARTICLE_CACHE_LIFETIME
+
+    class Config:
+        secrets_dir = "/run/secrets"
+
+
+class DatabaseSettings(BaseSettings):
+    """Settings of tools which work only with database."""
+
+    database_url: str
+
     class Config:
         secrets_dir = "/run/secrets"
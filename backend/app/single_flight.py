@@ -0,0 +1,70 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key. Only the first call is
+    performed, while others wait for it and receive the same result or error.
+    Results are not kept after call is completed, so callers must not modify
+    them.
+
+    Call is performed in its own task, so cancellation of the caller which
+    started it doesn't affect other waiters.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, Flight] = {}
+
+        self.calls_count = 0
+        self.shared_count = 0
+        self.max_waiters = 0
+
+    @property
+    def waiters(self) -> int:
+        """Count of callers waiting for calls of other callers."""
+        return sum(flight.waiters for flight in self._flights.values())
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.waiters += 1
+            self.shared_count += 1
+            self.max_waiters = max(self.max_waiters, flight.waiters)
+            try:
+                return await asyncio.shield(flight.task)
+            finally:
+                flight.waiters -= 1
+
+        self.calls_count += 1
+        task = asyncio.create_task(call())
+        self._flights[key] = Flight(task)
+        task.add_done_callback(lambda _: self._complete(key, task))
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "calls_total": self.calls_count,
+            "shared_total": self.shared_count,
+            "waiters": self.waiters,
+            "max_waiters": self.max_waiters,
+        }
+
+    def _complete(self, key: Hashable, task: asyncio.Task):
+        if self._flights.get(key) is not None and self._flights[key].task is task:
+            del self._flights[key]
+
+        # Error is retrieved even if all callers were cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,18 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(interval: float, func: Callable[[], Awaitable]):
+    """
+    Calls `func` every `interval` seconds until the task is cancelled.
+    Exceptions raised by `func` are logged and don't stop the loop.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await func()
+        except Exception:
+            logger.exception("Periodic task %s failed", func.__qualname__)
@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from hashlib import sha256
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified tokens. Tokens are stored by their digest
+    with decoded user id and are evicted when they expire.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._items: OrderedDict[bytes, tuple[int, float]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, token: str) -> int | None:
+        """
+        Returns:
+            User id of cached token or `None` if token is missing or expired
+        """
+        key = self._key(token)
+
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        user_id, expiry = item
+        if expiry <= time.time():
+            del self._items[key]
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return user_id
+
+    def put(self, token: str, user_id: int, expiry: float):
+        """
+        Args:
+            token: Verified token
+            user_id: User id decoded from token
+            expiry: Token expiration time as UNIX timestamp
+        """
+        key = self._key(token)
+
+        self._items[key] = (user_id, expiry)
+        self._items.move_to_end(key)
+
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return sha256(token.encode("utf-8")).digest()
@@ -0,0 +1 @@
+"""Command line tools which work with the app database."""
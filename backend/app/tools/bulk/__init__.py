@@ -0,0 +1,401 @@
+"""
+Bulk import and export of users and articles in NDJSON format, i.e. one JSON
+object per line. Imported records are validated in batches by a pool of
+worker processes, while already validated batches are loaded into PostgreSQL
+with `COPY`. Other databases get multi-row inserts. Import of a file is a
+single transaction.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import IO, Iterator
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import insert, select
+
+import app.config as config
+from app.db import Database
+from app.hashing import compute_password_key
+from app.models import Article, User
+from app.redis import RedisDatabase
+from app.repositories import ArticleRepository
+from app.responses import dumps
+from app.schemas import ArticleRecord, UserRecord
+from app.services.article_service import FEED_KEY, FEED_TRUNCATED_KEY
+
+logger = logging.getLogger(__name__)
+
+MODELS = {"users": User, "articles": Article}
+RECORDS = {"users": UserRecord, "articles": ArticleRecord}
+# Columns in order of rows built from records
+COLUMNS = {
+    "users": (
+        "id",
+        "email",
+        "password_salt",
+        "password_key",
+        "is_active",
+        "creation_date",
+        "display_name",
+    ),
+    "articles": (
+        "id",
+        "author_id",
+        "creation_time",
+        "update_time",
+        "title",
+        "body",
+        "is_published",
+        "publish_time",
+        "views_count",
+    ),
+}
+
+
+class InvalidRecordError(Exception):
+    def __init__(self, line_number: int, details: str):
+        super().__init__(line_number, details)
+        self.line_number = line_number
+        self.details = details
+
+    def __str__(self) -> str:
+        return f"Line {self.line_number}: {self.details}"
+
+
+class Progress:
+    """Counts processed records and logs throughput periodically."""
+
+    def __init__(self, action: str, kind: str):
+        self.action = action
+        self.kind = kind
+        self.count = 0
+        self.invalid_count = 0
+        self._start_time = time.perf_counter()
+        self._report_time = self._start_time
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start_time
+
+    @property
+    def rate(self) -> float:
+        return self.count / max(self.elapsed, 1e-9)
+
+    def add(self, count: int):
+        self.count += count
+
+        now = time.perf_counter()
+        if now - self._report_time >= config.BULK_REPORT_INTERVAL:
+            self._report_time = now
+            logger.info(
+                "%s %d %s, %.0f records/s",
+                self.action,
+                self.count,
+                self.kind,
+                self.rate,
+            )
+
+    def summary(self) -> str:
+        summary = (
+            f"{self.action} {self.count} {self.kind} in {self.elapsed:.1f}s "
+            f"({self.rate:.0f} records/s)"
+        )
+        if self.invalid_count:
+            summary += f", skipped {self.invalid_count} invalid records"
+        return summary
+
+
+def _user_row(record: UserRecord) -> tuple:
+    salt, key = record.password_salt, record.password_key
+    if salt is None:
+        salt = os.urandom(config.PASSWORD_SALT_LENGTH)
+        key = compute_password_key(record.password, salt)
+
+    return (
+        record.id,
+        record.email,
+        salt,
+        key,
+        record.is_active,
+        record.creation_date or datetime.utcnow().date(),
+        record.display_name,
+    )
+
+
+def _article_row(record: ArticleRecord) -> tuple:
+    return (
+        record.id,
+        record.author_id,
+        record.creation_time,
+        record.update_time,
+        record.title,
+        # Body is passed to the database as JSON text
+        dumps(record.body).decode(),
+        record.is_published,
+        record.publish_time,
+        record.views_count,
+    )
+
+
+ROW_BUILDERS = {"users": _user_row, "articles": _article_row}
+
+
+def validate_batch(
+    kind: str, lines: list[tuple[int, bytes]]
+) -> tuple[list[tuple], list[InvalidRecordError]]:
+    """
+    Validates records and converts them into rows of `COLUMNS` of the kind.
+    Plain passwords are hashed here, so it is run in worker processes.
+
+    Args:
+        lines: Pairs of line number and line with record
+
+    Returns:
+        Rows of valid records and errors of invalid ones
+    """
+    record_class = RECORDS[kind]
+    build_row = ROW_BUILDERS[kind]
+
+    rows = []
+    errors = []
+    for line_number, line in lines:
+        try:
+            record = record_class.parse_obj(orjson.loads(line))
+        except orjson.JSONDecodeError as e:
+            errors.append(InvalidRecordError(line_number, f"Invalid JSON: {e}"))
+            continue
+        except ValidationError as e:
+            errors.append(InvalidRecordError(line_number, str(e).replace("\n", " ")))
+            continue
+        rows.append(build_row(record))
+    return rows, errors
+
+
+def read_batches(file: IO[bytes], batch_size: int) -> Iterator[list[tuple[int, bytes]]]:
+    """Yields batches of numbered non-empty lines."""
+    batch = []
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        batch.append((line_number, line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class CopyWriter:
+    """Loads rows into PostgreSQL table with binary `COPY`."""
+
+    def __init__(self, conn, kind: str):
+        """
+        Args:
+            conn: asyncpg connection
+        """
+        self._conn = conn
+        self._table = MODELS[kind].__tablename__
+        self._columns = COLUMNS[kind]
+        self._has_given_ids = False
+        self.ids_range: tuple[int, int] | None = None
+
+    async def write(self, rows: list[tuple]):
+        # Missing ids are taken from the table sequence at once, so all rows
+        # of batch are copied with the same columns
+        missing_count = sum(row[0] is None for row in rows)
+        self._has_given_ids |= missing_count < len(rows)
+        if missing_count:
+            ids = iter(
+                await self._conn.fetch(
+                    "SELECT nextval(pg_get_serial_sequence($1, 'id')) "
+                    "FROM generate_series(1, $2)",
+                    self._table,
+                    missing_count,
+                )
+            )
+            rows = [
+                row if row[0] is not None else (next(ids)[0], *row[1:]) for row in rows
+            ]
+
+        await self._conn.copy_records_to_table(
+            self._table, records=rows, columns=self._columns
+        )
+        self._update_ids_range(rows)
+
+    async def finish(self):
+        # Sequence has to be moved past ids which were given explicitly
+        if self._has_given_ids:
+            await self._conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{self._table}', 'id'), "
+                f"(SELECT max(id) FROM {self._table}))"
+            )
+
+    def _update_ids_range(self, rows: list[tuple]):
+        min_id = min(row[0] for row in rows)
+        max_id = max(row[0] for row in rows)
+        if self.ids_range is not None:
+            min_id = min(min_id, self.ids_range[0])
+            max_id = max(max_id, self.ids_range[1])
+        self.ids_range = (min_id, max_id)
+
+
+class InsertWriter:
+    """Loads rows with multi-row inserts into databases without `COPY`."""
+
+    def __init__(self, conn: AsyncConnection, kind: str):
+        self._conn = conn
+        self._table = MODELS[kind].__table__
+        self._columns = COLUMNS[kind]
+        self._is_articles = kind == "articles"
+        self.ids_range = None
+
+    async def write(self, rows: list[tuple]):
+        values = [dict(zip(self._columns, row)) for row in rows]
+        if self._is_articles:
+            for value in values:
+                value["body"] = orjson.loads(value["body"])
+        await self._conn.execute(insert(self._table), values)
+
+    async def finish(self):
+        pass
+
+
+async def import_records(
+    db: Database,
+    kind: str,
+    file: IO[bytes],
+    batch_size: int = config.BULK_RECORDS_BATCH_SIZE,
+    workers: int = os.cpu_count() or 1,
+    skip_invalid: bool = False,
+) -> Progress:
+    """
+    Imports users or articles from NDJSON file. Authors of articles must
+    exist before import.
+
+    Args:
+        kind: `users` or `articles`
+        workers: Count of processes which validate records. Records are
+            validated in the current process if it is 0
+        skip_invalid: Whether invalid records are skipped instead of
+            aborting import
+
+    Raises:
+        InvalidRecordError: Some record is invalid and `skip_invalid` isn't set
+    """
+    progress = Progress("Imported", kind)
+    executor = ProcessPoolExecutor(workers) if workers > 0 else None
+    loop = asyncio.get_running_loop()
+
+    async def validate(batch: list[tuple[int, bytes]]):
+        if executor is None:
+            return validate_batch(kind, batch)
+        return await loop.run_in_executor(executor, validate_batch, kind, batch)
+
+    async def load(writer: CopyWriter | InsertWriter):
+        # Next batches are validated while the current one is written
+        pending: deque[asyncio.Future] = deque()
+        try:
+            for batch in read_batches(file, batch_size):
+                pending.append(asyncio.ensure_future(validate(batch)))
+                if len(pending) > 2 * max(workers, 1):
+                    await write(writer, await pending.popleft())
+            while pending:
+                await write(writer, await pending.popleft())
+            await writer.finish()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def write(
+        writer: CopyWriter | InsertWriter,
+        result: tuple[list[tuple], list[InvalidRecordError]],
+    ):
+        rows, errors = result
+        for error in errors:
+            if not skip_invalid:
+                raise error
+            logger.warning("Skipped invalid record. %s", error)
+        progress.invalid_count += len(errors)
+
+        if rows:
+            await writer.write(rows)
+            progress.add(len(rows))
+
+    try:
+        async with db.engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                raw_conn = await conn.get_raw_connection()
+                driver_conn = raw_conn.driver_connection
+                async with driver_conn.transaction():
+                    writer = CopyWriter(driver_conn, kind)
+                    await load(writer)
+            else:
+                async with conn.begin():
+                    writer = InsertWriter(conn, kind)
+                    await load(writer)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if kind == "articles" and writer.ids_range is not None:
+        start_time = time.perf_counter()
+        count = await ArticleRepository(db.session).update_search_vectors(
+            *writer.ids_range
+        )
+        logger.info(
+            "Indexed %d articles for search in %.1fs",
+            count,
+            time.perf_counter() - start_time,
+        )
+
+    return progress
+
+
+async def reset_feed(redis_db: RedisDatabase):
+    """
+    Drops the cached feed of published articles, so it is rebuilt with
+    imported articles on the next request.
+    """
+    async with redis_db.client() as redis:
+        await redis.delete(FEED_KEY, FEED_TRUNCATED_KEY)
+
+
+def _encode_bytes(value):
+    if isinstance(value, bytes):
+        return value.hex()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def export_records(
+    db: Database,
+    kind: str,
+    file: IO[bytes],
+    batch_size: int = config.BULK_RECORDS_BATCH_SIZE,
+) -> Progress:
+    """
+    Exports users or articles into NDJSON file ordered by id. Exported
+    records can be imported back as is. Rows are read with server side
+    cursor, so memory usage doesn't depend on table size.
+    """
+    progress = Progress("Exported", kind)
+    table = MODELS[kind].__table__
+    query = select(*(table.c[name] for name in COLUMNS[kind])).order_by(table.c.id)
+
+    async with db.engine.connect() as conn:
+        result = await conn.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions(batch_size):
+            file.write(
+                b"".join(
+                    orjson.dumps(row._asdict(), default=_encode_bytes) + b"\n"
+                    for row in rows
+                )
+            )
+            progress.add(len(rows))
+
+    return progress
@@ -0,0 +1,112 @@
+"""
+Imports and exports users and articles as NDJSON files. File `-` stands for
+standard input or output. Users must be imported before their articles.
+
+Usage:
+    python -m app.tools.bulk import {users,articles} FILE [--workers N]
+        [--batch-size N] [--skip-invalid] [--redis-url URL]
+    python -m app.tools.bulk export {users,articles} FILE [--batch-size N]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from contextlib import nullcontext
+
+import app.config as config
+from app.db import Database
+from app.redis import RedisDatabase
+from app.settings import DatabaseSettings
+from app.tools.bulk import (
+    InvalidRecordError,
+    export_records,
+    import_records,
+    reset_feed,
+)
+
+
+def open_file(path: str, mode: str):
+    if path == "-":
+        stream = sys.stdin if mode == "rb" else sys.stdout
+        return nullcontext(stream.buffer)
+    return open(path, mode)
+
+
+async def run_import(db: Database, args: argparse.Namespace):
+    with open_file(args.file, "rb") as file:
+        progress = await import_records(
+            db,
+            args.kind,
+            file,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            skip_invalid=args.skip_invalid,
+        )
+    print(progress.summary(), file=sys.stderr)
+
+    if args.kind == "articles" and args.redis_url is not None:
+        redis_db = RedisDatabase(args.redis_url)
+        try:
+            await reset_feed(redis_db)
+        finally:
+            await redis_db.close()
+
+
+async def run_export(db: Database, args: argparse.Namespace):
+    with open_file(args.file, "wb") as file:
+        progress = await export_records(db, args.kind, file, args.batch_size)
+    print(progress.summary(), file=sys.stderr)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.tools.bulk")
+    parser.add_argument(
+        "--database-url", help="Database URL. Taken from app settings by default"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import records")
+    export_parser = subparsers.add_parser("export", help="Export records")
+    for subparser in (import_parser, export_parser):
+        subparser.add_argument("kind", choices=("users", "articles"))
+        subparser.add_argument("file", help="NDJSON file or - for standard stream")
+        subparser.add_argument(
+            "--batch-size", type=int, default=config.BULK_RECORDS_BATCH_SIZE
+        )
+
+    import_parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Count of validating processes, 0 validates in the main process",
+    )
+    import_parser.add_argument(
+        "--skip-invalid",
+        action="store_true",
+        help="Skip invalid records instead of aborting import",
+    )
+    import_parser.add_argument(
+        "--redis-url", help="Redis URL of the app to reset its articles feed"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("app.tools").setLevel(logging.INFO)
+
+    db = Database(args.database_url or DatabaseSettings().database_url)
+    try:
+        if args.command == "import":
+            await run_import(db, args)
+        else:
+            await run_export(db, args)
+    except InvalidRecordError as e:
+        print(f"Import aborted. {e}", file=sys.stderr)
+        return 1
+    finally:
+        await db.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
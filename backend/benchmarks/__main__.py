@@ -0,0 +1,109 @@
+"""
+Runs benchmarks of the app and prints results in JSON format. By default the
+app works with SQLite database in temporary directory and in-memory Redis, so
+no external services are needed.
+
+Usage:
+    python -m benchmarks --concurrency 16 --requests 2000 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+
+from dependency_injector import providers
+
+from benchmarks.load import run_load_benchmarks
+from benchmarks.micro import run_micro_benchmarks
+from benchmarks.stand_ins import FakeRedisDatabase
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--database-url",
+        help="SQLAlchemy async database URL. Temporary SQLite database by default",
+    )
+    parser.add_argument(
+        "--redis-url", help="Redis URL. In-memory Redis emulation by default"
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument(
+        "--blocks", type=int, default=50, help="Count of blocks in article body"
+    )
+    parser.add_argument(
+        "--articles", type=int, default=50, help="Count of user articles"
+    )
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--output", help="File for results. Stdout by default")
+    return parser.parse_args()
+
+
+async def run_load(args: argparse.Namespace, database_url: str) -> dict[str, dict]:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["REDIS_URL"] = args.redis_url or "redis://localhost"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    # All load comes from a single client, so it must not be throttled
+    os.environ.setdefault("RATE_LIMITS", "{}")
+
+    from app.factory import create_app
+    from app.migrations import apply_migrations
+
+    app = create_app()
+    if args.redis_url is None:
+        app.container.redis_db.override(providers.Singleton(FakeRedisDatabase))
+
+    await apply_migrations(app.container.db().engine)
+    await app.router.startup()
+    try:
+        return await run_load_benchmarks(
+            app, args.requests, args.concurrency, args.blocks, args.articles
+        )
+    finally:
+        await app.router.shutdown()
+
+
+def main():
+    args = parse_args()
+    results = {
+        "meta": {
+            "time": datetime.utcnow().isoformat(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "database": "sqlite" if args.database_url is None else "custom",
+            "redis": "fakeredis" if args.redis_url is None else "custom",
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "iterations": args.iterations,
+            "blocks": args.blocks,
+        },
+    }
+
+    if not args.skip_micro:
+        results["micro"] = run_micro_benchmarks(args.iterations, args.blocks)
+
+    if not args.skip_load:
+        if args.database_url is not None:
+            results["load"] = asyncio.run(run_load(args, args.database_url))
+        else:
+            with tempfile.TemporaryDirectory() as directory:
+                database_url = f"sqlite+aiosqlite:///{directory}/benchmark.db"
+                results["load"] = asyncio.run(run_load(args, database_url))
+
+    output = json.dumps(results, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+import app.db  # noqa: F401 Models have to be imported through the database module
+from app.models import Article
+
+
+def make_article_body(blocks_count: int) -> list[dict]:
+    """Returns article body of `blocks_count` blocks of all kinds."""
+    blocks = [
+        {"type": "header", "heading_level": 2, "content": "Header " * 20},
+        {"type": "paragraph", "content": "Lorem ipsum dolor sit amet. " * 17},
+        {"type": "quote", "content": "Quote " * 80},
+        {"type": "list", "list_type": "unordered", "content": ["Item " * 25] * 10},
+        {"type": "horizontal_rule"},
+    ]
+    return [blocks[i % len(blocks)] for i in range(blocks_count)]
+
+
+def make_article(blocks_count: int) -> Article:
+    return Article(
+        id=1,
+        author_id=1,
+        creation_time=datetime.utcnow(),
+        update_time=datetime.utcnow(),
+        title="Benchmark article",
+        body=make_article_body(blocks_count),
+        is_published=True,
+        views_count=0,
+    )
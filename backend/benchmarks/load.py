@@ -0,0 +1,137 @@
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from fastapi import FastAPI
+from httpx import AsyncClient, Response
+
+from benchmarks.fixtures import make_article_body
+from benchmarks.stats import summarize
+
+PASSWORD = "benchmark"
+
+
+async def measure(
+    send: Callable[[int], Awaitable[Response]], requests: int, concurrency: int
+) -> dict[str, float]:
+    """
+    Sends `requests` requests from `concurrency` concurrent clients.
+
+    Args:
+        send: Function which sends request with given sequence number
+    """
+    latencies = []
+    errors = 0
+    numbers = iter(range(requests))
+
+    async def run_client():
+        nonlocal errors
+        for number in numbers:
+            start_time = time.perf_counter()
+            response = await send(number)
+            latencies.append(time.perf_counter() - start_time)
+            if response.status_code >= 400:
+                errors += 1
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(run_client() for _ in range(concurrency)))
+    duration = time.perf_counter() - start_time
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput": requests / duration,
+        **summarize(latencies),
+    }
+
+
+async def run_load_benchmarks(
+    app: FastAPI,
+    requests: int,
+    concurrency: int,
+    blocks_count: int,
+    articles_count: int,
+) -> dict[str, dict]:
+    """Measures app endpoints under load. Requests are handled in process."""
+    async with AsyncClient(app=app, base_url="http://benchmark") as client:
+        email = f"{uuid.uuid4().hex}@example.com"
+        response = await client.post(
+            "/user",
+            json={"email": email, "password": PASSWORD, "display_name": "Benchmark"},
+        )
+        response.raise_for_status()
+        user_id = response.json()["id"]
+
+        response = await client.get(
+            "/tokens", params={"email": email, "password": PASSWORD}
+        )
+        response.raise_for_status()
+        access_token = response.json()["access_token"]
+
+        article = await _create_article(client, access_token, blocks_count)
+        for _ in range(articles_count - 1):
+            await _create_article(client, access_token, 1)
+
+        auth_service = app.container.auth_service()
+        refresh_tokens = [
+            await auth_service.generate_refresh_token(user_id) for _ in range(requests)
+        ]
+
+        results = {}
+        # Password hashing is slow by design, so fewer requests are enough
+        results["login"] = await measure(
+            lambda _: client.get(
+                "/tokens", params={"email": email, "password": PASSWORD}
+            ),
+            max(requests // 20, 1),
+            concurrency,
+        )
+        results["token_refresh"] = await measure(
+            lambda n: client.get(
+                "/tokens", params={"refresh_token": refresh_tokens[n]}
+            ),
+            requests,
+            concurrency,
+        )
+        results["article_read"] = await measure(
+            lambda _: client.get(f"/article/{article['id']}"),
+            requests,
+            concurrency,
+        )
+        results["article_update"] = await measure(
+            lambda _: client.put(
+                f"/article/{article['id']}",
+                params={"access_token": access_token},
+                json=article,
+            ),
+            requests,
+            concurrency,
+        )
+        results["articles_list"] = await measure(
+            lambda _: client.get(f"/user/{user_id}/articles_ids"),
+            requests,
+            concurrency,
+        )
+        return results
+
+
+async def _create_article(
+    client: AsyncClient, access_token: str, blocks_count: int
+) -> dict:
+    params = {"access_token": access_token}
+
+    response = await client.post(
+        "/article", params=params, json={"title": "Benchmark article"}
+    )
+    response.raise_for_status()
+    article = response.json()
+    article["body"] = make_article_body(blocks_count)
+    article["is_published"] = True
+
+    response = await client.put(
+        f"/article/{article['id']}", params=params, json=article
+    )
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,89 @@
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse as StdJSONResponse
+from fastapi.utils import create_cloned_field, create_response_field
+from jose import jwt
+
+import app.config as config
+from app.hashing import compute_password_key
+from app.models import Article
+from app.responses import JSONResponse
+from app.schemas import ArticleSchema
+from benchmarks.fixtures import make_article
+from benchmarks.stats import summarize
+
+SECRET_KEY = "benchmark"
+
+# FastAPI validates returned value against a clone of `response_model`
+article_response_field = create_cloned_field(
+    create_response_field("response", ArticleSchema)
+)
+
+
+def render_validated_article(article: Article) -> bytes:
+    """Renders article as FastAPI does for endpoint with `response_model`."""
+    value, _ = article_response_field.validate(
+        ArticleSchema.from_orm(article).dict(), {}, loc=("response",)
+    )
+    return StdJSONResponse(jsonable_encoder(value)).body
+
+
+def render_article(article: Article) -> bytes:
+    """Renders article without validation."""
+    return JSONResponse(ArticleSchema.construct_from_orm(article)).body
+
+
+def measure(func: Callable[[], object], iterations: int) -> dict[str, float]:
+    latencies = []
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start_time)
+
+    return {
+        "iterations": iterations,
+        "ops_per_second": iterations / sum(latencies),
+        **summarize(latencies),
+    }
+
+
+def run_micro_benchmarks(iterations: int, blocks_count: int) -> dict[str, dict]:
+    """Measures hot functions of the request path in isolation."""
+    article = make_article(blocks_count)
+    access_token = jwt.encode(
+        {
+            "exp": datetime.utcnow() + timedelta(seconds=config.ACCESS_TOKEN_LIFETIME),
+            "aud": "1",
+        },
+        SECRET_KEY,
+        config.ACCESS_TOKEN_ALGORITHM,
+    )
+    salt = os.urandom(config.PASSWORD_SALT_LENGTH)
+
+    return {
+        "article_schema_from_orm": measure(
+            lambda: ArticleSchema.from_orm(article), iterations
+        ),
+        "article_response_validated": measure(
+            lambda: render_validated_article(article), iterations
+        ),
+        "article_response": measure(lambda: render_article(article), iterations),
+        "jwt_decode": measure(
+            lambda: jwt.decode(
+                access_token,
+                SECRET_KEY,
+                config.ACCESS_TOKEN_ALGORITHM,
+                {"verify_aud": False, "require_exp": True},
+            ),
+            iterations,
+        ),
+        # Password hashing is slow by design, so fewer iterations are enough
+        "get_password_key": measure(
+            lambda: compute_password_key("password", salt),
+            max(iterations // 100, 1),
+        ),
+    }
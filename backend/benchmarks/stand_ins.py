@@ -0,0 +1,45 @@
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Callable
+
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+import app.config as config
+from app.redis import AutoPipeline, InstrumentedRedis
+
+
+class FakeRedisDatabase:
+    """In-memory replacement of `RedisDatabase` used when no Redis is given."""
+
+    def __init__(
+        self,
+        pipeline_max_batch_size: int = config.REDIS_PIPELINE_MAX_BATCH_SIZE,
+        pipeline_delay: float = config.REDIS_PIPELINE_DELAY,
+    ):
+        redis = FakeRedis(server=FakeServer())
+
+        self._auto_pipeline = None
+        if pipeline_max_batch_size > 1:
+            self._auto_pipeline = AutoPipeline(
+                redis, pipeline_max_batch_size, pipeline_delay
+            )
+        self._client = InstrumentedRedis(
+            connection_pool=redis.connection_pool, auto_pipeline=self._auto_pipeline
+        )
+
+    def pool_stats(self) -> dict[str, int | float]:
+        return {}
+
+    async def warm_up(self, connections_count: int):
+        pass
+
+    async def ping(self):
+        await self._client.ping()
+
+    async def close(self):
+        if self._auto_pipeline is not None:
+            await self._auto_pipeline.flush()
+
+    @asynccontextmanager
+    async def client(self) -> Callable[..., AbstractAsyncContextManager[FakeRedis]]:
+        yield self._client
@@ -0,0 +1,14 @@
+import statistics
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    """Returns latency percentiles in milliseconds."""
+    latencies = sorted(latencies)
+    count = len(latencies)
+
+    return {
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": latencies[int(count * 0.5)] * 1000,
+        "p99_ms": latencies[min(int(count * 0.99), count - 1)] * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
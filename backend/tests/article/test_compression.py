@@ -0,0 +1,177 @@
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+import zstandard
+from fastapi.testclient import TestClient
+
+import app.config as config
+import tests.defines as defines
+from app.compression import complete_partial, compress_partial, decompress
+from app.container import AppContainer
+from app.exceptions import (
+    InvalidInputFormatError,
+    PayloadTooLargeError,
+    UnsupportedContentEncodingError,
+)
+from app.schemas import ArticleParagraph, ArticleSchema
+from tests.utils import assert_app_error
+
+
+@pytest.fixture
+async def long_article(
+    test_client: TestClient, published_article: ArticleSchema
+) -> ArticleSchema:
+    container: AppContainer = test_client.app.container
+
+    published_article.body = [
+        ArticleParagraph(type="paragraph", content="Lorem ipsum dolor sit amet")
+    ] * 100
+    return await container.article_service().update(published_article)
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+async def test_compressed_article(
+    test_client: TestClient, long_article: ArticleSchema, encoding: str
+):
+    path = defines.ARTICLE_PATH + f"/{long_article.id}"
+    article_cache = test_client.app.container.article_cache()
+
+    response = test_client.get(path, headers={"Accept-Encoding": encoding})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"].startswith("W/")
+    assert len(response.content) > int(response.headers["content-length"])
+    assert response.json()["body"] == long_article.body
+
+    # Version, article and its compressed variant are served from the cache,
+    # while views count includes views which are not flushed yet
+    hits = article_cache.hits
+    response = test_client.get(path, headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert response.json()["views_count"] == 1
+    assert article_cache.hits == hits + 3
+
+    # Flush reloads only version, compressed variant is left in the cache
+    container: AppContainer = test_client.app.container
+    assert await container.article_service().flush_views() == 1
+    misses = article_cache.misses
+    response = test_client.get(path, headers={"Accept-Encoding": encoding})
+    assert response.json()["views_count"] == 1
+    assert response.json()["body"] == long_article.body
+    assert article_cache.misses == misses + 1
+
+    response = test_client.get(
+        path,
+        headers={
+            "Accept-Encoding": encoding,
+            "If-None-Match": response.headers["etag"],
+        },
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize("encoding", ["br", "zstd", "gzip"])
+def test_partial_compression(encoding: str):
+    content = b'{"body":"' + b"Lorem ipsum dolor sit amet " * 100
+    partial = compress_partial(content, encoding)
+
+    for completion in (b'"}', b'", "views_count":1000}'):
+        compressed = complete_partial(partial, encoding, completion)
+        assert decompress(compressed, encoding, 10000) == content + completion
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,encoding",
+    [
+        ("gzip, deflate, br, zstd", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("zstd, br;q=0", "zstd"),
+        ("*", "br"),
+        ("*, br;q=0, zstd;q=0", "gzip"),
+        ("identity", None),
+        ("gzip;q=0", None),
+    ],
+)
+def test_negotiated_encoding(
+    test_client: TestClient,
+    long_article: ArticleSchema,
+    accept_encoding: str,
+    encoding: str | None,
+):
+    response = test_client.get(
+        defines.ARTICLES_PATH,
+        params={"ids": [long_article.id] * 3},
+        headers={"Accept-Encoding": accept_encoding},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers.get("content-encoding") == encoding
+    if encoding == "zstd":
+        assert json.loads(zstandard.decompress(response.content)) == json.loads(
+            test_client.get(
+                defines.ARTICLES_PATH, params={"ids": [long_article.id] * 3}
+            ).content
+        )
+
+
+def test_small_response(test_client: TestClient, published_article: ArticleSchema):
+    response = test_client.get(
+        defines.ARTICLE_PATH + f"/{published_article.id}",
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.content) < config.COMPRESSION_MIN_SIZE
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_request(
+    test_client: TestClient, long_article: ArticleSchema, access_token
+):
+    path = defines.ARTICLE_PATH + f"/{long_article.id}"
+    long_article.title = "Compressed"
+    content = long_article.json(exclude={"creation_time", "update_time"}).encode()
+
+    response = test_client.put(
+        path,
+        params={"access_token": access_token},
+        content=gzip.compress(content),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["title"] == "Compressed"
+
+
+@pytest.mark.parametrize(
+    "encoding,content,exc",
+    [
+        ("deflate", b"{}", UnsupportedContentEncodingError),
+        ("gzip", b"not gzip", InvalidInputFormatError),
+        (
+            "zstd",
+            zstandard.compress(b" " * (config.COMPRESSED_REQUEST_MAX_SIZE + 1)),
+            PayloadTooLargeError,
+        ),
+    ],
+)
+def test_invalid_compressed_request(
+    test_client: TestClient,
+    long_article: ArticleSchema,
+    access_token,
+    encoding: str,
+    content: bytes,
+    exc,
+):
+    response = test_client.put(
+        defines.ARTICLE_PATH + f"/{long_article.id}",
+        params={"access_token": access_token},
+        content=content,
+        headers={"Content-Type": "application/json", "Content-Encoding": encoding},
+    )
+
+    assert_app_error(response, exc)
@@ -0,0 +1,204 @@
+import json
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+import tests.defines as defines
+from app.container import AppContainer
+from app.exceptions import AccessDeniedError, ContentNotFoundError
+from app.schemas import ArticleHeader, ArticleParagraph, ArticleSchema
+from app.services.article_service import VIEWS_FLUSH_LOCK_KEY
+from tests.utils import assert_app_error
+
+
+def test_published_article(test_client: TestClient, published_article: ArticleSchema):
+    response = test_client.get(defines.ARTICLE_PATH + f"/{published_article.id}")
+
+    assert response.status_code == HTTPStatus.OK
+
+    received_article = ArticleSchema.parse_obj(response.json())
+    assert received_article.id == published_article.id
+    assert received_article.title == published_article.title
+    assert response.json() == json.loads(published_article.json())
+
+
+def test_private_article(
+    test_client: TestClient, test_article: ArticleSchema, access_token
+):
+    response = test_client.get(defines.ARTICLE_PATH + f"/{test_article.id}")
+
+    assert_app_error(response, AccessDeniedError)
+
+    response = test_client.get(
+        defines.ARTICLE_PATH + f"/{test_article.id}",
+        params={"access_token": access_token},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+async def test_article_body(
+    test_client: TestClient, test_article: ArticleSchema, access_token
+):
+    container: AppContainer = test_client.app.container
+    test_article.body = [
+        ArticleHeader(type="header", heading_level=1, content="Header"),
+        ArticleParagraph(type="paragraph", content="Paragraph"),
+    ]
+    article = await container.article_service().update(test_article)
+
+    response = test_client.get(
+        defines.ARTICLE_PATH + f"/{article.id}", params={"access_token": access_token}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == json.loads(article.json())
+
+
+def test_missing_article(test_client: TestClient):
+    response = test_client.get(defines.ARTICLE_PATH + "/1")
+
+    assert_app_error(response, ContentNotFoundError)
+
+
+async def test_created_missing_article(
+    test_client: TestClient, test_user, access_token, faker
+):
+    response = test_client.get(defines.ARTICLE_PATH + "/1")
+    assert_app_error(response, ContentNotFoundError)
+
+    container: AppContainer = test_client.app.container
+    article = await container.article_service().create(
+        faker.sentence(), test_user[0].id
+    )
+
+    response = test_client.get(
+        defines.ARTICLE_PATH + f"/{article.id}", params={"access_token": access_token}
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+async def test_views_counting(
+    test_client: TestClient, published_article: ArticleSchema
+):
+    container: AppContainer = test_client.app.container
+    article_service = container.article_service()
+    article_repo = container.article_repository()
+
+    for _ in range(3):
+        test_client.get(defines.ARTICLE_PATH + f"/{published_article.id}")
+
+    # Repeated views of the same client are counted once
+    db_article = await article_repo.get_by_id(published_article.id)
+    article = await article_service.get_by_id(published_article.id)
+    assert db_article.views_count == 0
+    assert article.views_count == 1
+
+    assert await article_service.flush_views() == 1
+
+    db_article = await article_repo.get_by_id(published_article.id)
+    article = await article_service.get_by_id(published_article.id)
+    assert db_article.views_count == 1
+    assert article.views_count == 1
+
+    assert await article_service.flush_views() == 0
+
+
+async def test_views_flush_lock(
+    test_client: TestClient,
+    published_article: ArticleSchema,
+    mock_redis_database,
+    mocker: MockerFixture,
+):
+    container: AppContainer = test_client.app.container
+    article_service = container.article_service()
+    article_repo = container.article_repository()
+    test_client.get(defines.ARTICLE_PATH + f"/{published_article.id}")
+
+    # Lock expires during flush and is acquired by another worker
+    async def add_views(views: dict[int, int]):
+        async with mock_redis_database.client() as redis:
+            await redis.set(VIEWS_FLUSH_LOCK_KEY, "other")
+
+    mocker.patch.object(article_repo, "add_views", add_views)
+    assert await article_service.flush_views() == 1
+
+    async with mock_redis_database.client() as redis:
+        assert await redis.get(VIEWS_FLUSH_LOCK_KEY) == b"other"
+    assert await article_service.flush_views() == 0
+
+
+def test_cached_article_update(
+    test_client: TestClient, published_article: ArticleSchema, access_token, faker
+):
+    container: AppContainer = test_client.app.container
+    article_cache = container.article_cache()
+
+    for _ in range(2):
+        response = test_client.get(defines.ARTICLE_PATH + f"/{published_article.id}")
+        assert response.status_code == HTTPStatus.OK
+
+    # Both article version and content are cached
+    assert article_cache.misses == 2
+    assert article_cache.hits == 2
+
+    published_article.title = faker.sentence()
+    response = test_client.put(
+        defines.ARTICLE_PATH + f"/{published_article.id}",
+        params={"access_token": access_token},
+        json=published_article.dict(exclude={"creation_time", "update_time"}),
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = test_client.get(defines.ARTICLE_PATH + f"/{published_article.id}")
+    assert response.json()["title"] == published_article.title
+
+
+async def test_not_modified_article(
+    test_client: TestClient, published_article: ArticleSchema, faker
+):
+    path = defines.ARTICLE_PATH + f"/{published_article.id}"
+    response = test_client.get(path)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Cache-Control"].startswith("public")
+    etag = response.headers["ETag"]
+
+    for headers in (
+        {"If-None-Match": etag},
+        {"If-Modified-Since": response.headers["Last-Modified"]},
+    ):
+        response = test_client.get(path, headers=headers)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    container: AppContainer = test_client.app.container
+    published_article.title = faker.sentence()
+    await container.article_service().update(published_article)
+
+    response = test_client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["title"] == published_article.title
+
+
+def test_not_modified_private_article(
+    test_client: TestClient, test_article: ArticleSchema, access_token
+):
+    path = defines.ARTICLE_PATH + f"/{test_article.id}"
+
+    response = test_client.get(path, headers={"If-None-Match": "*"})
+    assert_app_error(response, AccessDeniedError)
+
+    response = test_client.get(path, params={"access_token": access_token})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = test_client.get(
+        path,
+        params={"access_token": access_token},
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
@@ -0,0 +1,35 @@
+from faker import Faker
+from fastapi.testclient import TestClient
+
+import tests.defines as defines
+from app.container import AppContainer
+from app.exceptions import AccessDeniedError, ContentNotFoundError
+from app.schemas import ArticleBulkItem, ArticleSchema
+
+
+async def test_articles_getting(
+    test_client: TestClient,
+    faker: Faker,
+    published_article: ArticleSchema,
+    access_token,
+):
+    container: AppContainer = test_client.app.container
+    private_article = await container.article_service().create(
+        faker.sentence(), published_article.author_id
+    )
+    ids = [private_article.id, private_article.id + 1, published_article.id]
+
+    response = test_client.get(defines.ARTICLES_PATH, params={"ids": ids})
+
+    items = [ArticleBulkItem.parse_obj(item) for item in response.json()]
+    assert [item.id for item in items] == ids
+    assert items[0].error.error_code == AccessDeniedError.error_code
+    assert items[1].error.error_code == ContentNotFoundError.error_code
+    assert items[2].article.title == published_article.title
+
+    response = test_client.get(
+        defines.ARTICLES_PATH, params={"ids": ids, "access_token": access_token}
+    )
+
+    items = [ArticleBulkItem.parse_obj(item) for item in response.json()]
+    assert items[0].article.id == private_article.id
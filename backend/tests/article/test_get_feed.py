@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+from pytest import MonkeyPatch
+from pytest_mock import MockerFixture
+
+import app.config as config
+import tests.defines as defines
+from app.container import AppContainer
+from app.exceptions import InvalidInputFormatError
+from app.schemas import ArticlesFeedPage
+from app.services.article_service import FEED_KEY, FEED_REBUILD_LOCK_KEY
+from tests.utils import assert_app_error
+
+
+def get_whole_feed(test_client: TestClient, limit: int) -> list[int]:
+    ids = []
+    params = {"limit": limit}
+    while True:
+        response = test_client.get(defines.FEED_PATH, params=params)
+        assert response.status_code == HTTPStatus.OK
+
+        page = ArticlesFeedPage.parse_obj(response.json())
+        ids.extend(page.ids)
+        if page.next_cursor is None:
+            return ids
+        params["cursor"] = page.next_cursor
+
+
+async def test_feed(test_client: TestClient, create_article, mock_redis_database):
+    ids = [(await create_article()).id for _ in range(5)]
+    await create_article(is_published=False)
+
+    # Feed is built from the database by the first request
+    assert get_whole_feed(test_client, 2) == ids[::-1]
+    async with mock_redis_database.client() as redis:
+        assert await redis.exists(FEED_KEY)
+    assert get_whole_feed(test_client, 2) == ids[::-1]
+
+
+async def test_feed_rebuild_lock(
+    test_client: TestClient, create_article, mock_redis_database, mocker: MockerFixture
+):
+    ids = [(await create_article()).id for _ in range(2)]
+
+    container: AppContainer = test_client.app.container
+    article_repo = container.article_repository()
+    get_published_page = article_repo.get_published_page
+
+    # Lock expires during rebuild and is acquired by another worker
+    async def get_page_and_lose_lock(*args):
+        async with mock_redis_database.client() as redis:
+            if await redis.exists(FEED_REBUILD_LOCK_KEY):
+                await redis.set(FEED_REBUILD_LOCK_KEY, "other")
+        return await get_published_page(*args)
+
+    mocker.patch.object(article_repo, "get_published_page", get_page_and_lose_lock)
+    assert get_whole_feed(test_client, 10) == ids[::-1]
+
+    async with mock_redis_database.client() as redis:
+        assert await redis.get(FEED_REBUILD_LOCK_KEY) == b"other"
+
+
+async def test_unpublished_article(test_client: TestClient, create_article):
+    ids = [(await create_article()).id for _ in range(3)]
+    get_whole_feed(test_client, 10)
+
+    container: AppContainer = test_client.app.container
+    article_service = container.article_service()
+    article = await article_service.get_by_id(ids[1])
+    article.is_published = False
+    await article_service.update(article)
+
+    assert get_whole_feed(test_client, 10) == [ids[2], ids[0]]
+
+
+async def test_truncated_feed(
+    test_client: TestClient,
+    create_article,
+    mock_redis_database,
+    monkeypatch: MonkeyPatch,
+):
+    monkeypatch.setattr(config, "ARTICLES_FEED_SIZE", 2)
+    get_whole_feed(test_client, 10)
+
+    ids = [(await create_article()).id for _ in range(5)]
+
+    async with mock_redis_database.client() as redis:
+        assert await redis.zcard(FEED_KEY) == config.ARTICLES_FEED_SIZE + 1
+    assert get_whole_feed(test_client, 3) == ids[::-1]
+
+
+def test_invalid_cursor(test_client: TestClient):
+    response = test_client.get(defines.FEED_PATH, params={"cursor": "+"})
+
+    assert_app_error(response, InvalidInputFormatError)
@@ -0,0 +1,94 @@
+import time
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+from pytest import MonkeyPatch
+from starlette.datastructures import Address
+
+import app.config as config
+import tests.defines as defines
+from app.container import AppContainer
+from app.exceptions import InvalidInputFormatError
+from tests.utils import assert_app_error
+
+
+async def view_article(
+    test_client: TestClient, article_id: int, views_count: int, is_published=True
+):
+    container: AppContainer = test_client.app.container
+    article_service = container.article_service()
+
+    for i in range(views_count):
+        await article_service.count_view(
+            article_id, Address(f"10.0.0.{i}", 80), is_published
+        )
+
+
+async def test_trending_articles(test_client: TestClient, create_article):
+    articles = [await create_article() for _ in range(3)]
+    await view_article(test_client, articles[0].id, 2)
+    await view_article(test_client, articles[1].id, 3)
+    await view_article(test_client, articles[2].id, 5, is_published=False)
+
+    for period in config.ARTICLES_TRENDING_PERIODS:
+        response = test_client.get(
+            defines.ARTICLES_TRENDING_PATH, params={"period": period}
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == [articles[1].id, articles[0].id]
+
+
+async def test_unpublished_article(test_client: TestClient, create_article):
+    articles = [await create_article() for _ in range(2)]
+    await view_article(test_client, articles[0].id, 2)
+    await view_article(test_client, articles[1].id, 1)
+
+    container: AppContainer = test_client.app.container
+    articles[0].is_published = False
+    await container.article_service().update(articles[0])
+
+    response = test_client.get(defines.ARTICLES_TRENDING_PATH, params={"limit": 1})
+    assert response.json() == [articles[1].id]
+
+
+async def test_views_decay(
+    test_client: TestClient, create_article, monkeypatch: MonkeyPatch
+):
+    old_article = await create_article()
+    new_article = await create_article()
+    hour = config.ARTICLES_TRENDING_PERIODS["hour"]
+    day = config.ARTICLES_TRENDING_PERIODS["day"]
+    # Start of an hour inside the current day window
+    now = time.time() // day * day + 2 * hour
+
+    monkeypatch.setattr(time, "time", lambda: now - hour + 1)
+    await view_article(test_client, old_article.id, 3)
+
+    monkeypatch.setattr(time, "time", lambda: now + 1)
+    await view_article(test_client, new_article.id, 2)
+
+    container: AppContainer = test_client.app.container
+    article_service = container.article_service()
+    assert await article_service.get_trending("hour") == [
+        new_article.id,
+        old_article.id,
+    ]
+    assert await article_service.get_trending("day") == [
+        old_article.id,
+        new_article.id,
+    ]
+
+    monkeypatch.setattr(time, "time", lambda: now + hour + 1)
+    assert await article_service.get_trending("hour") == [new_article.id]
+
+    monkeypatch.setattr(time, "time", lambda: now + 2 * hour + 1)
+    assert await article_service.get_trending("hour") == []
+
+
+def test_unknown_period(test_client: TestClient):
+    response = test_client.get(
+        defines.ARTICLES_TRENDING_PATH, params={"period": "year"}
+    )
+
+    assert_app_error(response, InvalidInputFormatError)
@@ -0,0 +1,49 @@
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+
+import tests.defines as defines
+from app.exceptions import InvalidInputFormatError
+from app.schemas import UserSchema
+from tests.utils import assert_app_error
+
+
+def get_all_pages(test_client: TestClient, user_id: int, limit: int, **params):
+    ids = []
+    params["limit"] = limit
+    while True:
+        response = test_client.get(
+            defines.USER_PATH + f"/{user_id}/articles_ids", params=params
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        page: list[int] = response.json()
+        assert len(page) <= limit
+
+        ids.extend(page)
+        if len(page) < limit:
+            return ids
+        params["before_id"] = page[-1]
+
+
+async def test_pagination(
+    test_client: TestClient, create_article, test_user, access_token
+):
+    user: UserSchema = test_user[0]
+    ids = [(await create_article(is_published=i % 2 == 0)).id for i in range(7)]
+
+    received_ids = get_all_pages(test_client, user.id, 2)
+    assert received_ids == ids[::2][::-1]
+
+    received_ids = get_all_pages(test_client, user.id, 3, access_token=access_token)
+    assert received_ids == ids[::-1]
+
+
+def test_invalid_limit(test_client: TestClient, test_user):
+    user: UserSchema = test_user[0]
+
+    response = test_client.get(
+        defines.USER_PATH + f"/{user.id}/articles_ids", params={"limit": 0}
+    )
+
+    assert_app_error(response, InvalidInputFormatError)
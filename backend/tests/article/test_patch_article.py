@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+from faker import Faker
+from fastapi.testclient import TestClient
+
+import tests.defines as defines
+from app.container import AppContainer
+from app.exceptions import (
+    AccessDeniedError,
+    ContentNotFoundError,
+    InvalidInputFormatError,
+)
+from app.schemas import ArticleParagraph, ArticleSchema
+from tests.utils import assert_app_error
+
+
+def paragraph(content: str) -> dict:
+    return {"type": "paragraph", "content": content}
+
+
+@pytest.fixture
+async def article_with_body(
+    test_client: TestClient, published_article: ArticleSchema
+) -> ArticleSchema:
+    container: AppContainer = test_client.app.container
+
+    published_article.body = [
+        ArticleParagraph(type="paragraph", content=str(i)) for i in range(3)
+    ]
+    return await container.article_service().update(published_article)
+
+
+def test_patch_article(
+    test_client: TestClient, article_with_body: ArticleSchema, access_token
+):
+    path = defines.ARTICLE_PATH + f"/{article_with_body.id}"
+
+    # Article is cached before the change
+    test_client.get(path)
+
+    response = test_client.patch(
+        path,
+        params={"access_token": access_token},
+        json={
+            "operations": [
+                {"op": "insert", "index": 3, "block": paragraph("3")},
+                {"op": "replace", "index": 0, "block": paragraph("zero")},
+                {"op": "delete", "index": 1},
+                {"op": "move", "index": 2, "to_index": 0},
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    expected_body = [paragraph("3"), paragraph("zero"), paragraph("2")]
+    assert response.json()["body"] == expected_body
+    assert test_client.get(path).json()["body"] == expected_body
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "insert", "index": 4, "block": paragraph("")},
+        {"op": "replace", "index": 3, "block": paragraph("")},
+        {"op": "delete", "index": 3},
+        {"op": "move", "index": 0, "to_index": 3},
+        {"op": "replace", "index": 0, "block": {"type": "unknown"}},
+        {"op": "rename", "index": 0},
+    ],
+)
+def test_invalid_operation(
+    test_client: TestClient,
+    article_with_body: ArticleSchema,
+    access_token,
+    operation: dict,
+):
+    path = defines.ARTICLE_PATH + f"/{article_with_body.id}"
+
+    response = test_client.patch(
+        path, params={"access_token": access_token}, json={"operations": [operation]}
+    )
+
+    assert_app_error(response, InvalidInputFormatError)
+    assert test_client.get(path).json()["body"] == [paragraph(str(i)) for i in range(3)]
+
+
+@pytest.fixture
+async def other_access_token(test_client: TestClient, faker: Faker):
+    container: AppContainer = test_client.app.container
+    user = await container.user_service().create(
+        faker.email(), faker.password(), faker.first_name()
+    )
+    return await container.auth_service().generate_access_token(user.id)
+
+
+def test_not_author(
+    test_client: TestClient, article_with_body: ArticleSchema, other_access_token
+):
+    operations = [{"op": "delete", "index": 0}]
+
+    response = test_client.patch(
+        defines.ARTICLE_PATH + f"/{article_with_body.id}",
+        params={"access_token": other_access_token},
+        json={"operations": operations},
+    )
+    assert_app_error(response, AccessDeniedError)
+
+    response = test_client.patch(
+        defines.ARTICLE_PATH + f"/{article_with_body.id + 1000}",
+        params={"access_token": other_access_token},
+        json={"operations": operations},
+    )
+    assert_app_error(response, ContentNotFoundError)
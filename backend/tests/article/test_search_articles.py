@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+
+import tests.defines as defines
+from app.exceptions import InvalidInputFormatError
+from app.schemas import ArticleParagraph, ArticlesSearchPage
+from tests.utils import assert_app_error
+
+
+def paragraph(text: str) -> list[ArticleParagraph]:
+    return [ArticleParagraph(type="paragraph", content=text)]
+
+
+async def test_search(test_client: TestClient, create_article):
+    best = await create_article("Python", paragraph("async python"))
+    other = await create_article("Redis", paragraph("python client"))
+    await create_article("Python", paragraph("async"), is_published=False)
+    await create_article("Postgres", paragraph("full-text search"))
+
+    response = test_client.get(
+        defines.ARTICLES_SEARCH_PATH, params={"q": "async python"}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    page = ArticlesSearchPage.parse_obj(response.json())
+    assert page.ids == [best.id, other.id]
+    assert page.next_cursor is None
+
+
+async def test_pagination(test_client: TestClient, create_article):
+    ids = [(await create_article("Python", paragraph("Text"))).id for _ in range(5)]
+
+    received_ids = []
+    params = {"q": "python", "limit": 2}
+    while True:
+        response = test_client.get(defines.ARTICLES_SEARCH_PATH, params=params)
+        assert response.status_code == HTTPStatus.OK
+
+        page = ArticlesSearchPage.parse_obj(response.json())
+        received_ids.extend(page.ids)
+        if page.next_cursor is None:
+            break
+        params["cursor"] = page.next_cursor
+
+    assert received_ids == ids[::-1]
+
+
+def test_invalid_cursor(test_client: TestClient):
+    response = test_client.get(
+        defines.ARTICLES_SEARCH_PATH, params={"q": "python", "cursor": "invalid"}
+    )
+
+    assert_app_error(response, InvalidInputFormatError)
+
+
+def test_empty_query(test_client: TestClient):
+    response = test_client.get(defines.ARTICLES_SEARCH_PATH, params={"q": ""})
+
+    assert_app_error(response, InvalidInputFormatError)
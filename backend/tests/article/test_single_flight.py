@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.single_flight import SingleFlight
+
+
+async def test_concurrent_calls():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def load(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(
+        *(single_flight.do("a", lambda: load(1)) for _ in range(5)),
+        single_flight.do("b", lambda: load(2)),
+    )
+
+    assert results == [1, 1, 1, 1, 1, 2]
+    assert calls == [1, 2]
+    assert single_flight.stats() == {
+        "calls_total": 2,
+        "shared_total": 4,
+        "waiters": 0,
+        "max_waiters": 4,
+    }
+
+    # Completed calls are not cached
+    assert await single_flight.do("a", lambda: load(3)) == 3
+
+
+async def test_shared_error():
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError()
+
+    results = await asyncio.gather(
+        *(single_flight.do("a", fail) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.calls_count == 1
+
+
+async def test_cancelled_caller():
+    single_flight = SingleFlight()
+
+    async def load() -> int:
+        await asyncio.sleep(0.01)
+        return 1
+
+    first = asyncio.create_task(single_flight.do("a", load))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(single_flight.do("a", load))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await second == 1
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+from faker import Faker
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+import tests.defines as defines
+from app.container import AppContainer
+from app.exceptions import AccessDeniedError, ContentNotFoundError
+from app.schemas import ArticleHeader, ArticleParagraph, ArticleSchema
+from tests.utils import assert_app_error
+
+
+def test_update_article(
+    test_client: TestClient,
+    test_article: ArticleSchema,
+    access_token,
+    mocker: MockerFixture,
+    faker: Faker,
+):
+    container: AppContainer = test_client.app.container
+    get_by_id = mocker.spy(container.article_repository(), "get_by_id")
+
+    test_article.title = faker.sentence()
+    response = test_client.put(
+        defines.ARTICLE_PATH + f"/{test_article.id}",
+        params={"access_token": access_token},
+        json=test_article.dict(exclude={"creation_time", "update_time"}),
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["title"] == test_article.title
+    # Author is checked without loading the whole article
+    get_by_id.assert_called_once_with(test_article.id, for_update=True)
+
+
+async def test_not_author(
+    test_client: TestClient, test_article: ArticleSchema, faker: Faker
+):
+    container: AppContainer = test_client.app.container
+    user = await container.user_service().create(
+        faker.email(), faker.password(), faker.first_name()
+    )
+    access_token = await container.auth_service().generate_access_token(user.id)
+    data = test_article.dict(exclude={"creation_time", "update_time"})
+
+    response = test_client.put(
+        defines.ARTICLE_PATH + f"/{test_article.id}",
+        params={"access_token": access_token},
+        json=data,
+    )
+    assert_app_error(response, AccessDeniedError)
+
+    response = test_client.put(
+        defines.ARTICLE_PATH + f"/{test_article.id + 1000}",
+        params={"access_token": access_token},
+        json=data,
+    )
+    assert_app_error(response, ContentNotFoundError)
+
+
+async def test_stored_body(test_client: TestClient, test_article: ArticleSchema):
+    container: AppContainer = test_client.app.container
+    test_article.body = [
+        ArticleHeader(type="header", heading_level=1, content="Header"),
+        ArticleParagraph(type="paragraph", content="Paragraph"),
+    ]
+    await container.article_service().update(test_article)
+
+    # Body is stored in JSON column, so blocks are stored as plain objects
+    db_article = container.article_repository().id_table[test_article.id]
+    assert db_article.body == [
+        {"type": "header", "heading_level": 1, "content": "Header"},
+        {"type": "paragraph", "content": "Paragraph"},
+    ]
+    assert all(type(block) is dict for block in db_article.body)
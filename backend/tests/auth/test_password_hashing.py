@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.exceptions import ServiceUnavailableError
+from app.hashing import PasswordHasher, compute_password_key
+
+
+async def test_password_key(faker):
+    password: str = faker.password()
+    salt = faker.binary(16)
+    hasher = PasswordHasher(workers=1, queue_size=0)
+
+    assert await hasher.get_password_key(password, salt) == compute_password_key(
+        password, salt
+    )
+    assert hasher.hashes_count == 1
+
+    hasher.close()
+
+
+async def test_full_queue(mocker: MockerFixture, faker):
+    mocker.patch(
+        "app.hashing.compute_password_key", lambda *args: time.sleep(0.1) or b""
+    )
+    hasher = PasswordHasher(workers=1, queue_size=1)
+
+    tasks = [
+        asyncio.create_task(hasher.get_password_key(faker.password(), b""))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+
+    assert hasher.queue_depth == 1
+    with pytest.raises(ServiceUnavailableError):
+        await hasher.get_password_key(faker.password(), b"")
+    assert hasher.rejects_count == 1
+
+    await asyncio.gather(*tasks)
+    assert hasher.queue_depth == 0
+
+    hasher.close()
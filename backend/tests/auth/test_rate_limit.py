@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+from dependency_injector import providers
+from faker import Faker
+from fastapi.testclient import TestClient
+
+import tests.defines as defines
+from app.container import AppContainer
+from app.exceptions import TooManyRequestsError
+from app.rate_limit import RateLimiter
+from tests.utils import assert_app_error
+
+
+def override_limits(
+    test_client: TestClient, limits: dict[str, dict[str, tuple[int, float]]]
+):
+    container: AppContainer = test_client.app.container
+    container.rate_limiter.override(
+        providers.Singleton(
+            RateLimiter,
+            redis_client_factory=container.redis_db.provided.client,
+            limits=limits,
+        )
+    )
+
+
+def test_login_ip_limit(test_client: TestClient, test_user, faker: Faker):
+    override_limits(test_client, {"GET /tokens": {"ip": (2, 60)}})
+    container: AppContainer = test_client.app.container
+    password_hasher = container.password_hasher()
+    email: str = test_user[1]
+
+    for _ in range(2):
+        response = test_client.get(
+            defines.TOKENS_PATH, params={"email": email, "password": faker.password()}
+        )
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+
+    hashes_count = password_hasher.hashes_count
+    response = test_client.get(
+        defines.TOKENS_PATH, params={"email": email, "password": test_user[2]}
+    )
+
+    assert_app_error(response, TooManyRequestsError)
+    assert 0 < int(response.headers["Retry-After"]) <= 30
+    assert password_hasher.hashes_count == hashes_count
+
+
+def test_login_email_limit(test_client: TestClient, test_user, faker: Faker):
+    override_limits(test_client, {"GET /tokens": {"ip": (10, 60), "email": (1, 60)}})
+    email: str = test_user[1]
+    password: str = test_user[2]
+
+    response = test_client.get(
+        defines.TOKENS_PATH, params={"email": email, "password": password}
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = test_client.get(
+        defines.TOKENS_PATH, params={"email": email.upper(), "password": password}
+    )
+    assert_app_error(response, TooManyRequestsError)
+
+    # Limit of other email isn't affected
+    response = test_client.get(
+        defines.TOKENS_PATH, params={"email": faker.email(), "password": password}
+    )
+    assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+
+
+def test_signup_limit(test_client: TestClient, faker: Faker):
+    override_limits(test_client, {"POST /user": {"ip": (1, 60)}})
+
+    responses = [
+        test_client.post(
+            defines.USER_PATH,
+            json={
+                "email": faker.email(),
+                "password": faker.password(),
+                "display_name": faker.first_name(),
+            },
+        )
+        for _ in range(2)
+    ]
+
+    assert responses[0].status_code == HTTPStatus.OK
+    assert_app_error(responses[1], TooManyRequestsError)
@@ -0,0 +1,130 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+from redis.asyncio.client import Pipeline
+
+import tests.defines as defines
+from app.container import AppContainer
+from app.exceptions import InvalidTokenError
+from app.schemas import AuthTokens, UserSchema
+from tests.utils import assert_app_error
+
+
+def test_revoke_tokens(test_client: TestClient, test_user):
+    email: str = test_user[1]
+    password: str = test_user[2]
+
+    sessions = []
+    for _ in range(2):
+        response = test_client.get(
+            defines.TOKENS_PATH, params={"email": email, "password": password}
+        )
+        sessions.append(AuthTokens.parse_obj(response.json()))
+
+    response = test_client.delete(
+        defines.TOKENS_PATH, params={"access_token": sessions[0].access_token}
+    )
+    assert response.status_code == HTTPStatus.NO_CONTENT
+
+    for session in sessions:
+        response = test_client.get(
+            defines.TOKENS_PATH, params={"refresh_token": session.refresh_token}
+        )
+        assert_app_error(response, InvalidTokenError)
+
+
+async def test_revoke_many_tokens(
+    test_client: TestClient, test_user, mock_redis_database
+):
+    user: UserSchema = test_user[0]
+    container: AppContainer = test_client.app.container
+    auth_service = container.auth_service()
+    refresh_tokens = [
+        await auth_service.generate_refresh_token(user.id) for _ in range(3)
+    ]
+
+    assert await auth_service.revoke_refresh_tokens(user.id) == 3
+    assert await auth_service.revoke_refresh_tokens(user.id) == 0
+
+    for refresh_token in refresh_tokens:
+        with pytest.raises(InvalidTokenError):
+            await auth_service.rotate_refresh_token(refresh_token)
+    async with mock_redis_database.client() as redis:
+        assert await redis.keys() == []
+
+
+async def test_revoke_during_rotation(
+    test_client: TestClient, test_user, mocker: MockerFixture
+):
+    user: UserSchema = test_user[0]
+    container: AppContainer = test_client.app.container
+    auth_service = container.auth_service()
+    refresh_token = await auth_service.generate_refresh_token(user.id)
+
+    # Token is rotated after revocation has read the index of tokens
+    new_refresh_tokens = []
+    zrange = Pipeline.zrange
+
+    async def rotate_after_zrange(self: Pipeline, *args, **kwargs):
+        result = await zrange(self, *args, **kwargs)
+        if not new_refresh_tokens:
+            _, new_refresh_token = await auth_service.rotate_refresh_token(
+                refresh_token
+            )
+            new_refresh_tokens.append(new_refresh_token)
+        return result
+
+    mocker.patch.object(Pipeline, "zrange", rotate_after_zrange)
+    assert await auth_service.revoke_refresh_tokens(user.id) == 1
+
+    with pytest.raises(InvalidTokenError):
+        await auth_service.rotate_refresh_token(new_refresh_tokens[0])
+
+
+async def test_revoke_rotated_token(test_client: TestClient, test_user):
+    user: UserSchema = test_user[0]
+    container: AppContainer = test_client.app.container
+    auth_service = container.auth_service()
+    refresh_token = await auth_service.generate_refresh_token(user.id)
+
+    _, refresh_token = await auth_service.rotate_refresh_token(refresh_token)
+    assert await auth_service.revoke_refresh_tokens(user.id) == 1
+
+    with pytest.raises(InvalidTokenError):
+        await auth_service.rotate_refresh_token(refresh_token)
+
+
+async def test_concurrent_rotation(test_client: TestClient, test_user):
+    user: UserSchema = test_user[0]
+    container: AppContainer = test_client.app.container
+    auth_service = container.auth_service()
+    refresh_token = await auth_service.generate_refresh_token(user.id)
+
+    results = await asyncio.gather(
+        *(auth_service.rotate_refresh_token(refresh_token) for _ in range(5)),
+        return_exceptions=True,
+    )
+
+    rotated = [r for r in results if not isinstance(r, Exception)]
+    assert len(rotated) == 1
+    assert rotated[0][0] == user.id
+    assert all(isinstance(r, InvalidTokenError) for r in results if r not in rotated)
+
+
+async def test_legacy_refresh_token(
+    test_client: TestClient, test_user, mock_redis_database
+):
+    user: UserSchema = test_user[0]
+    async with mock_redis_database.client() as redis:
+        await redis.set("refresh_token:legacy:user_id", user.id)
+
+    container: AppContainer = test_client.app.container
+    auth_service = container.auth_service()
+    user_id, _ = await auth_service.rotate_refresh_token("legacy")
+
+    assert user_id == user.id
+    with pytest.raises(InvalidTokenError):
+        await auth_service.rotate_refresh_token("legacy")
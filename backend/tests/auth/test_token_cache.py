@@ -0,0 +1,43 @@
+import time
+
+from fastapi.testclient import TestClient
+
+import tests.defines as defines
+from app.container import AppContainer
+from app.token_cache import TokenCache
+
+
+def test_cached_access_token(test_client: TestClient, access_token):
+    container: AppContainer = test_client.app.container
+    token_cache: TokenCache = container.access_token_cache()
+
+    for _ in range(3):
+        test_client.get(defines.USER_PATH, params={"access_token": access_token})
+
+    assert token_cache.misses == 1
+    assert token_cache.hits == 2
+
+
+def test_expired_token():
+    token_cache = TokenCache(max_size=10)
+
+    token_cache.put("expired", 1, time.time() - 1)
+    token_cache.put("valid", 2, time.time() + 60)
+
+    assert token_cache.get("expired") is None
+    assert token_cache.get("valid") == 2
+    assert len(token_cache) == 1
+
+
+def test_eviction():
+    token_cache = TokenCache(max_size=2)
+    expiry = time.time() + 60
+
+    token_cache.put("first", 1, expiry)
+    token_cache.put("second", 2, expiry)
+    token_cache.get("first")
+    token_cache.put("third", 3, expiry)
+
+    assert token_cache.get("first") == 1
+    assert token_cache.get("second") is None
+    assert token_cache.get("third") == 3
@@ -0,0 +1,142 @@
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+import tests.defines as defines
+from app.config import BATCH_MAX_REQUESTS
+from app.container import AppContainer
+from app.exceptions import (
+    ContentNotFoundError,
+    InvalidInputFormatError,
+    InvalidTokenError,
+    UnexpectedError,
+)
+from app.schemas import ArticleParagraph, BatchSubResponse, UserSchema
+from app.services import AuthService
+from tests.utils import assert_app_error
+
+
+def test_valid_batch(test_client: TestClient, test_user, access_token):
+    user: UserSchema = test_user[0]
+
+    response = test_client.post(
+        defines.BATCH_PATH,
+        params={"access_token": access_token},
+        json=[
+            {"path": defines.USER_PATH},
+            {"path": defines.USER_PATH + f"/{user.id + 1}"},
+            {"path": defines.USERS_PATH, "params": {"ids": [user.id]}},
+        ],
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+    responses = [BatchSubResponse.parse_obj(r) for r in response.json()]
+
+    assert responses[0].status == HTTPStatus.OK
+    assert UserSchema.parse_obj(responses[0].body).dict() == user.dict()
+
+    assert responses[1].status == ContentNotFoundError.status_code
+    assert responses[1].body["error_code"] == ContentNotFoundError.error_code
+
+    assert responses[2].status == HTTPStatus.OK
+    assert responses[2].body[0]["id"] == user.id
+
+
+def test_request_body(test_client: TestClient, access_token):
+    response = test_client.post(
+        defines.BATCH_PATH,
+        params={"access_token": access_token},
+        json=[
+            {
+                "method": "PUT",
+                "path": defines.USER_PATH,
+                "body": {"display_name": "New name"},
+            }
+        ],
+    )
+
+    sub_response = BatchSubResponse.parse_obj(response.json()[0])
+
+    assert sub_response.status == HTTPStatus.OK
+    assert sub_response.body["display_name"] == "New name"
+
+
+def test_invalid_batch(test_client: TestClient, invalid_access_token):
+    response = test_client.post(
+        defines.BATCH_PATH,
+        json=[{"path": defines.USER_PATH}] * (BATCH_MAX_REQUESTS + 1),
+    )
+    assert_app_error(response, InvalidInputFormatError)
+
+    response = test_client.post(defines.BATCH_PATH, json=[{"path": defines.BATCH_PATH}])
+    assert_app_error(response, InvalidInputFormatError)
+
+    response = test_client.post(
+        defines.BATCH_PATH,
+        params={"access_token": invalid_access_token},
+        json=[{"path": defines.USER_PATH}],
+    )
+    assert_app_error(response, InvalidTokenError)
+
+
+def test_shared_access_token(
+    test_client: TestClient, test_user, access_token, mocker: MockerFixture
+):
+    validate = mocker.spy(AuthService, "validate_access_token")
+
+    response = test_client.post(
+        defines.BATCH_PATH,
+        params={"access_token": access_token},
+        json=[{"path": defines.USER_PATH}] * 3,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [r["status"] for r in response.json()] == [HTTPStatus.OK] * 3
+    assert validate.call_count == 1
+
+
+def test_failed_request(test_client: TestClient, test_user, mocker: MockerFixture):
+    user: UserSchema = test_user[0]
+    container: AppContainer = test_client.app.container
+    mocker.patch.object(
+        container.user_repository(), "get_many", side_effect=RuntimeError()
+    )
+
+    response = test_client.post(
+        defines.BATCH_PATH,
+        json=[
+            {"path": defines.USERS_PATH, "params": {"ids": [user.id]}},
+            {"path": defines.USER_PATH + f"/{user.id}"},
+        ],
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+    responses = [BatchSubResponse.parse_obj(r) for r in response.json()]
+    assert responses[0].status == UnexpectedError.status_code
+    assert responses[0].body["error_code"] == UnexpectedError.error_code
+    assert responses[1].status == HTTPStatus.OK
+
+
+async def test_encoded_request(test_client: TestClient, published_article):
+    container: AppContainer = test_client.app.container
+    published_article.body = [
+        ArticleParagraph(type="paragraph", content="Lorem ipsum dolor sit amet")
+    ] * 100
+    article = await container.article_service().update(published_article)
+
+    response = test_client.post(
+        defines.BATCH_PATH,
+        json=[
+            {
+                "path": defines.ARTICLE_PATH + f"/{article.id}",
+                "headers": {"Accept-Encoding": "gzip"},
+            }
+        ],
+    )
+
+    sub_response = BatchSubResponse.parse_obj(response.json()[0])
+    assert sub_response.status == HTTPStatus.OK
+    assert sub_response.body["title"] == article.title
@@ -1,8 +1,12 @@
+from contextlib import asynccontextmanager
 from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable
 
 import pytest
 from dependency_injector import providers
 from faker import Faker
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
 from fastapi.testclient import TestClient
 from jose import jwt
 from pytest import FixtureRequest, MonkeyPatch
@@ -13,28 +17,25 @@ import tests.defines as defines
 from app.container import AppContainer
 from app.factory import create_app
 from app.models import Article, User
-from app.schemas import UserSchema
-
-
-class MockedRedis:
-    def __init__(self):
-        self.data = {}
-
-    async def get(self, name: str):
-        return self.data.get(name)
-
-    async def set(self, name: str, value: str, *args):
-        self.data[name] = value
-
-    async def delete(self, *keys: list[str]):
-        for key in keys:
-            self.data.pop(key, None)
+from app.schemas import ArticleBlock, ArticleBodyPatch, ArticleSchema, UserSchema
+from app.single_flight import SingleFlight
 
 
 @pytest.fixture
 def mock_redis_database(mocker: MockerFixture):
     redis_mock = mocker.patch("app.redis.RedisDatabase")
-    redis_mock.client.return_value.__aenter__.return_value = MockedRedis()
+    server = FakeServer()
+
+    # Client is created per use, because fake connections are bound to event loop
+    @asynccontextmanager
+    async def client():
+        redis = FakeRedis(server=server)
+        try:
+            yield redis
+        finally:
+            await redis.close()
+
+    redis_mock.client.side_effect = client
     return redis_mock
 
 
@@ -48,11 +49,15 @@ class FakeUserRepository:
         self.id_table: dict[int, User] = {}
         self.email_table: dict[str, User] = {}
         self.counter = 1
+        self.single_flight = SingleFlight()
 
-    async def get_by_id(self, id: int) -> User | None:
+    async def get_by_id(self, id: int, for_update: bool = False) -> User | None:
         return self.id_table.get(id)
 
-    async def get_by_email(self, email: str) -> User | None:
+    async def get_many(self, ids: list[int]) -> list[User]:
+        return [self.id_table[id] for id in ids if id in self.id_table]
+
+    async def get_by_email(self, email: str, from_primary: bool = False) -> User | None:
         return self.email_table.get(email)
 
     async def save(self, user: User) -> User:
@@ -72,14 +77,98 @@ class FakeArticleRepository:
         self.id_table: dict[int, Article] = {}
         self.author_table: dict[int, set[int]] = {}
         self.counter = 1
+        self.single_flight = SingleFlight()
 
-    async def get_by_id(self, id: int) -> Article | None:
+    async def get_by_id(
+        self, id: int, for_update: bool = False, from_primary: bool = False
+    ) -> Article | None:
         return self.id_table.get(id)
 
+    async def get_version(self, id: int) -> tuple[int, bool, datetime, int] | None:
+        article = self.id_table.get(id)
+        if article is None:
+            return None
+        return (
+            article.author_id,
+            article.is_published,
+            article.update_time,
+            article.views_count,
+        )
+
+    async def get_many(self, ids: list[int]) -> list[Article]:
+        return [self.id_table[id] for id in ids if id in self.id_table]
+
     async def get_by_author_id(self, author_id: int) -> list[Article]:
         return list(
-            map(self.author_table.get(author_id, []), lambda id: self.id_table[id])
+            map(lambda id: self.id_table[id], self.author_table.get(author_id, []))
+        )
+
+    async def get_ids_by_author_id(
+        self,
+        author_id: int,
+        published_only: bool,
+        before_id: int | None,
+        limit: int,
+    ) -> list[int]:
+        ids = sorted(self.author_table.get(author_id, []), reverse=True)
+        if published_only:
+            ids = [id for id in ids if self.id_table[id].is_published]
+        if before_id is not None:
+            ids = [id for id in ids if id < before_id]
+        return ids[:limit]
+
+    async def search_published(
+        self, query: str, after: tuple[float, int] | None, limit: int
+    ) -> list[tuple[int, float]]:
+        words = set(query.lower().split())
+
+        results = []
+        for article in self.id_table.values():
+            if not article.is_published:
+                continue
+
+            text = [article.title]
+            for block in article.body:
+                content = block.get("content", [])
+                text.extend([content] if isinstance(content, str) else content)
+
+            rank = float(len(words & set(" ".join(text).lower().split())))
+            if rank > 0 and (after is None or (rank, article.id) < after):
+                results.append((article.id, rank))
+
+        results.sort(key=lambda r: (r[1], r[0]), reverse=True)
+        return results[:limit]
+
+    async def get_published_page(
+        self, after: tuple[datetime, int] | None, limit: int
+    ) -> list[tuple[datetime, int]]:
+        entries = sorted(
+            (
+                (article.publish_time, article.id)
+                for article in self.id_table.values()
+                if article.is_published
+            ),
+            reverse=True,
         )
+        if after is not None:
+            entries = [entry for entry in entries if entry < after]
+        return entries[:limit]
+
+    async def update_body(
+        self, id: int, patch: ArticleBodyPatch, update_time: datetime
+    ) -> Article | None:
+        article = self.id_table.get(id)
+        if article is None or len(article.body) < patch.min_body_length():
+            return None
+
+        article.body = patch.apply(article.body)
+        article.update_time = update_time
+        return article
+
+    async def add_views(self, views: dict[int, int]):
+        for id, count in views.items():
+            if id in self.id_table:
+                self.id_table[id].views_count += count
 
     async def save(self, article: Article) -> Article:
         if article.id is None:
@@ -152,6 +241,45 @@ async def test_users(
     return users
 
 
+@pytest.fixture
+async def test_article(test_client: TestClient, test_user, faker: Faker):
+    user: UserSchema = test_user[0]
+
+    container: AppContainer = test_client.app.container
+    return await container.article_service().create(faker.sentence(), user.id)
+
+
+@pytest.fixture
+async def published_article(test_client: TestClient, test_article: ArticleSchema):
+    container: AppContainer = test_client.app.container
+
+    test_article.is_published = True
+    return await container.article_service().update(test_article)
+
+
+@pytest.fixture
+def create_article(
+    test_client: TestClient, test_user, faker: Faker
+) -> Callable[..., Awaitable[ArticleSchema]]:
+    """Factory of articles of `test_user`, which are published by default."""
+    container: AppContainer = test_client.app.container
+    user: UserSchema = test_user[0]
+
+    async def create(
+        title: str | None = None,
+        body: list[ArticleBlock] | None = None,
+        is_published: bool = True,
+    ) -> ArticleSchema:
+        article_service = container.article_service()
+
+        article = await article_service.create(title or faker.sentence(), user.id)
+        article.body = body or []
+        article.is_published = is_published
+        return await article_service.update(article)
+
+    return create
+
+
 @pytest.fixture
 async def access_token(test_client: TestClient, test_user):
     user: UserSchema = test_user[0]
@@ -0,0 +1,22 @@
+from sqlalchemy import text
+
+from app.db import Database
+from app.repositories import ArticleRepository
+
+
+async def test_add_views(tmp_path):
+    db = Database(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    async with db.engine.begin() as conn:
+        # Only columns used by the update are needed
+        await conn.execute(
+            text("CREATE TABLE articles (id INTEGER PRIMARY KEY, views_count INTEGER)")
+        )
+        await conn.execute(text("INSERT INTO articles VALUES (1, 0), (2, 5), (3, 1)"))
+
+    await ArticleRepository(db.session).add_views({1: 2, 2: 3})
+
+    async with db.engine.connect() as conn:
+        result = await conn.execute(text("SELECT id, views_count FROM articles"))
+        assert sorted(result.all()) == [(1, 2), (2, 8), (3, 1)]
+
+    await db.engine.dispose()
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy.sql import select
+
+from app.db import Database
+from app.models import User
+from app.repositories import UserRepository
+
+
+async def test_user_creation_date(tmp_path):
+    db = Database(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    async with db.engine.begin() as conn:
+        await conn.run_sync(User.__table__.create)
+
+    user = await UserRepository(db.session).save(
+        User(
+            email="user@example.com",
+            password_salt=b"salt",
+            password_key=b"key",
+            display_name="User",
+        )
+    )
+
+    async with db.session() as session:
+        creation_date = await session.scalar(
+            select(User.creation_date).where(User.id == user.id)
+        )
+    assert creation_date == datetime.utcnow().date()
+
+    await db.engine.dispose()
@@ -0,0 +1,198 @@
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.db import (
+    PRIMARY_PIN_COOKIE,
+    Database,
+    ReadYourWritesMiddleware,
+    RoutingContext,
+    routing_context,
+    set_routing_user,
+)
+from app.migrations import apply_migrations
+from app.models import Article, User
+from app.repositories import ArticleRepository, UserRepository
+
+DATABASES = ("primary", "replica1", "replica2")
+
+
+@pytest.fixture
+async def db(tmp_path) -> Database:
+    db = Database(
+        f"sqlite+aiosqlite:///{tmp_path}/primary.db",
+        replica_urls=[
+            f"sqlite+aiosqlite:///{tmp_path}/replica1.db",
+            f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db",
+            f"sqlite+aiosqlite:///{tmp_path}/replica2.db",
+        ],
+    )
+    engines = [db.engine, db.replica_engines[0], db.replica_engines[2]]
+
+    # The same user and article have different names in each database
+    for name, engine in zip(DATABASES, engines):
+        await apply_migrations(engine)
+        async with AsyncSession(engine) as session:
+            session.add(make_user(1, name))
+            session.add(Article(id=1, author_id=1, title=name))
+            await session.commit()
+
+    yield db
+
+    for engine in [db.engine, *db.replica_engines]:
+        await engine.dispose()
+
+
+def make_user(id: int, display_name: str) -> User:
+    return User(
+        id=id,
+        email=f"user{id}@example.com",
+        password_salt=b"",
+        password_key=b"",
+        display_name=display_name,
+    )
+
+
+async def test_round_robin(db: Database):
+    user_repo = UserRepository(db.session)
+
+    # Replicas are not used until they are checked
+    assert (await user_repo.get_by_id(1)).display_name == "primary"
+
+    await db.check_replicas()
+    names = [(await user_repo.get_by_id(1)).display_name for _ in range(4)]
+    assert names == ["replica1", "replica2", "replica1", "replica2"]
+
+    assert (await user_repo.get_by_id(1, for_update=True)).display_name == "primary"
+    user = await user_repo.get_by_email("user1@example.com", from_primary=True)
+    assert user.display_name == "primary"
+    assert db.pool_stats()["replicas_healthy"] == 2
+
+
+async def test_read_from_primary(db: Database):
+    article_repo = ArticleRepository(db.session)
+    await db.check_replicas()
+
+    assert (await article_repo.get_by_id(1)).title == "replica1"
+    assert (await article_repo.get_by_id(1, from_primary=True)).title == "primary"
+    assert (await article_repo.get_by_id(1)).title == "replica2"
+
+
+async def test_unavailable_replicas(db: Database, mocker):
+    user_repo = UserRepository(db.session)
+    await db.check_replicas()
+
+    mocker.patch.object(db, "_get_replica_lag", side_effect=OSError)
+    await db.check_replicas()
+
+    assert (await user_repo.get_by_id(1)).display_name == "primary"
+    assert db.pool_stats()["replicas_healthy"] == 0
+
+
+async def test_lagging_replicas(db: Database, mocker):
+    user_repo = UserRepository(db.session)
+
+    mocker.patch.object(db, "_get_replica_lag", return_value=60.0)
+    await db.check_replicas()
+
+    assert (await user_repo.get_by_id(1)).display_name == "primary"
+
+
+async def test_pin_to_primary(db: Database):
+    user_repo = UserRepository(db.session)
+    await db.check_replicas()
+
+    context = RoutingContext(pin_time=5)
+    token = routing_context.set(context)
+    try:
+        assert (await user_repo.get_by_id(1)).display_name == "replica1"
+
+        await user_repo.save(make_user(2, "new"))
+        assert (await user_repo.get_by_id(1)).display_name == "primary"
+        assert (await user_repo.get_by_email("user1@example.com")).display_name == (
+            "primary"
+        )
+
+        context.pinned_until = 0.0
+        assert (await user_repo.get_by_id(1)).display_name == "replica2"
+    finally:
+        routing_context.reset(token)
+
+
+async def test_read_your_writes_middleware(db: Database):
+    user_repo = UserRepository(db.session)
+    await db.check_replicas()
+
+    async def create_user(request: Request):
+        await user_repo.save(make_user(2, "new"))
+        return PlainTextResponse("")
+
+    async def get_user(request: Request):
+        return PlainTextResponse((await user_repo.get_by_id(1)).display_name)
+
+    app = Starlette(
+        routes=[
+            Route("/user", create_user, methods=["POST"]),
+            Route("/user", get_user, methods=["GET"]),
+        ],
+        middleware=[Middleware(ReadYourWritesMiddleware, pin_time=5)],
+    )
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/user")).text == "replica1"
+        assert PRIMARY_PIN_COOKIE not in client.cookies
+
+        response = await client.post("/user")
+        assert PRIMARY_PIN_COOKIE in response.cookies
+
+        assert (await client.get("/user")).text == "primary"
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/user")).text == "replica2"
+
+
+async def test_user_pin_to_primary(db: Database, mock_redis_database):
+    user_repo = UserRepository(db.session)
+    await db.check_replicas()
+
+    async def authorize(request: Request):
+        if "user_id" in request.query_params:
+            await set_routing_user(int(request.query_params["user_id"]))
+
+    async def create_user(request: Request):
+        await authorize(request)
+        await user_repo.save(make_user(2, "new"))
+        return PlainTextResponse("")
+
+    async def get_user(request: Request):
+        await authorize(request)
+        return PlainTextResponse((await user_repo.get_by_id(1)).display_name)
+
+    app = Starlette(
+        routes=[
+            Route("/user", create_user, methods=["POST"]),
+            Route("/user", get_user, methods=["GET"]),
+        ],
+        middleware=[
+            Middleware(
+                ReadYourWritesMiddleware,
+                pin_time=5,
+                redis_client_factory=mock_redis_database.client,
+            )
+        ],
+    )
+
+    # Clients don't keep cookies, but are authorized as the same user
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        await client.post("/user", params={"user_id": 1})
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/user", params={"user_id": 1})).text == "primary"
+        assert PRIMARY_PIN_COOKIE not in client.cookies
+        assert (await client.get("/user", params={"user_id": 2})).text == "replica1"
+        assert (await client.get("/user")).text == "replica2"
@@ -0,0 +1,20 @@
+import asyncio
+
+from app.db import Database
+
+
+async def test_session_per_task(tmp_path):
+    db = Database(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+
+    async def get_session():
+        async with db.session() as session:
+            await asyncio.sleep(0)
+            return session
+
+    first, second = await asyncio.gather(get_session(), get_session())
+    assert first is not second
+
+    # Session is removed from registry when it is closed
+    assert await get_session() is not await get_session()
+
+    await db.engine.dispose()
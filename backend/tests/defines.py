@@ -1,6 +1,16 @@
 TOKENS_PATH = "/tokens"
 USER_PATH = "/user"
+USERS_PATH = "/users"
 ARTICLE_PATH = "/article"
+ARTICLES_PATH = "/articles"
+ARTICLES_SEARCH_PATH = "/articles/search"
+ARTICLES_TRENDING_PATH = "/articles/trending"
+FEED_PATH = "/feed"
+BATCH_PATH = "/batch"
 
 TEST_SECRET_KEY = "supersecretkey"
 FAKE_SECRET_KEY = "fakesecretkey"
+POOLS_STATS_PATH = "/stats/pools"
+METRICS_PATH = "/metrics"
+HEALTH_LIVE_PATH = "/health/live"
+HEALTH_READY_PATH = "/health/ready"
@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+import tests.defines as defines
+from app.exceptions import ServiceUnavailableError
+from app.schemas import HealthStatus
+from tests.utils import assert_app_error
+
+
+@pytest.fixture
+def async_pools(mocker: MockerFixture, mock_database, mock_redis_database):
+    for method in ("check_schema_version", "warm_up", "ping", "dispose"):
+        setattr(mock_database, method, mocker.AsyncMock())
+    for method in ("warm_up", "ping", "close"):
+        setattr(mock_redis_database, method, mocker.AsyncMock())
+
+
+def test_liveness(test_client: TestClient):
+    response = test_client.get(defines.HEALTH_LIVE_PATH)
+
+    assert response.status_code == HTTPStatus.OK
+    assert HealthStatus.parse_obj(response.json()) == HealthStatus()
+
+
+def test_readiness_lifecycle(
+    test_client: TestClient, async_pools, mock_database, mock_redis_database
+):
+    # Worker isn't ready until it is started
+    assert_app_error(
+        test_client.get(defines.HEALTH_READY_PATH), ServiceUnavailableError
+    )
+
+    with test_client:
+        mock_database.warm_up.assert_awaited_once()
+        mock_redis_database.warm_up.assert_awaited_once()
+
+        response = test_client.get(defines.HEALTH_READY_PATH)
+        assert response.status_code == HTTPStatus.OK
+        assert HealthStatus.parse_obj(response.json()).checks == {
+            "database": True,
+            "redis": True,
+        }
+
+    assert_app_error(
+        test_client.get(defines.HEALTH_READY_PATH), ServiceUnavailableError
+    )
+    mock_database.dispose.assert_awaited_once()
+    mock_redis_database.close.assert_awaited_once()
+
+
+def test_unavailable_service(test_client: TestClient, async_pools, mock_database):
+    mock_database.ping.side_effect = OSError
+
+    with test_client:
+        response = test_client.get(defines.HEALTH_READY_PATH)
+
+    assert_app_error(response, ServiceUnavailableError)
+    assert "database" in response.json()["details"]
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.migrations import (
+    LATEST_VERSION,
+    SchemaVersionError,
+    apply_migrations,
+    check_schema_version,
+)
+
+
+@pytest.fixture
+async def engine(tmp_path) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    yield engine
+    await engine.dispose()
+
+
+async def test_apply_migrations(engine: AsyncEngine):
+    assert await apply_migrations(engine) == list(range(1, LATEST_VERSION + 1))
+    await check_schema_version(engine)
+
+    assert await apply_migrations(engine) == []
+
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(
+            lambda c: {i["name"] for i in inspect(c).get_indexes("articles")}
+        )
+        columns = await conn.run_sync(
+            lambda c: {c["name"] for c in inspect(c).get_columns("articles")}
+        )
+    assert "ix_articles_author_id_is_published_id" in indexes
+    assert "ix_articles_author_id" not in indexes
+    assert "ix_articles_feed" in indexes
+    assert "search_vector" in columns
+    assert "publish_time" in columns
+
+
+async def test_not_initialized_schema(engine: AsyncEngine):
+    with pytest.raises(SchemaVersionError):
+        await check_schema_version(engine)
+
+
+async def test_outdated_schema(engine: AsyncEngine):
+    assert await apply_migrations(engine, target=1) == [1]
+
+    with pytest.raises(SchemaVersionError):
+        await check_schema_version(engine)
+
+    assert await apply_migrations(engine) == list(range(2, LATEST_VERSION + 1))
+    await check_schema_version(engine)
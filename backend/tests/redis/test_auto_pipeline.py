@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+from redis.exceptions import ResponseError
+
+from app.redis import AutoPipeline, InstrumentedRedis
+
+
+def make_client(max_batch_size: int = 10) -> tuple[InstrumentedRedis, AutoPipeline]:
+    redis = FakeRedis()
+    auto_pipeline = AutoPipeline(redis, max_batch_size, 0.001)
+    return (
+        InstrumentedRedis(
+            connection_pool=redis.connection_pool, auto_pipeline=auto_pipeline
+        ),
+        auto_pipeline,
+    )
+
+
+async def test_concurrent_commands():
+    client, auto_pipeline = make_client()
+
+    await asyncio.gather(*(client.set(f"key:{i}", i) for i in range(5)))
+    values = await asyncio.gather(*(client.get(f"key:{i}") for i in range(5)))
+
+    assert values == [str(i).encode() for i in range(5)]
+    assert auto_pipeline.batches_count == 2
+    assert auto_pipeline.commands_count == 10
+
+
+async def test_max_batch_size():
+    client, auto_pipeline = make_client(max_batch_size=2)
+
+    results = await asyncio.gather(*(client.incr("counter") for _ in range(5)))
+
+    assert sorted(results) == [1, 2, 3, 4, 5]
+    assert auto_pipeline.batches_count == 3
+
+
+async def test_command_error():
+    client, _ = make_client()
+    await client.set("text", "value")
+
+    incr_result, get_result = await asyncio.gather(
+        client.incr("text"), client.get("text"), return_exceptions=True
+    )
+
+    assert isinstance(incr_result, ResponseError)
+    assert get_result == b"value"
+
+
+async def test_script():
+    client, _ = make_client()
+    script = client.register_script("return redis.call('GET', KEYS[1])")
+    await client.set("key", "value")
+
+    assert await script(keys=["key"]) == b"value"
+    with pytest.raises(ResponseError):
+        await client.evalsha("0" * 40, 0)
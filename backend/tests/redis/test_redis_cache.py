@@ -0,0 +1,54 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from pytest_mock import MockerFixture
+
+from app.cache import RedisCache
+
+
+@pytest.fixture
+def cache() -> RedisCache:
+    server = FakeServer()
+
+    @asynccontextmanager
+    async def client():
+        redis = FakeRedis(server=server)
+        try:
+            yield redis
+        finally:
+            await redis.close()
+
+    return RedisCache(client, 60)
+
+
+async def test_invalidation_during_load(cache: RedisCache):
+    async def load_stale() -> bytes:
+        # Entry is invalidated after value was read, but before it is saved
+        await cache.invalidate("key")
+        return b"stale"
+
+    assert await cache.get("key", load_stale) == b"stale"
+
+    async def load() -> bytes:
+        return b"fresh"
+
+    assert await cache.get("key", load) == b"fresh"
+    assert await cache.get("key", load_stale) == b"fresh"
+
+
+async def test_failed_early_refresh(cache: RedisCache, mocker: MockerFixture):
+    async def load() -> bytes:
+        return b"value"
+
+    async def fail() -> bytes:
+        raise RuntimeError()
+
+    assert await cache.get("key", load) == b"value"
+
+    mocker.patch.object(RedisCache, "_should_refresh", return_value=True)
+    assert await cache.get("key", fail) == b"value"
+
+    with pytest.raises(RuntimeError):
+        await cache.get("missing", fail)
@@ -0,0 +1,29 @@
+import asyncio
+import signal
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+from uvicorn import Config, Server
+
+from app.server import APP, DrainingServer
+
+
+async def test_draining(mocker: MockerFixture):
+    app = MagicMock()
+    import_from_string = mocker.patch("app.server.import_from_string", return_value=app)
+    mocker.patch.object(Server, "install_signal_handlers")
+
+    server = DrainingServer(Config(APP), drain_delay=0.05)
+    server.install_signal_handlers()
+    health_check = app.container.health_check()
+    health_check.is_ready = True
+
+    # Nothing is imported inside signal handler
+    import_from_string.side_effect = AssertionError
+    server.handle_exit(signal.SIGTERM, None)
+
+    assert not health_check.is_ready
+    assert not server.should_exit
+
+    await asyncio.sleep(0.1)
+    assert server.should_exit
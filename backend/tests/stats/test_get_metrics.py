@@ -0,0 +1,33 @@
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+
+import tests.defines as defines
+from app.schemas import UserSchema
+
+
+def test_metrics(
+    test_client: TestClient, test_user, mock_database, mock_redis_database
+):
+    user: UserSchema = test_user[0]
+    mock_database.pool_stats.return_value = {"checked_out": 1}
+    mock_redis_database.pool_stats.return_value = {"checked_out": 2}
+
+    for _ in range(2):
+        test_client.get(defines.USER_PATH + f"/{user.id}")
+    test_client.get(defines.USER_PATH + f"/{user.id + 1}")
+
+    response = test_client.get(defines.METRICS_PATH)
+
+    assert response.status_code == HTTPStatus.OK
+
+    lines = response.text.splitlines()
+    labels = 'method="GET",route="/user/{id}"'
+
+    assert f'http_requests_total{{{labels},status="200"}} 2' in lines
+    assert f'http_requests_total{{{labels},status="404"}} 1' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in lines
+    assert f"http_request_duration_seconds_count{{{labels}}} 3" in lines
+    assert "db_pool_checked_out 1" in lines
+    assert "redis_pool_checked_out 2" in lines
+    assert "user_repository_single_flight_calls_total 0" in lines
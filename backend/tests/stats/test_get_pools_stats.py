@@ -0,0 +1,19 @@
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+
+import tests.defines as defines
+from app.schemas import PoolsStats
+
+
+def test_pools_stats(test_client: TestClient, mock_database, mock_redis_database):
+    mock_database.pool_stats.return_value = {"size": 10, "checked_out": 1}
+    mock_redis_database.pool_stats.return_value = {"size": 100, "wait_time": 0.5}
+
+    response = test_client.get(defines.POOLS_STATS_PATH)
+
+    assert response.status_code == HTTPStatus.OK
+
+    stats = PoolsStats.parse_obj(response.json())
+    assert stats.database == {"size": 10, "checked_out": 1}
+    assert stats.redis == {"size": 100, "wait_time": 0.5}
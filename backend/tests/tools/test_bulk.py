@@ -0,0 +1,151 @@
+import io
+import os
+from datetime import datetime
+
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import select
+
+import app.config as config
+from app.db import Database
+from app.hashing import compute_password_key
+from app.migrations import apply_migrations
+from app.models import Article, User
+from app.tools.bulk import InvalidRecordError, export_records, import_records
+
+SALT = os.urandom(config.PASSWORD_SALT_LENGTH)
+
+USERS = [
+    {"email": "First@Example.com", "display_name": "First", "password": "password"},
+    {
+        "id": 10,
+        "email": "second@example.com",
+        "display_name": "Second",
+        "password_salt": SALT.hex(),
+        "password_key": compute_password_key("password", SALT).hex(),
+        "creation_date": "2023-01-01",
+    },
+]
+
+ARTICLES = [
+    {
+        "author_id": 10,
+        "title": "Draft",
+        "body": [{"type": "paragraph", "content": "Text"}],
+    },
+    {
+        "author_id": 10,
+        "title": "Published",
+        "body": [
+            {"type": "header", "heading_level": 1, "content": "Header"},
+            {"type": "list", "list_type": "ordered", "content": ["First", "Second"]},
+        ],
+        "is_published": True,
+        "update_time": "2023-01-02T12:00:00+03:00",
+        "views_count": 5,
+    },
+]
+
+
+def to_ndjson(records: list) -> io.BytesIO:
+    return io.BytesIO(b"".join(orjson.dumps(record) + b"\n" for record in records))
+
+
+@pytest.fixture
+async def db(tmp_path) -> Database:
+    db = Database(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    await apply_migrations(db.engine)
+    yield db
+    await db.dispose()
+
+
+@pytest.fixture
+async def imported_users(db: Database):
+    await import_records(db, "users", to_ndjson(USERS), workers=0)
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+async def test_import_users(db: Database, workers: int):
+    progress = await import_records(
+        db, "users", to_ndjson(USERS), batch_size=1, workers=workers
+    )
+
+    assert progress.count == 2
+    async with AsyncSession(db.engine) as session:
+        users = (await session.scalars(select(User).order_by(User.id))).all()
+
+    assert [(user.id, user.email) for user in users] == [
+        (1, "First@example.com"),
+        (10, "second@example.com"),
+    ]
+    for user in users:
+        assert user.password_key == compute_password_key("password", user.password_salt)
+    assert users[1].password_salt == SALT
+    assert users[1].creation_date.isoformat() == "2023-01-01"
+
+
+async def test_import_articles(db: Database, imported_users):
+    progress = await import_records(db, "articles", to_ndjson(ARTICLES), workers=0)
+
+    assert progress.count == 2
+    async with AsyncSession(db.engine) as session:
+        articles = (await session.scalars(select(Article).order_by(Article.id))).all()
+
+    assert [article.title for article in articles] == ["Draft", "Published"]
+    assert articles[0].publish_time is None
+    assert articles[1].body == ARTICLES[1]["body"]
+    assert articles[1].views_count == 5
+    assert articles[1].update_time == datetime(2023, 1, 2, 9)
+    assert articles[1].publish_time == articles[1].update_time
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"{not json}",
+        orjson.dumps({"author_id": 10, "title": "Article", "body": [{"type": "x"}]}),
+        orjson.dumps({"author_id": 10, "title": ""}),
+    ],
+)
+async def test_invalid_record(db: Database, imported_users, line: bytes):
+    file = io.BytesIO(orjson.dumps(ARTICLES[0]) + b"\n\n" + line + b"\n")
+
+    with pytest.raises(InvalidRecordError) as exc_info:
+        await import_records(db, "articles", file, workers=0)
+    assert exc_info.value.line_number == 3
+
+    # Import is aborted as a whole
+    async with AsyncSession(db.engine) as session:
+        assert (await session.scalars(select(Article))).all() == []
+
+    file.seek(0)
+    progress = await import_records(db, "articles", file, workers=0, skip_invalid=True)
+    assert progress.count == 1
+    assert progress.invalid_count == 1
+
+
+async def test_export(db: Database, imported_users, tmp_path):
+    await import_records(db, "articles", to_ndjson(ARTICLES), workers=0)
+
+    exported = {}
+    for kind in ("users", "articles"):
+        file = io.BytesIO()
+        progress = await export_records(db, kind, file, batch_size=1)
+        assert progress.count == 2
+        exported[kind] = file.getvalue()
+
+    records = [orjson.loads(line) for line in exported["users"].splitlines()]
+    assert records[1]["password_salt"] == SALT.hex()
+
+    # Exported records are imported into another database unchanged
+    other_db = Database(f"sqlite+aiosqlite:///{tmp_path}/other.db")
+    await apply_migrations(other_db.engine)
+    try:
+        for kind in ("users", "articles"):
+            await import_records(other_db, kind, io.BytesIO(exported[kind]), workers=0)
+            file = io.BytesIO()
+            await export_records(other_db, kind, file)
+            assert file.getvalue() == exported[kind]
+    finally:
+        await other_db.dispose()
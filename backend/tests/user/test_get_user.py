@@ -1,3 +1,5 @@
+from http import HTTPStatus
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -28,3 +30,20 @@ async def test_inactive_user(test_client: TestClient, test_user):
 
     response = test_client.get(defines.USER_PATH + f"/{user.id}")
     assert_app_error(response, ContentNotFoundError)
+
+
+def test_not_modified_user(test_client: TestClient, test_user):
+    user: UserSchema = test_user[0]
+    path = defines.USER_PATH + f"/{user.id}"
+
+    response = test_client.get(path)
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers["ETag"]
+
+    response = test_client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b""
+
+    response = test_client.get(path, headers={"If-None-Match": '"outdated"'})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] == etag
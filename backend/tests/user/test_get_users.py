@@ -0,0 +1,33 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import tests.defines as defines
+from app.config import BULK_MAX_IDS
+from app.exceptions import ContentNotFoundError, InvalidInputFormatError
+from app.schemas import UserBulkItem, UserSchema
+from tests.utils import assert_app_error
+
+
+@pytest.mark.parametrize("test_users", [5], indirect=True)
+def test_users_getting(test_client: TestClient, test_users: list[UserSchema]):
+    ids = [u.id for u in reversed(test_users)] + [test_users[-1].id + 1]
+
+    response = test_client.get(defines.USERS_PATH, params={"ids": ids})
+
+    items = [UserBulkItem.parse_obj(item) for item in response.json()]
+    assert [item.id for item in items] == ids
+
+    for item, user in zip(items, reversed(test_users)):
+        assert item.error is None
+        assert item.user.dict() == user.dict()
+
+    assert items[-1].user is None
+    assert items[-1].error.error_code == ContentNotFoundError.error_code
+
+
+def test_too_many_ids(test_client: TestClient):
+    response = test_client.get(
+        defines.USERS_PATH, params={"ids": list(range(1, BULK_MAX_IDS + 2))}
+    )
+
+    assert_app_error(response, InvalidInputFormatError)